@@ -10,4 +10,4 @@ __license__ = ''
 __description__ = ("Copies UV's scale based on it's"
                    " ratio from worldarea to uv area")
 
-from utils import *
+from UVRatio.utils import *
@@ -0,0 +1,480 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Headless batch processing of scene files.
+
+Scenes are spread over a pool of worker processes. Every worker runs its
+own ``maya.standalone`` session, or imports a stand-in module for
+testing, says it is ready once Maya is initialized and answers one scene
+at a time with a JSON line. Starting up has its own timeout, so a slow
+Maya start isn't taken from the first scene's. A worker that times out
+or crashes is killed and replaced, and its scene is reported as such
+without affecting the others.
+
+From a shell::
+
+    mayapy -m UVRatio.batch scenes/*.mb --workers 8 --report report.json
+    mayapy -m UVRatio.batch scenes/*.mb --ratio 0.012 --save
+    mayapy -m UVRatio.batch scenes/*.mb --density 512 --resolution 2048 \
+        --unit m --dry-run
+"""
+from __future__ import division
+
+import argparse
+import importlib
+import json
+import multiprocessing
+import os
+import subprocess
+import sys
+import threading
+import time
+import traceback
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+#: Prefix of the protocol lines a worker writes, Maya prints to stdout too.
+RESULT_PREFIX = "UVRATIO_RESULT "
+#: Line a worker writes once it can take scenes.
+READY_LINE = "UVRATIO_READY"
+
+DEFAULT_TIMEOUT = 600.0
+DEFAULT_STARTUP_TIMEOUT = 300.0
+
+DEFAULT_RESOLUTION = 2048
+
+this_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class Worker(object):
+    """
+    One worker process fed scene paths over stdin.
+
+    :param command: command line starting a worker in serve mode
+    :type command: list
+    :param timeout: seconds a scene may take before the worker is killed
+    :type timeout: float
+    :param startup_timeout: seconds the worker may take to get ready
+    :type startup_timeout: float
+    """
+
+    def __init__(self, command, timeout=DEFAULT_TIMEOUT,
+                 startup_timeout=DEFAULT_STARTUP_TIMEOUT):
+
+        self.command = command
+        self.timeout = timeout
+        self.startup_timeout = startup_timeout
+        self.proc = None
+        self.lines = None
+
+    def start(self):
+        """
+        Starts the worker process and the thread reading its output, and
+        waits for the worker to be ready.
+
+        :raises: ``RuntimeError`` if the worker exits or isn't ready in
+                 time, it is killed
+
+        :return: None
+        :rtype: NoneType
+        """
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(
+            [this_root] + [p for p in [env.get("PYTHONPATH")] if p])
+
+        self.proc = subprocess.Popen(
+            self.command, stdin=subprocess.PIPE, stdout=subprocess.PIPE,
+            env=env, universal_newlines=True)
+        self.lines = queue.Queue()
+
+        reader = threading.Thread(
+            target=_read_results, args=(self.proc.stdout, self.lines))
+        reader.daemon = True
+        reader.start()
+
+        try:
+            line = self.lines.get(timeout=self.startup_timeout)
+        except queue.Empty:
+            self.kill()
+            raise RuntimeError("Worker not ready after {0}s".format(
+                self.startup_timeout))
+
+        if line is None:
+            code = self.proc.wait()
+            self.proc = None
+            raise RuntimeError(
+                "Worker exited with code {0} while starting".format(code))
+
+    def stop(self):
+        """Lets the worker process finish and waits for it"""
+        if self.proc is None:
+            return
+
+        try:
+            self.proc.stdin.close()
+        except (IOError, OSError):
+            pass
+
+        self.proc.wait()
+        self.proc = None
+
+    def kill(self):
+        """Kills the worker process"""
+        if self.proc is None:
+            return
+
+        try:
+            self.proc.kill()
+        except OSError:
+            pass
+
+        self.proc.wait()
+        self.proc = None
+
+    def process(self, scene):
+        """
+        Has the worker process a scene.
+
+        :param scene: path of the scene file
+        :type scene: str
+
+        :raises: None
+
+        :return: result of the scene, see :func:`process_scene`
+        :rtype: dict
+        """
+        if self.proc is None or self.proc.poll() is not None:
+            start = time.time()
+            try:
+                self.start()
+            except RuntimeError as e:
+                return _failed(scene, "startup", time.time() - start,
+                               str(e))
+
+        start = time.time()
+
+        try:
+            self.proc.stdin.write(scene + "\n")
+            self.proc.stdin.flush()
+            line = self.lines.get(timeout=self.timeout)
+
+        except queue.Empty:
+            self.kill()
+            return _failed(scene, "timeout", time.time() - start,
+                           "No result after {0}s".format(self.timeout))
+
+        except (IOError, OSError):
+            line = None
+
+        if line is None:
+            code = self.proc.wait()
+            self.proc = None
+            return _failed(scene, "crash", time.time() - start,
+                           "Worker exited with code {0}".format(code))
+
+        return json.loads(line)
+
+
+def run(scenes, workers=None, timeout=DEFAULT_TIMEOUT, ratio=None,
+        tolerance=None, save=False, executable=None, standin=None,
+        report=None, density=None, dry_run=False,
+        startup_timeout=DEFAULT_STARTUP_TIMEOUT):
+    """
+    Processes scene files with a pool of worker processes.
+
+    :param scenes: paths of the .ma/.mb files
+    :type scenes: list
+    :param workers: number of worker processes, one per cpu by default
+    :type workers: int
+    :param timeout: seconds a single scene may take
+    :type timeout: float
+    :param ratio: ratio to match every mesh to, only measures if None
+    :type ratio: float
+    :param tolerance: relative ratio difference left alone
+    :type tolerance: float
+    :param save: saves scenes in which meshes were rescaled
+    :type save: bool
+    :param executable: interpreter of the workers, this one by default
+    :type executable: str
+    :param standin: module imported by the workers instead of starting
+                    ``maya.standalone``
+    :type standin: str
+    :param report: path the merged JSON report is written to
+    :type report: str
+    :param density: (pixels, resolution, unit) texel density to match
+                    every mesh to instead of a ratio, converted with each
+                    scene's unit
+    :type density: tuple
+    :param dry_run: only work out the scale each mesh would get
+    :type dry_run: bool
+    :param startup_timeout: seconds a worker may take to start Maya
+    :type startup_timeout: float
+
+    :raises: None
+
+    :return: merged report
+    :rtype: dict
+    """
+    scenes = list(scenes)
+    workers = min(workers or multiprocessing.cpu_count(), len(scenes)) or 1
+
+    command = [executable or sys.executable, "-m", "UVRatio.batch",
+               "--serve"]
+    if ratio is not None:
+        command += ["--ratio", repr(ratio)]
+    if tolerance is not None:
+        command += ["--tolerance", repr(tolerance)]
+    if density is not None:
+        pixels, resolution, unit = density
+        command += ["--density", repr(pixels), "--resolution",
+                    repr(resolution), "--unit", unit]
+    if dry_run:
+        command += ["--dry-run"]
+    if save:
+        command += ["--save"]
+    if standin:
+        command += ["--standin", standin]
+
+    jobs = queue.Queue()
+    for job in enumerate(scenes):
+        jobs.put(job)
+
+    results = [None] * len(scenes)
+    start = time.time()
+
+    threads = []
+    for _ in range(workers):
+        thread = threading.Thread(
+            target=_drain,
+            args=(Worker(command, timeout, startup_timeout), jobs, results))
+        thread.start()
+        threads.append(thread)
+
+    for thread in threads:
+        thread.join()
+
+    merged = {"scenes": results,
+              "summary": _summarize(results, time.time() - start)}
+
+    if report:
+        with open(report, "w") as f:
+            json.dump(merged, f, indent=2, sort_keys=True)
+
+    return merged
+
+
+def process_scene(scene, ratio=None, tolerance=None, save=False,
+                  density=None, dry_run=False):
+    """
+    Opens a scene and measures, or matches, every mesh in it.
+
+    Runs inside a worker, Maya must already be initialized. A density is
+    turned into a ratio in the scene's linear unit. A dry run reports the
+    scale of every mesh and changes nothing.
+
+    :raises: None
+
+    :return: scene status and one entry per mesh
+    :rtype: dict
+    """
+    from maya import cmds
+    from maya.api import OpenMaya
+    from UVRatio.ui import models
+
+    if tolerance is None:
+        tolerance = models.DEFAULT_TOLERANCE
+
+    start = time.time()
+    result = {"scene": scene, "status": "ok", "meshes": []}
+
+    try:
+        cmds.file(scene, open=True, force=True)
+        changed = False
+
+        if density is not None:
+            ratio = models.density_to_ratio(*density)
+            result["ratio"] = ratio
+
+        for shape in cmds.ls(type="mesh", noIntermediate=True, long=True):
+
+            entry = {"shape": shape}
+            result["meshes"].append(entry)
+
+            selection = OpenMaya.MSelectionList()
+            selection.add(shape)
+
+            try:
+                mesh = models.Mesh(selection=selection)
+            except RuntimeError as e:
+                entry["error"] = str(e)
+                continue
+
+            entry.update({"transform": mesh.transforms[0],
+                          "faces": sum(mesh.counts),
+                          "world_area": mesh.world_area,
+                          "uv_area": mesh.uv_area,
+                          "ratio": mesh.ratio})
+
+            if ratio is None:
+                continue
+
+            entry["scale"] = ratio / mesh.ratio
+            entry["changed"] = abs(entry["scale"] - 1.0) > tolerance
+
+            if entry["changed"] and not dry_run:
+                mesh.resize(ratio)
+                changed = True
+
+        if save and changed:
+            cmds.file(save=True, force=True)
+
+        result["saved"] = bool(save and changed)
+
+    except Exception:
+        result["status"] = "error"
+        result["error"] = traceback.format_exc()
+
+    result["elapsed"] = time.time() - start
+
+    return result
+
+
+def serve(ratio=None, tolerance=None, save=False, standin=None,
+          density=None, dry_run=False):
+    """
+    Worker loop, says it is ready once Maya is initialized then answers
+    every scene path read from stdin.
+
+    :raises: None
+
+    :return: None
+    :rtype: NoneType
+    """
+    if standin:
+        module = importlib.import_module(standin)
+        # UVRatio.standin only replaces maya once installed
+        if hasattr(module, "install"):
+            module.install()
+    else:
+        import maya.standalone
+        maya.standalone.initialize(name="python")
+
+    sys.stdout.write(READY_LINE + "\n")
+    sys.stdout.flush()
+
+    for line in iter(sys.stdin.readline, ""):
+
+        scene = line.strip()
+        if not scene:
+            continue
+
+        result = process_scene(scene, ratio, tolerance, save, density,
+                               dry_run)
+        sys.stdout.write(RESULT_PREFIX + json.dumps(result) + "\n")
+        sys.stdout.flush()
+
+
+def main(argv=None):
+
+    parser = argparse.ArgumentParser(
+        prog="UVRatio.batch",
+        description="Measures or matches uv ratios of scene files.")
+    parser.add_argument("scenes", nargs="*", help=".ma/.mb files")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT)
+    parser.add_argument("--startup-timeout", type=float,
+                        default=DEFAULT_STARTUP_TIMEOUT,
+                        help="seconds a worker may take to start Maya")
+    parser.add_argument("--ratio", type=float, default=None,
+                        help="ratio to match every mesh to")
+    parser.add_argument("--density", type=float, default=None,
+                        help="texel density to match every mesh to, in "
+                             "pixels per --unit")
+    parser.add_argument("--resolution", type=int,
+                        default=DEFAULT_RESOLUTION,
+                        help="texture resolution of --density")
+    parser.add_argument("--unit", default="m",
+                        help="linear unit of --density")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="report the scale of every mesh, change none")
+    parser.add_argument("--tolerance", type=float, default=None)
+    parser.add_argument("--save", action="store_true",
+                        help="save scenes that were changed")
+    parser.add_argument("--executable", default=None,
+                        help="interpreter of the workers, e.g. mayapy")
+    parser.add_argument("--standin", default=None,
+                        help="module imported instead of maya.standalone")
+    parser.add_argument("--report", default=None,
+                        help="path of the merged JSON report")
+    parser.add_argument("--serve", action="store_true",
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    density = None
+    if args.density is not None:
+        density = (args.density, args.resolution, args.unit)
+
+    if args.serve:
+        serve(args.ratio, args.tolerance, args.save, args.standin, density,
+              args.dry_run)
+        return
+
+    merged = run(args.scenes, workers=args.workers, timeout=args.timeout,
+                 ratio=args.ratio, tolerance=args.tolerance, save=args.save,
+                 executable=args.executable, standin=args.standin,
+                 report=args.report, density=density, dry_run=args.dry_run,
+                 startup_timeout=args.startup_timeout)
+
+    summary = merged["summary"]
+    sys.stdout.write(
+        "{ok} ok, {error} error, {timeout} timeout, {crash} crash, "
+        "{startup} startup, {meshes} meshes in {elapsed:.1f}s\n".format(**summary))
+
+
+def _read_results(stream, lines):
+    """Queues the protocol lines of a worker, then None once it exits"""
+    for line in iter(stream.readline, ""):
+        if line.startswith(RESULT_PREFIX):
+            lines.put(line[len(RESULT_PREFIX):])
+        elif line.rstrip() == READY_LINE:
+            lines.put(READY_LINE)
+    lines.put(None)
+
+
+def _drain(worker, jobs, results):
+    """Processes queued scenes with a worker until none are left"""
+    try:
+        while True:
+            try:
+                index, scene = jobs.get_nowait()
+            except queue.Empty:
+                return
+
+            results[index] = worker.process(scene)
+    finally:
+        worker.stop()
+
+
+def _failed(scene, status, elapsed, error):
+    return {"scene": scene, "status": status, "meshes": [],
+            "elapsed": elapsed, "error": error}
+
+
+def _summarize(results, elapsed):
+    summary = dict((status, 0) for status in
+                   ("ok", "error", "timeout", "crash", "startup"))
+    summary["meshes"] = 0
+    summary["elapsed"] = elapsed
+
+    for result in results:
+        summary[result["status"]] += 1
+        summary["meshes"] += len(result["meshes"])
+
+    return summary
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Process-wide cache of mesh measurements.
+
+Entries are keyed by shape path, component selection and uv set, bounded
+by a byte budget with least recently used eviction, and dropped as soon
+as Maya reports the shape dirty or one of its attributes changed.
+"""
+import hashlib
+from collections import OrderedDict
+
+DEFAULT_BUDGET = 256 * 1024 * 1024
+
+
+class MeasurementCache(object):
+    """
+    LRU cache of measurements bounded by a byte budget.
+
+    :param budget: bytes the cached values may hold
+    :type budget: int
+    """
+
+    def __init__(self, budget=DEFAULT_BUDGET):
+
+        self.budget = budget
+        self.nbytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+        self._entries = OrderedDict()
+        self._callbacks = {}
+        self._scene_callbacks = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def get(self, key):
+        """
+        Gets a cached value and marks it as recently used.
+
+        :param key: key made by :func:`make_key`
+        :type key: tuple
+
+        :return: cached value, None on a miss
+        :rtype: object
+        """
+        try:
+            value, nbytes = self._entries.pop(key)
+        except KeyError:
+            self.misses += 1
+            return None
+
+        self._entries[key] = (value, nbytes)
+        self.hits += 1
+
+        return value
+
+    def put(self, key, value, nbytes, node=None):
+        """
+        Caches a value, evicting the least recently used ones over budget.
+
+        :param key: key made by :func:`make_key`
+        :type key: tuple
+        :param value: value to cache
+        :type value: object
+        :param nbytes: bytes held by the value
+        :type nbytes: int
+        :param node: shape whose changes invalidate the value
+        :type node: OpenMaya.MObject
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        if nbytes > self.budget:
+            return
+
+        self._discard(key)
+
+        self._entries[key] = (value, nbytes)
+        self.nbytes += nbytes
+
+        if node is not None and key[0] not in self._callbacks:
+            self._callbacks[key[0]] = _watch(node, self, key[0])
+
+            # a new scene can reuse the names of the cached shapes
+            if self._scene_callbacks is None:
+                self._scene_callbacks = _watch_scene(self)
+
+        while self.nbytes > self.budget:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self.evictions += 1
+            self._unwatch_unused(oldest[0])
+
+    def invalidate(self, shape):
+        """
+        Drops every value of a shape.
+
+        Callbacks of the shape stay registered, this is called from them.
+
+        :param shape: full path of the shape
+        :type shape: str
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        for key in [k for k in self._entries if k[0] == shape]:
+            self._discard(key)
+            self.invalidations += 1
+
+    def clear(self):
+        """
+        Drops every value and removes every callback.
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        self._entries.clear()
+        self.nbytes = 0
+
+        for shape in list(self._callbacks):
+            _unwatch(self._callbacks.pop(shape))
+
+    def stats(self):
+        """
+        Counters to tune the budget with.
+
+        :return: entries, bytes, budget, hits, misses, evictions and
+                 invalidations
+        :rtype: dict
+        """
+        return {"entries": len(self._entries),
+                "nbytes": self.nbytes,
+                "budget": self.budget,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations}
+
+    def _discard(self, key):
+        try:
+            _, nbytes = self._entries.pop(key)
+        except KeyError:
+            return
+        self.nbytes -= nbytes
+
+    def _unwatch_unused(self, shape):
+        if shape in self._callbacks and not any(
+                key[0] == shape for key in self._entries):
+            _unwatch(self._callbacks.pop(shape))
+
+
+def make_key(shape, faces=None, uv_set=None, matrix=None, precision=None):
+    """
+    Cache key of a measurement.
+
+    :param shape: full path of the shape
+    :type shape: str
+    :param faces: selected face ids, None for the whole mesh
+    :type faces: numpy.ndarray or NoneType
+    :param uv_set: uv set measured
+    :type uv_set: str
+    :param matrix: matrix points were measured with, None for object space
+    :type matrix: numpy.ndarray or NoneType
+    :param precision: storage the measurement was kept in
+    :type precision: str
+
+    :return: hashable key
+    :rtype: tuple
+    """
+    if faces is not None:
+        faces = hashlib.sha1(faces.tobytes()).hexdigest()
+
+    if matrix is not None:
+        matrix = hashlib.sha1(matrix.tobytes()).hexdigest()
+
+    return (shape, faces, uv_set, matrix, precision)
+
+
+def _watch(node, cache, shape):
+    """Invalidates a shape in the cache whenever Maya changes it"""
+    from maya.api import OpenMaya
+
+    def changed(*args):
+        cache.invalidate(shape)
+
+    return [OpenMaya.MNodeMessage.addAttributeChangedCallback(node, changed),
+            OpenMaya.MNodeMessage.addNodeDirtyCallback(node, changed),
+            OpenMaya.MNodeMessage.addNodePreRemovalCallback(node, changed)]
+
+
+def _watch_scene(cache):
+    """Empties the cache before a scene is emptied or opened"""
+    from maya.api import OpenMaya
+
+    def cleared(*args):
+        cache.clear()
+
+    return [OpenMaya.MSceneMessage.addCallback(
+        OpenMaya.MSceneMessage.kBeforeNew, cleared),
+            OpenMaya.MSceneMessage.addCallback(
+        OpenMaya.MSceneMessage.kBeforeOpen, cleared)]
+
+
+def _unwatch(callbacks):
+    from maya.api import OpenMaya
+
+    OpenMaya.MMessage.removeCallbacks(callbacks)
+
+
+#: Cache shared by every :class:`UVRatio.ui.models.Mesh`.
+measurements = MeasurementCache()
@@ -0,0 +1,1080 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Maya-free geometry core.
+
+Every function works on flat numpy arrays laid out like ``MFnMesh``
+returns them: ``counts`` holds the vertex count of each polygon and
+``connects`` the face-vertex indices of all polygons one after the other,
+so mixed n-gons are addressed through CSR-style offsets.
+"""
+from __future__ import division
+
+import math
+
+import numpy
+
+#: Storage of the ids a measurement keeps, face, point and uv ids of a
+#: Maya mesh all fit in 32 bits.
+INDEX_DTYPE = numpy.int32
+
+
+class Measurement(object):
+    """
+    Result of measuring a set of faces.
+
+    Ids are stored as :data:`INDEX_DTYPE`, per face areas as ``dtype``,
+    float32 halves them at the cost of precision.
+
+    :ivar faces: measured face ids
+    :ivar world_areas: world area of each measured face
+    :ivar uv_areas: uv area of each measured face
+    :ivar world_area: total world area
+    :ivar uv_area: total uv area
+    :ivar counts: vertex count of each measured face
+    :ivar connects: face-vertex point ids of the measured faces
+    :ivar uv_counts: uv count of each measured face
+    :ivar uv_ids: face-vertex uv ids of the measured faces
+    :ivar uv_indexes: sorted uv ids used by the measured faces
+    :ivar bounds: uv bounding box of the measured faces, see
+                  :func:`get_bounds`
+    :ivar pivot: center of the uv bounding box of the measured faces
+    """
+
+    __slots__ = ("faces", "world_areas", "uv_areas", "counts", "connects",
+                 "uv_counts", "uv_ids", "world_area", "uv_area",
+                 "uv_indexes", "bounds", "pivot", "offsets", "uv_offsets",
+                 "point_faces", "uv_faces")
+
+    def __init__(self, faces, world_areas, uv_areas, counts, connects,
+                 uv_counts, uv_ids, uv_indexes, bounds,
+                 dtype=numpy.float64):
+
+        self.faces = _as_index(faces)
+        self.world_areas = numpy.asarray(world_areas, dtype=dtype)
+        self.uv_areas = numpy.asarray(uv_areas, dtype=dtype)
+        self.counts = _as_index(counts)
+        self.connects = _as_index(connects)
+        self.uv_counts = _as_index(uv_counts)
+        self.uv_ids = _as_index(uv_ids)
+        # totals are summed before areas are narrowed
+        self.world_area = float(world_areas.sum())
+        self.uv_area = float(uv_areas.sum())
+        self.uv_indexes = _as_index(uv_indexes)
+        self.bounds = bounds
+        self.pivot = get_pivot(bounds)
+
+        # built on the first remeasure, see get_inverse
+        self.offsets = None
+        self.uv_offsets = None
+        self.point_faces = None
+        self.uv_faces = None
+
+    @property
+    def ratio(self):
+        return get_ratio(self.uv_area, self.world_area)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the arrays of the measurement"""
+        arrays = [self.faces, self.world_areas, self.uv_areas, self.counts,
+                  self.connects, self.uv_counts, self.uv_ids,
+                  self.uv_indexes]
+        for index in (self.offsets, self.uv_offsets):
+            if index is not None:
+                arrays.append(index)
+        for inverse in (self.point_faces, self.uv_faces):
+            if inverse is not None:
+                arrays.extend(inverse)
+        return sum(array.nbytes for array in arrays)
+
+
+def _as_index(ids):
+    """Ids as :data:`INDEX_DTYPE`, copied only if they aren't already"""
+    return numpy.asarray(ids, dtype=INDEX_DTYPE)
+
+
+def get_ratio(uv_area, world_area):
+    """
+    Ratio between uv area and world area.
+
+    :raises: ``RuntimeError`` if the world area is zero
+
+    :return: square root of uv area over world area
+    :rtype: float
+    """
+    try:
+        return math.sqrt(uv_area / world_area)
+    except ZeroDivisionError:
+        raise RuntimeError(
+            "Unable to calculate area because it's zero...")
+
+
+def transform_points(points, matrix):
+    """
+    Moves points by a Maya style (row vector) 4x4 matrix.
+
+    :param points: (n, 3) point positions
+    :type points: numpy.ndarray
+    :param matrix: 4x4 matrix, or its 16 values
+    :type matrix: numpy.ndarray
+
+    :return: (n, 3) transformed positions
+    :rtype: numpy.ndarray
+    """
+    matrix = numpy.asarray(matrix, dtype=numpy.float64).reshape(4, 4)
+    points = numpy.asarray(points, dtype=numpy.float64)[:, :3]
+    return numpy.dot(points, matrix[:3, :3]) + matrix[3, :3]
+
+
+def get_area_scale(matrix):
+    """
+    How much a matrix scales areas, when it scales them all the same.
+
+    :param matrix: 4x4 matrix, or its 16 values
+    :type matrix: numpy.ndarray
+
+    :return: area scale of a rotation and uniform scale, None otherwise
+    :rtype: float or NoneType
+    """
+    axes = numpy.asarray(matrix, dtype=numpy.float64).reshape(4, 4)[:3, :3]
+    gram = numpy.dot(axes, axes.T)
+    scale = gram.trace() / 3.0
+
+    if numpy.allclose(gram, numpy.eye(3) * scale, rtol=0.0,
+                      atol=1e-12 * max(scale, 1.0)):
+        return float(scale)
+
+    return None
+
+
+def get_offsets(counts):
+    """
+    CSR offsets of a polygon count array.
+
+    :return: start of every face plus the total, ``len(counts) + 1`` long
+    :rtype: numpy.ndarray
+    """
+    offsets = numpy.zeros(len(counts) + 1, dtype=numpy.int64)
+    numpy.cumsum(counts, out=offsets[1:])
+    return offsets
+
+
+def get_faces(face_mask, face_count):
+    """
+    Face ids from an optional face mask.
+
+    :param face_mask: None for every face, a boolean mask or face ids
+    :type face_mask: numpy.ndarray or NoneType
+    :param face_count: number of faces in the mesh
+    :type face_count: int
+
+    :return: face ids
+    :rtype: numpy.ndarray
+    """
+    if face_mask is None:
+        return numpy.arange(face_count)
+
+    face_mask = numpy.asarray(face_mask)
+
+    if face_mask.dtype == numpy.bool_:
+        return numpy.nonzero(face_mask)[0]
+
+    return face_mask.astype(numpy.int64)
+
+
+def gather(values, counts, offsets):
+    """
+    Gathers the face-vertex values of a subset of faces.
+
+    :param values: flat face-vertex values of the whole mesh
+    :type values: numpy.ndarray
+    :param counts: vertex count of each wanted face
+    :type counts: numpy.ndarray
+    :param offsets: start of each wanted face in ``values``
+    :type offsets: numpy.ndarray
+
+    :return: face-vertex values of the wanted faces, face after face
+    :rtype: numpy.ndarray
+    """
+    total = int(counts.sum())
+    starts = numpy.repeat(offsets - (numpy.cumsum(counts) - counts), counts)
+    return values[starts + numpy.arange(total)]
+
+
+def get_fan(counts):
+    """
+    Triangle fan of each face in a flat face-vertex list.
+
+    :return: face-vertex positions of the first, second and third corner
+             of every triangle, and the face of each triangle
+    :rtype: tuple
+    """
+    starts = numpy.cumsum(counts) - counts
+    face = numpy.repeat(numpy.arange(len(counts)), counts)
+    local = numpy.arange(face.size) - starts[face]
+    second = numpy.nonzero((local >= 1) & (local <= counts[face] - 2))[0]
+    return starts[face[second]], second, second + 1, face[second]
+
+
+def _as_float(values):
+    """Positions as float64, float32 ones are measured in float64"""
+    return numpy.asarray(values, dtype=numpy.float64)
+
+
+def get_world_areas(points, counts, connects):
+    """
+    Triangulated area of each face.
+
+    :param points: (n, 3) point positions
+    :type points: numpy.ndarray
+    :param counts: vertex count of each face
+    :type counts: numpy.ndarray
+    :param connects: face-vertex point indices, face after face
+    :type connects: numpy.ndarray
+
+    :return: area of each face
+    :rtype: numpy.ndarray
+    """
+    first, second, third, face = get_fan(counts)
+    a = _as_float(points[connects[first]])
+    edge_1 = _as_float(points[connects[second]]) - a
+    edge_2 = _as_float(points[connects[third]]) - a
+    areas = 0.5 * numpy.sqrt(
+        numpy.square(numpy.cross(edge_1, edge_2)).sum(axis=1))
+    return numpy.bincount(face, weights=areas, minlength=len(counts))
+
+
+def get_uv_areas(uvs, counts, uv_ids):
+    """
+    Area of each face in uv space.
+
+    :param uvs: (n, 2) uv positions
+    :type uvs: numpy.ndarray
+    :param counts: uv count of each face, zero for unmapped faces
+    :type counts: numpy.ndarray
+    :param uv_ids: face-vertex uv indices, face after face
+    :type uv_ids: numpy.ndarray
+
+    :return: uv area of each face
+    :rtype: numpy.ndarray
+    """
+    first, second, third, face = get_fan(counts)
+    a = _as_float(uvs[uv_ids[first]])
+    edge_1 = _as_float(uvs[uv_ids[second]]) - a
+    edge_2 = _as_float(uvs[uv_ids[third]]) - a
+    signed = 0.5 * (edge_1[:, 0] * edge_2[:, 1] - edge_1[:, 1] * edge_2[:, 0])
+    return numpy.abs(numpy.bincount(
+        face, weights=signed, minlength=len(counts)))
+
+
+def get_used(ids, return_inverse=False):
+    """
+    Sorted unique ids, like ``numpy.unique`` but marking ids in a table
+    instead of sorting them, ids are small non negative ints.
+
+    :param ids: ids, any number of times each
+    :type ids: numpy.ndarray
+    :param return_inverse: also returns the position of each id among
+                           the unique ones
+    :type return_inverse: bool
+
+    :return: unique ids, and their inverse if asked for
+    :rtype: numpy.ndarray or tuple
+    """
+    ids = numpy.asarray(ids, dtype=numpy.int64).ravel()
+    used = numpy.zeros(int(ids.max()) + 1 if ids.size else 0, dtype=bool)
+    used[ids] = True
+    unique = numpy.flatnonzero(used)
+
+    if not return_inverse:
+        return unique
+
+    position = numpy.cumsum(used) - 1
+    return unique, position[ids]
+
+
+def get_faces_using(values, counts, ids, size):
+    """
+    Faces with any of the given ids among their face-vertex values, the
+    faces of selected points or uvs.
+
+    :param values: face-vertex point or uv ids, face after face
+    :type values: numpy.ndarray
+    :param counts: vertex, or uv, count of each face
+    :type counts: numpy.ndarray
+    :param ids: selected point or uv ids
+    :type ids: numpy.ndarray
+    :param size: number of points or uvs
+    :type size: int
+
+    :return: sorted face ids
+    :rtype: numpy.ndarray
+    """
+    marked = numpy.zeros(size, dtype=bool)
+    marked[numpy.asarray(ids, dtype=numpy.int64)] = True
+
+    face = numpy.repeat(numpy.arange(len(counts)), counts)
+    return get_used(face[marked[values]])
+
+
+def get_edge_faces(counts, connects, edges, point_count):
+    """
+    Faces bordered by any of the given edges.
+
+    :param counts: vertex count of each face
+    :type counts: numpy.ndarray
+    :param connects: face-vertex point ids
+    :type connects: numpy.ndarray
+    :param edges: (n, 2) point ids of the selected edges
+    :type edges: numpy.ndarray
+    :param point_count: number of points
+    :type point_count: int
+
+    :return: sorted face ids
+    :rtype: numpy.ndarray
+    """
+    offsets = get_offsets(counts)
+
+    # every corner's edge runs to the next corner of its face
+    following = numpy.arange(len(connects)) + 1
+    closed = numpy.asarray(counts) > 0
+    following[offsets[1:][closed] - 1] = offsets[:-1][closed]
+
+    a = numpy.asarray(connects, dtype=numpy.int64)
+    b = a[following]
+    keys = numpy.minimum(a, b) * point_count + numpy.maximum(a, b)
+
+    edges = numpy.asarray(edges, dtype=numpy.int64).reshape(-1, 2)
+    wanted = numpy.sort(edges.min(axis=1) * point_count + edges.max(axis=1))
+
+    # binary search, faster than numpy.isin hashing millions of keys
+    found = numpy.zeros(len(keys), dtype=bool)
+    if len(wanted):
+        index = numpy.searchsorted(wanted, keys).clip(max=len(wanted) - 1)
+        found = wanted[index] == keys
+
+    face = numpy.repeat(numpy.arange(len(counts)), counts)
+    return get_used(face[found])
+
+
+def get_bounds(uvs, uv_indexes):
+    """
+    Bounding box of the given uvs.
+
+    :return: (2, 2) minimum and maximum, None if there are no uvs
+    :rtype: numpy.ndarray or NoneType
+    """
+    if not len(uv_indexes):
+        return None
+
+    used = uvs[uv_indexes]
+    return numpy.array([used.min(axis=0), used.max(axis=0)])
+
+
+def get_pivot(bounds):
+    """
+    Center of a bounding box.
+
+    :return: u and v of the center, the origin if there are no bounds
+    :rtype: list
+    """
+    if bounds is None:
+        return [0.0, 0.0]
+
+    (min_x, min_y), (max_x, max_y) = bounds
+    return [float(((max_x - min_x) / 2.0) + min_x),
+            float(((max_y - min_y) / 2.0) + min_y)]
+
+
+def measure_world(points, counts, connects, face_mask=None):
+    """
+    Measures the world area of a mesh, or part of it.
+
+    The result is shared by :func:`measure_uvs` calls for every uv set.
+
+    :param points: (n, 3) point positions
+    :type points: numpy.ndarray
+    :param counts: vertex count of each face
+    :type counts: numpy.ndarray
+    :param connects: face-vertex point indices
+    :type connects: numpy.ndarray
+    :param face_mask: None for every face, a boolean mask or face ids
+    :type face_mask: numpy.ndarray or NoneType
+
+    :return: face ids, their vertex counts, face-vertex point ids and
+             world areas
+    :rtype: tuple
+    """
+    points = numpy.asarray(points, dtype=numpy.float64)[:, :3]
+    counts = numpy.asarray(counts, dtype=numpy.int64)
+    connects = numpy.asarray(connects, dtype=numpy.int64)
+
+    faces = get_faces(face_mask, len(counts))
+
+    face_counts = counts[faces]
+    face_connects = gather(connects, face_counts, get_offsets(counts)[faces])
+    world_areas = get_world_areas(points, face_counts, face_connects)
+
+    return faces, face_counts, face_connects, world_areas
+
+
+def place_world(world, points, matrix):
+    """
+    World measurement of an instance from its shape's object space one.
+
+    :param world: object space result of :func:`measure_world`
+    :type world: tuple
+    :param points: (n, 3) object space point positions
+    :type points: numpy.ndarray
+    :param matrix: matrix of the instance, None to stay in object space
+    :type matrix: numpy.ndarray or NoneType
+
+    :return: same as :func:`measure_world`, topology is shared
+    :rtype: tuple
+    """
+    if matrix is None:
+        return world
+
+    faces, face_counts, face_connects, areas = world
+
+    scale = get_area_scale(matrix)
+    if scale is not None:
+        return faces, face_counts, face_connects, areas * scale
+
+    return faces, face_counts, face_connects, get_world_areas(
+        transform_points(points, matrix), face_counts, face_connects)
+
+
+def place_measurement(measurement, world_areas):
+    """
+    Measurement of an instance of an already measured shape.
+
+    The uv side is the same for every instance and only copied, the
+    copies are updated on their own by :func:`remeasure`.
+
+    :param measurement: measurement of another instance
+    :type measurement: :class:`Measurement`
+    :param world_areas: world area of each face of this instance
+    :type world_areas: numpy.ndarray
+
+    :return: measurement of this instance
+    :rtype: :class:`Measurement`
+    """
+    return Measurement(
+        measurement.faces, world_areas.copy(), measurement.uv_areas.copy(),
+        measurement.counts, measurement.connects, measurement.uv_counts,
+        measurement.uv_ids, measurement.uv_indexes,
+        None if measurement.bounds is None else measurement.bounds.copy(),
+        dtype=measurement.uv_areas.dtype)
+
+
+def place_shells(shells, measurement):
+    """
+    Shell table of an instance from another instance's one.
+
+    :param shells: shell table of another instance
+    :type shells: :class:`ShellTable`
+    :param measurement: measurement of this instance
+    :type measurement: :class:`Measurement`
+
+    :return: shell table of this instance
+    :rtype: :class:`ShellTable`
+    """
+    mapped = shells.face_shells >= 0
+    world_areas = numpy.bincount(
+        shells.face_shells[mapped],
+        weights=measurement.world_areas[mapped], minlength=len(shells))
+
+    return ShellTable(shells.face_shells, shells.face_counts, world_areas,
+                      shells.uv_areas.copy(), shells.centers.copy(),
+                      shells.uv_shells)
+
+
+def copy_measurement(measurement):
+    """
+    Copy of a measurement that can be updated and scaled on its own.
+
+    Areas and bounds are copied, face and uv ids and the indexes built
+    from them never change and are shared.
+
+    :param measurement: measurement to copy
+    :type measurement: :class:`Measurement`
+
+    :return: the copy
+    :rtype: :class:`Measurement`
+    """
+    copy = Measurement.__new__(Measurement)
+    for name in Measurement.__slots__:
+        setattr(copy, name, getattr(measurement, name))
+
+    copy.world_areas = measurement.world_areas.copy()
+    copy.uv_areas = measurement.uv_areas.copy()
+    copy.pivot = list(measurement.pivot)
+    if measurement.bounds is not None:
+        copy.bounds = measurement.bounds.copy()
+
+    return copy
+
+
+def copy_shells(shells):
+    """
+    Copy of a shell table that can be updated and scaled on its own, see
+    :func:`copy_measurement`.
+
+    :param shells: shell table to copy
+    :type shells: :class:`ShellTable`
+
+    :return: the copy
+    :rtype: :class:`ShellTable`
+    """
+    copy = ShellTable.__new__(ShellTable)
+    for name in ShellTable.__slots__:
+        setattr(copy, name, getattr(shells, name))
+
+    copy.world_areas = shells.world_areas.copy()
+    copy.uv_areas = shells.uv_areas.copy()
+    copy.centers = shells.centers.copy()
+
+    return copy
+
+
+def scale_measurement(measurement, uvs, uv_ids, scale, pivot):
+    """
+    Updates a measurement after its uvs were scaled around a pivot.
+
+    Uv areas grow by the square of the scale, the bounding box and the
+    given uvs move away from the pivot. Instances of a shape share their
+    uvs, so only ``uv_ids`` are moved, the ones the scale wrote.
+
+    :param measurement: measurement of the scaled uvs
+    :type measurement: :class:`Measurement`
+    :param uvs: (n, 2) uv positions it was measured from
+    :type uvs: numpy.ndarray
+    :param uv_ids: ids of the uvs scaled
+    :type uv_ids: numpy.ndarray
+    :param scale: scale of u and v
+    :type scale: float
+    :param pivot: u and v scaled around
+    :type pivot: list
+
+    :return: None
+    :rtype: NoneType
+    """
+    area_scale = scale * scale
+    pivot = numpy.asarray(pivot, dtype=numpy.float64)
+
+    measurement.uv_areas *= area_scale
+    measurement.uv_area *= area_scale
+
+    if measurement.bounds is not None:
+        measurement.bounds = (measurement.bounds - pivot) * scale + pivot
+        measurement.pivot = get_pivot(measurement.bounds)
+
+    if uvs is not None and len(uv_ids):
+        uv_ids = _as_index(uv_ids)
+        uvs[uv_ids] = (uvs[uv_ids] - pivot) * scale + pivot
+
+
+def scale_shells(shells, scale, pivot):
+    """
+    Updates a shell table after its uvs were scaled around a pivot, see
+    :func:`scale_measurement`.
+
+    :param shells: shell table of the scaled uvs
+    :type shells: :class:`ShellTable`
+    :param scale: scale of u and v
+    :type scale: float
+    :param pivot: u and v scaled around
+    :type pivot: list
+
+    :return: None
+    :rtype: NoneType
+    """
+    pivot = numpy.asarray(pivot, dtype=numpy.float64)
+
+    shells.uv_areas *= scale * scale
+    shells.centers = (shells.centers - pivot) * scale + pivot
+
+
+def measure_uvs(world, uvs, uv_counts, uv_ids, dtype=numpy.float64):
+    """
+    Measures one uv set of faces measured by :func:`measure_world`.
+
+    :param world: result of :func:`measure_world`
+    :type world: tuple
+    :param uvs: (n, 2) uv positions
+    :type uvs: numpy.ndarray
+    :param uv_counts: uv count of each face, zero for unmapped faces
+    :type uv_counts: numpy.ndarray
+    :param uv_ids: face-vertex uv indices of the mapped faces
+    :type uv_ids: numpy.ndarray
+    :param dtype: storage of the per face areas
+    :type dtype: numpy.dtype
+
+    :return: per-face and total areas, uv ids and pivot
+    :rtype: :class:`Measurement`
+    """
+    faces, face_counts, face_connects, world_areas = world
+
+    uvs = numpy.asarray(uvs, dtype=numpy.float64).reshape(-1, 2)
+    uv_counts = numpy.asarray(uv_counts, dtype=numpy.int64)
+    uv_ids = numpy.asarray(uv_ids, dtype=numpy.int64)
+
+    face_uv_counts = uv_counts[faces]
+    face_uv_ids = gather(
+        uv_ids, face_uv_counts, get_offsets(uv_counts)[faces])
+    uv_areas = get_uv_areas(uvs, face_uv_counts, face_uv_ids)
+
+    uv_indexes = get_used(face_uv_ids)
+
+    # world areas are copied, remeasure updates them per measurement
+    return Measurement(faces, world_areas.copy(), uv_areas, face_counts,
+                       face_connects, face_uv_counts, face_uv_ids,
+                       uv_indexes, get_bounds(uvs, uv_indexes), dtype=dtype)
+
+
+def measure(points, uvs, counts, connects, uv_counts, uv_ids,
+            face_mask=None):
+    """
+    Measures world and uv area of a mesh, or part of it.
+
+    :param points: (n, 3) point positions
+    :type points: numpy.ndarray
+    :param uvs: (n, 2) uv positions
+    :type uvs: numpy.ndarray
+    :param counts: vertex count of each face
+    :type counts: numpy.ndarray
+    :param connects: face-vertex point indices
+    :type connects: numpy.ndarray
+    :param uv_counts: uv count of each face, zero for unmapped faces
+    :type uv_counts: numpy.ndarray
+    :param uv_ids: face-vertex uv indices of the mapped faces
+    :type uv_ids: numpy.ndarray
+    :param face_mask: None for every face, a boolean mask or face ids
+    :type face_mask: numpy.ndarray or NoneType
+
+    :return: per-face and total areas, uv ids and pivot
+    :rtype: :class:`Measurement`
+    """
+    return measure_uvs(
+        measure_world(points, counts, connects, face_mask=face_mask),
+        uvs, uv_counts, uv_ids)
+
+
+def get_inverse(values, counts, size):
+    """
+    Inverts a face-vertex array, the faces using each value.
+
+    :param values: face-vertex point or uv ids, face after face
+    :type values: numpy.ndarray
+    :param counts: vertex count of each face
+    :type counts: numpy.ndarray
+    :param size: number of points or uvs
+    :type size: int
+
+    :return: CSR offsets per point or uv, and the faces
+    :rtype: tuple
+    """
+    face = numpy.repeat(numpy.arange(len(counts)), counts)
+    order = numpy.argsort(values, kind="stable")
+    return (get_offsets(numpy.bincount(values, minlength=size)),
+            face[order])
+
+
+def get_touched_faces(inverse, ids):
+    """
+    Faces using any of the given points or uvs.
+
+    :param inverse: result of :func:`get_inverse`
+    :type inverse: tuple
+    :param ids: point or uv ids
+    :type ids: numpy.ndarray
+
+    :return: sorted face positions
+    :rtype: numpy.ndarray
+    """
+    offsets, faces = inverse
+    ids = numpy.asarray(ids, dtype=numpy.int64)
+    ids = ids[ids < len(offsets) - 1]
+    counts = offsets[ids + 1] - offsets[ids]
+    return numpy.unique(gather(faces, counts, offsets[ids]))
+
+
+def remeasure(measurement, points, uvs, point_ids=None, uv_ids=None,
+              old_uvs=None, matrix=None):
+    """
+    Updates a measurement in place after some points or uvs moved.
+
+    Only the faces using the given points or uvs are measured again and
+    the totals are adjusted by the difference, so the cost follows the
+    number of changed faces. The inverted indexes this needs are built
+    once, on the first call. The uv bounding box is grown by the moved
+    uvs when their old positions were inside it, and taken again from
+    every used uv otherwise.
+
+    :param measurement: measurement to update
+    :type measurement: :class:`Measurement`
+    :param points: (n, 3) current point positions
+    :type points: numpy.ndarray
+    :param uvs: (n, 2) current uv positions
+    :type uvs: numpy.ndarray
+    :param point_ids: ids of the points that moved
+    :type point_ids: numpy.ndarray
+    :param uv_ids: ids of the uvs that moved
+    :type uv_ids: numpy.ndarray
+    :param old_uvs: (n, 2) positions of the moved uvs before they moved
+    :type old_uvs: numpy.ndarray
+    :param matrix: matrix the points are measured with, only the points
+                   of the measured faces are moved by it
+    :type matrix: numpy.ndarray or NoneType
+
+    :return: positions of the faces measured again, and the change of
+             their world and uv areas
+    :rtype: tuple
+    """
+    # stored positions may be float32, only the corners used are widened
+    points = numpy.asarray(points)[:, :3]
+    uvs = numpy.asarray(uvs).reshape(-1, 2)
+
+    touched = [numpy.zeros(0, dtype=numpy.int64)]
+
+    if point_ids is not None and len(point_ids):
+        if measurement.point_faces is None:
+            measurement.point_faces = get_inverse(
+                measurement.connects, measurement.counts, len(points))
+        touched.append(get_touched_faces(measurement.point_faces, point_ids))
+
+    if uv_ids is not None and len(uv_ids):
+        if measurement.uv_faces is None:
+            measurement.uv_faces = get_inverse(
+                measurement.uv_ids, measurement.uv_counts, len(uvs))
+        touched.append(get_touched_faces(measurement.uv_faces, uv_ids))
+        measurement.bounds = _update_bounds(
+            measurement, uvs, numpy.asarray(uv_ids, dtype=numpy.int64),
+            old_uvs)
+        measurement.pivot = get_pivot(measurement.bounds)
+
+    faces = numpy.unique(numpy.concatenate(touched))
+
+    if measurement.offsets is None:
+        measurement.offsets = get_offsets(measurement.counts)
+        measurement.uv_offsets = get_offsets(measurement.uv_counts)
+
+    counts = measurement.counts[faces]
+    connects = gather(measurement.connects, counts, measurement.offsets[faces])
+
+    if matrix is None:
+        world_areas = get_world_areas(points, counts, connects)
+    else:
+        used, connects = numpy.unique(connects, return_inverse=True)
+        world_areas = get_world_areas(
+            transform_points(points[used], matrix), counts, connects.ravel())
+
+    uv_counts = measurement.uv_counts[faces]
+    uv_areas = get_uv_areas(uvs, uv_counts, gather(
+        measurement.uv_ids, uv_counts, measurement.uv_offsets[faces]))
+
+    world_delta = world_areas - measurement.world_areas[faces]
+    uv_delta = uv_areas - measurement.uv_areas[faces]
+
+    measurement.world_areas[faces] = world_areas
+    measurement.uv_areas[faces] = uv_areas
+    measurement.world_area += float(world_delta.sum())
+    measurement.uv_area += float(uv_delta.sum())
+
+    return faces, world_delta, uv_delta
+
+
+def _update_bounds(measurement, uvs, uv_ids, old_uvs):
+    """Bounding box of a measurement after some of its uvs moved"""
+    bounds = measurement.bounds
+    offsets = measurement.uv_faces[0]
+
+    # only the moved uvs the measured faces use
+    used = offsets[uv_ids + 1] > offsets[uv_ids]
+
+    if not used.any():
+        return bounds
+
+    if bounds is None or old_uvs is None:
+        return get_bounds(uvs, measurement.uv_indexes)
+
+    old_uvs = numpy.asarray(old_uvs, dtype=numpy.float64).reshape(-1, 2)
+    old_uvs = old_uvs[used]
+
+    if ((old_uvs <= bounds[0]) | (old_uvs >= bounds[1])).any():
+        return get_bounds(uvs, measurement.uv_indexes)
+
+    moved = uvs[uv_ids[used]]
+    return numpy.array([numpy.minimum(bounds[0], moved.min(axis=0)),
+                        numpy.maximum(bounds[1], moved.max(axis=0))])
+
+
+class ShellTable(object):
+    """
+    Per uv shell measurement of a set of faces.
+
+    :ivar face_shells: shell of each measured face, -1 for unmapped faces
+    :ivar face_counts: number of faces in each shell
+    :ivar world_areas: world area of each shell
+    :ivar uv_areas: uv area of each shell
+    :ivar centers: (n, 2) center of the uv bounding box of each shell
+    :ivar uv_shells: shell of each uv of ``Measurement.uv_indexes``
+    """
+
+    __slots__ = ("face_shells", "uv_shells", "shell_uvs", "face_counts",
+                 "world_areas", "uv_areas", "centers")
+
+    def __init__(self, face_shells, face_counts, world_areas, uv_areas,
+                 centers, uv_shells):
+
+        self.face_shells = _as_index(face_shells)
+        self.uv_shells = _as_index(uv_shells)
+
+        # uvs of each shell, built on the first update_shells
+        self.shell_uvs = None
+        self.face_counts = face_counts
+        self.world_areas = world_areas
+        self.uv_areas = uv_areas
+        self.centers = centers
+
+    def __len__(self):
+        return len(self.face_counts)
+
+    @property
+    def nbytes(self):
+        """Bytes held by the arrays of the table"""
+        return sum(array.nbytes for array in (
+            self.face_shells, self.face_counts, self.world_areas,
+            self.uv_areas, self.centers, self.uv_shells))
+
+    @property
+    def ratios(self):
+        """Ratio of each shell, zero where the world area is zero"""
+        ratios = numpy.zeros(len(self))
+        valid = self.world_areas > 0
+        ratios[valid] = numpy.sqrt(
+            self.uv_areas[valid] / self.world_areas[valid])
+        return ratios
+
+
+def get_shell_labels(uv_counts, uv_ids):
+    """
+    Labels uv shells from face-vertex uv connectivity.
+
+    Consecutive uvs of a face are linked, and the links are resolved with
+    an array based union-find: every pass hooks the larger root of each
+    link onto the smaller one, then compresses paths by pointer jumping.
+
+    :param uv_counts: uv count of each face, zero for unmapped faces
+    :type uv_counts: numpy.ndarray
+    :param uv_ids: face-vertex uv indices, face after face
+    :type uv_ids: numpy.ndarray
+
+    :return: sorted uv ids used, and the shell of each of them
+    :rtype: tuple
+    """
+    uv_indexes, corners = get_used(uv_ids, return_inverse=True)
+
+    face = numpy.repeat(numpy.arange(len(uv_counts)), uv_counts)
+    linked = face[1:] == face[:-1]
+    a = corners[:-1][linked]
+    b = corners[1:][linked]
+
+    parent = numpy.arange(uv_indexes.size)
+
+    while True:
+        root_a = parent[a]
+        root_b = parent[b]
+        split = root_a != root_b
+
+        if not split.any():
+            break
+
+        a, b = a[split], b[split]
+        root_a, root_b = root_a[split], root_b[split]
+        numpy.minimum.at(parent,
+                         numpy.maximum(root_a, root_b),
+                         numpy.minimum(root_a, root_b))
+
+        while True:
+            grand = parent[parent]
+            if numpy.array_equal(grand, parent):
+                break
+            parent = grand
+
+    _, shells = get_used(parent, return_inverse=True)
+    return uv_indexes, shells
+
+
+def measure_shells(uvs, measurement):
+    """
+    Measures every uv shell of a measurement.
+
+    :param uvs: (n, 2) uv positions the measurement was made from
+    :type uvs: numpy.ndarray
+    :param measurement: measured faces
+    :type measurement: :class:`Measurement`
+
+    :return: per shell areas and centers
+    :rtype: :class:`ShellTable`
+    """
+    uvs = numpy.asarray(uvs, dtype=numpy.float64).reshape(-1, 2)
+    uv_counts = measurement.uv_counts
+
+    uv_indexes, uv_shells = get_shell_labels(uv_counts, measurement.uv_ids)
+    shell_count = int(uv_shells.max()) + 1 if uv_shells.size else 0
+
+    # every corner of a face is in the same shell, use the first one
+    mapped = uv_counts > 0
+    starts = (numpy.cumsum(uv_counts) - uv_counts)[mapped]
+    face_shells = numpy.full(len(uv_counts), -1, dtype=numpy.int64)
+    face_shells[mapped] = uv_shells[numpy.searchsorted(
+        uv_indexes, measurement.uv_ids[starts])]
+
+    shell_faces = face_shells[mapped]
+    face_counts = numpy.bincount(shell_faces, minlength=shell_count)
+    world_areas = numpy.bincount(
+        shell_faces, weights=measurement.world_areas[mapped],
+        minlength=shell_count)
+    uv_areas = numpy.bincount(
+        shell_faces, weights=measurement.uv_areas[mapped],
+        minlength=shell_count)
+
+    return ShellTable(face_shells, face_counts, world_areas, uv_areas,
+                      get_shell_centers(uvs[uv_indexes], uv_shells,
+                                        shell_count),
+                      uv_shells)
+
+
+def get_shell_centers(used, uv_shells, shell_count):
+    """
+    Center of the uv bounding box of each shell.
+
+    :param used: (n, 2) positions of the uvs
+    :type used: numpy.ndarray
+    :param uv_shells: shell of each uv
+    :type uv_shells: numpy.ndarray
+    :param shell_count: number of shells
+    :type shell_count: int
+
+    :return: (shell_count, 2) centers
+    :rtype: numpy.ndarray
+    """
+    low = numpy.full((shell_count, 2), numpy.inf)
+    high = numpy.full((shell_count, 2), -numpy.inf)
+    numpy.minimum.at(low, uv_shells, used)
+    numpy.maximum.at(high, uv_shells, used)
+    return (high - low) / 2.0 + low
+
+
+def update_shells(shells, measurement, uvs, faces, world_delta, uv_delta):
+    """
+    Updates a shell table in place after :func:`remeasure`.
+
+    :param shells: table to update
+    :type shells: :class:`ShellTable`
+    :param measurement: the updated measurement
+    :type measurement: :class:`Measurement`
+    :param uvs: (n, 2) current uv positions
+    :type uvs: numpy.ndarray
+    :param faces: face positions returned by :func:`remeasure`
+    :type faces: numpy.ndarray
+    :param world_delta: world area changes returned by :func:`remeasure`
+    :type world_delta: numpy.ndarray
+    :param uv_delta: uv area changes returned by :func:`remeasure`
+    :type uv_delta: numpy.ndarray
+
+    :raises: None
+
+    :return: None
+    :rtype: NoneType
+    """
+    face_shells = shells.face_shells[faces]
+    mapped = face_shells >= 0
+
+    numpy.add.at(shells.world_areas, face_shells[mapped],
+                 world_delta[mapped])
+    numpy.add.at(shells.uv_areas, face_shells[mapped], uv_delta[mapped])
+
+    # only the shells of moved faces can have moved
+    touched = numpy.unique(face_shells[mapped])
+    if not touched.size:
+        return
+
+    if shells.shell_uvs is None:
+        shells.shell_uvs = (
+            get_offsets(numpy.bincount(shells.uv_shells,
+                                       minlength=len(shells))),
+            numpy.argsort(shells.uv_shells, kind="stable"))
+
+    offsets, order = shells.shell_uvs
+    counts = offsets[touched + 1] - offsets[touched]
+    used = gather(order, counts, offsets[touched])
+
+    uvs = numpy.asarray(uvs, dtype=numpy.float64).reshape(-1, 2)
+    shells.centers[touched] = get_shell_centers(
+        uvs[measurement.uv_indexes[used]],
+        numpy.repeat(numpy.arange(touched.size), counts), touched.size)
+
+
+def measure_shape(points, counts, connects, uv_sets, face_mask=None,
+                  dtype=numpy.float64):
+    """
+    Measures a shape in object space, in every uv set given.
+
+    This is the numeric work of one shape, it doesn't need Maya and
+    releases the GIL in numpy, so shapes can be measured by a thread pool.
+
+    :param points: (n, 3) object space point positions
+    :type points: numpy.ndarray
+    :param counts: vertex count of each face
+    :type counts: numpy.ndarray
+    :param connects: face-vertex point indices
+    :type connects: numpy.ndarray
+    :param uv_sets: uvs, uv counts and uv ids keyed by uv set name
+    :type uv_sets: dict
+    :param face_mask: None for every face, a boolean mask or face ids
+    :type face_mask: numpy.ndarray or NoneType
+    :param dtype: storage of the per face areas of the measurements
+    :type dtype: numpy.dtype
+
+    :return: result of :func:`measure_world`, and the measurement and
+             shell table of every uv set
+    :rtype: tuple
+    """
+    world = measure_world(points, counts, connects, face_mask=face_mask)
+
+    measured = {}
+    for uv_set, (uvs, uv_counts, uv_ids) in uv_sets.items():
+        measurement = measure_uvs(world, uvs, uv_counts, uv_ids, dtype)
+        measured[uv_set] = (measurement, measure_shells(uvs, measurement))
+
+    return world, measured
+
+
+def place_shape(world, measured, points, matrix):
+    """
+    Measures an instance of a shape measured by :func:`measure_shape`.
+
+    :param world: object space result of :func:`measure_world`
+    :type world: tuple
+    :param measured: measurement and shell table of every uv set
+    :type measured: dict
+    :param points: (n, 3) object space point positions
+    :type points: numpy.ndarray
+    :param matrix: matrix of the instance, None to stay in object space
+    :type matrix: numpy.ndarray or NoneType
+
+    :return: measurement and shell table of every uv set of the instance
+    :rtype: dict
+    """
+    world_areas = place_world(world, points, matrix)[3]
+
+    placed = {}
+    for uv_set, (measurement, shells) in measured.items():
+        measurement = place_measurement(measurement, world_areas)
+        placed[uv_set] = (measurement, place_shells(shells, measurement))
+
+    return placed
@@ -0,0 +1,426 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Streaming OBJ reader, measures uv ratios without Maya.
+
+The file is read in chunks of whole lines, from a memory map if asked.
+Points and uvs are kept, faces are parsed a chunk at a time into the flat
+arrays :mod:`UVRatio.core` works on, measured, summed per object and
+group, and dropped, so memory only grows with the point and uv count.
+
+From a shell::
+
+    python -m UVRatio.obj asset.obj
+"""
+from __future__ import division
+
+import mmap
+import sys
+from collections import OrderedDict
+
+import numpy
+
+from UVRatio import core
+
+DEFAULT_CHUNK_SIZE = 16 * 1024 * 1024
+
+#: Name of the object or group of faces before any ``o`` or ``g`` record.
+DEFAULT_NAME = "default"
+
+
+class Group(object):
+    """
+    Areas summed over the faces of an object or group.
+
+    :param name: object and group name
+    :type name: tuple
+    """
+
+    def __init__(self, name):
+
+        self.name = name
+        self.faces = 0
+        self.world_area = 0.0
+        self.uv_area = 0.0
+
+    def __repr__(self):
+        return "Group({0!r}, faces={1})".format(self.name, self.faces)
+
+    @property
+    def ratio(self):
+        """
+        :raises: ``RuntimeError`` if the world area is zero
+
+        :return: same ratio ``models.Mesh`` gives for these faces
+        :rtype: float
+        """
+        return core.get_ratio(self.uv_area, self.world_area)
+
+
+class Scene(object):
+    """
+    Areas of an OBJ file, per object and group, and in total.
+
+    ``groups`` is keyed by ``(object, group)`` names in file order.
+    """
+
+    def __init__(self, path):
+
+        self.path = path
+        self.groups = OrderedDict()
+        self.total = Group((None, None))
+        self.point_count = 0
+        self.uv_count = 0
+
+    @property
+    def ratio(self):
+        return self.total.ratio
+
+
+class Chunk(object):
+    """
+    Faces of one chunk as flat arrays.
+
+    Point and uv indices are zero based into the arrays of the whole file
+    read so far, faces with a corner without uv have a uv count of zero.
+    """
+
+    def __init__(self, counts, connects, uv_counts, uv_ids, groups):
+
+        self.counts = counts
+        self.connects = connects
+        self.uv_counts = uv_counts
+        self.uv_ids = uv_ids
+        self.groups = groups
+
+
+class Reader(object):
+    """
+    Reads an OBJ file a chunk of lines at a time.
+
+    :param path: path of the .obj file
+    :type path: str
+    :param chunk_size: bytes read at once
+    :type chunk_size: int
+    :param use_mmap: reads through a memory map of the file
+    :type use_mmap: bool
+    """
+
+    def __init__(self, path, chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=False):
+
+        self.path = path
+        self.chunk_size = chunk_size
+        self.use_mmap = use_mmap
+
+        self.points = _Growing(3)
+        self.uvs = _Growing(2)
+
+        # (object, group) names, and their index in order of appearance
+        self.names = OrderedDict()
+        self._object = DEFAULT_NAME
+        self._group = self._get_group(DEFAULT_NAME, DEFAULT_NAME)
+
+    def __iter__(self):
+        """
+        Parses the file.
+
+        :raises: ``RuntimeError`` if a face can't be parsed
+
+        :return: faces of each chunk
+        :rtype: generator of :class:`Chunk`
+        """
+        for block in self._read_blocks():
+            chunk = self._parse(block.splitlines())
+            if chunk is not None:
+                yield chunk
+
+    def _read_blocks(self):
+        """Blocks of whole lines of the file"""
+        with open(self.path, "rb") as f:
+
+            if self.use_mmap:
+                try:
+                    data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # empty files can't be mapped
+                    return
+
+                try:
+                    start = 0
+                    while start < len(data):
+                        end = data.rfind(
+                            b"\n", start, start + self.chunk_size) + 1
+                        if end <= start:
+                            end = data.find(b"\n", start + self.chunk_size)
+                            end = len(data) if end == -1 else end + 1
+                        yield data[start:end]
+                        start = end
+                finally:
+                    data.close()
+                return
+
+            rest = b""
+            while True:
+                block = f.read(self.chunk_size)
+                if not block:
+                    break
+
+                end = block.rfind(b"\n") + 1
+                if not end:
+                    rest += block
+                    continue
+
+                yield rest + block[:end]
+                rest = block[end:]
+
+            if rest:
+                yield rest
+
+    def _get_group(self, obj, group):
+        return self.names.setdefault((obj, group), len(self.names))
+
+    def _parse(self, lines):
+        """Reads the points and uvs of a block and returns its faces"""
+        point_lines = []
+        uv_lines = []
+        face_lines = []
+        # per face, the points and uvs read before it and its group
+        point_bases = []
+        uv_bases = []
+        groups = []
+
+        points = self.points.size
+        uvs = self.uvs.size
+
+        for line in lines:
+            tag = line[:2]
+
+            if tag == b"v ":
+                point_lines.append(line)
+
+            elif tag == b"vt":
+                uv_lines.append(line)
+
+            elif tag == b"f ":
+                face_lines.append(line)
+                point_bases.append(points + len(point_lines))
+                uv_bases.append(uvs + len(uv_lines))
+                groups.append(self._group)
+
+            elif tag == b"o ":
+                self._object = _get_name(line)
+                self._group = self._get_group(self._object, DEFAULT_NAME)
+
+            elif tag == b"g ":
+                self._group = self._get_group(self._object, _get_name(line))
+
+        if point_lines:
+            self.points.extend(_parse_floats(point_lines, 3))
+
+        if uv_lines:
+            self.uvs.extend(_parse_floats(uv_lines, 2))
+
+        if not face_lines:
+            return None
+
+        counts = numpy.array(
+            [len(line.split()) - 1 for line in face_lines], dtype=numpy.int64)
+
+        try:
+            point_ids, uv_ids = _parse_corners(face_lines, int(counts.sum()))
+        except ValueError:
+            raise RuntimeError("Unable to parse faces of {0}!".format(
+                self.path))
+
+        del face_lines
+
+        # faces with a corner without uv are unmapped, as in Maya, obj
+        # indices start at one so zero is never a uv
+        face = numpy.repeat(numpy.arange(len(counts)), counts)
+        mapped = numpy.bincount(
+            face, weights=uv_ids == 0, minlength=len(counts)) == 0
+
+        connects = _resolve(point_ids, numpy.repeat(point_bases, counts))
+        uv_ids = _resolve(uv_ids, numpy.repeat(uv_bases, counts))
+        uv_ids = uv_ids[mapped[face]]
+
+        # zero, or past the points and uvs read so far
+        if not (_in_range(connects, self.points.size) and
+                _in_range(uv_ids, self.uvs.size)):
+            raise RuntimeError("Unable to parse faces of {0}!".format(
+                self.path))
+
+        return Chunk(counts, connects, numpy.where(mapped, counts, 0),
+                     uv_ids, numpy.array(groups))
+
+
+def measure(path, chunk_size=DEFAULT_CHUNK_SIZE, use_mmap=False):
+    """
+    Measures the uv ratio of every object and group of an OBJ file.
+
+    :param path: path of the .obj file
+    :type path: str
+    :param chunk_size: bytes read at once
+    :type chunk_size: int
+    :param use_mmap: reads through a memory map of the file
+    :type use_mmap: bool
+
+    :raises: ``RuntimeError`` if a face can't be parsed
+
+    :return: areas per object and group, and in total
+    :rtype: :class:`Scene`
+    """
+    reader = Reader(path, chunk_size=chunk_size, use_mmap=use_mmap)
+
+    faces = numpy.zeros(0, dtype=numpy.int64)
+    world_areas = numpy.zeros(0)
+    uv_areas = numpy.zeros(0)
+
+    for chunk in reader:
+
+        size = len(reader.names)
+        faces = _pad(faces, size)
+        world_areas = _pad(world_areas, size)
+        uv_areas = _pad(uv_areas, size)
+
+        faces += numpy.bincount(chunk.groups, minlength=size)
+        world_areas += numpy.bincount(
+            chunk.groups, minlength=size, weights=core.get_world_areas(
+                reader.points.array, chunk.counts, chunk.connects))
+        uv_areas += numpy.bincount(
+            chunk.groups, minlength=size, weights=core.get_uv_areas(
+                reader.uvs.array, chunk.uv_counts, chunk.uv_ids))
+
+    scene = Scene(path)
+    scene.point_count = reader.points.size
+    scene.uv_count = reader.uvs.size
+
+    for i, name in enumerate(reader.names):
+
+        if i >= len(faces) or not faces[i]:
+            continue
+
+        group = scene.groups[name] = Group(name)
+        group.faces = int(faces[i])
+        group.world_area = float(world_areas[i])
+        group.uv_area = float(uv_areas[i])
+
+    scene.total.faces = int(faces.sum())
+    scene.total.world_area = float(world_areas.sum())
+    scene.total.uv_area = float(uv_areas.sum())
+
+    return scene
+
+
+class _Growing(object):
+    """Rows appended to an array that doubles in size when full"""
+
+    def __init__(self, width):
+
+        self.data = numpy.zeros((1024, width))
+        self.size = 0
+
+    @property
+    def array(self):
+        return self.data[:self.size]
+
+    def extend(self, rows):
+
+        end = self.size + len(rows)
+
+        if end > len(self.data):
+            data = numpy.zeros((max(end, 2 * len(self.data)),
+                                self.data.shape[1]))
+            data[:self.size] = self.array
+            self.data = data
+
+        self.data[self.size:end] = rows
+        self.size = end
+
+
+def _parse_floats(lines, width):
+    """First ``width`` numbers of each ``v`` or ``vt`` line"""
+    text = b" ".join(line[2:] for line in lines)
+    values = numpy.fromstring(text, sep=" ")
+
+    if len(values) == width * len(lines):
+        return values.reshape(-1, width)
+
+    # some lines have more, or less, numbers than others
+    rows = numpy.zeros((len(lines), width))
+    for i, line in enumerate(lines):
+        row = line.split()[1:width + 1]
+        rows[i, :len(row)] = numpy.array(row, dtype=float)
+    return rows
+
+
+def _parse_corners(lines, count):
+    """Point and uv ids of every corner of the face lines, 0 without uv"""
+    text = b" ".join(line[2:] for line in lines)
+    first = text.split(None, 1)[0]
+    fields = first.count(b"/") + 1
+
+    # a single layout of corners, "p", "p/t", "p//n" or "p/t/n", is read
+    # at once
+    values = numpy.fromstring(
+        text.replace(b"//", b"/0/").replace(b"/", b" "),
+        dtype=numpy.int64, sep=" ")
+
+    if len(values) == count * fields:
+        values = values.reshape(-1, fields)
+        if fields == 1:
+            return values[:, 0], numpy.zeros(count, dtype=numpy.int64)
+        return values[:, 0], values[:, 1]
+
+    tokens = numpy.array(text.split())
+    point_ids, _, rest = numpy.char.partition(tokens, b"/").T
+    uv_ids = numpy.char.partition(rest, b"/")[:, 0]
+    uv_ids = numpy.where(uv_ids == b"", b"0", uv_ids)
+    return point_ids.astype(numpy.int64), uv_ids.astype(numpy.int64)
+
+
+def _get_name(line):
+    name = line[2:].strip().decode("utf-8", "replace")
+    return name or DEFAULT_NAME
+
+
+def _resolve(ids, bases):
+    """Zero based indices from one based or negative, relative, ones"""
+    return numpy.where(ids < 0, bases + ids, ids - 1)
+
+
+def _in_range(ids, size):
+    """Whether zero based indices all fall in an array of a size"""
+    return not len(ids) or (ids.min() >= 0 and ids.max() < size)
+
+
+def _pad(values, size):
+    if len(values) >= size:
+        return values
+    return numpy.concatenate(
+        [values, numpy.zeros(size - len(values), dtype=values.dtype)])
+
+
+def main(argv=None):
+
+    for path in (argv if argv is not None else sys.argv[1:]):
+
+        scene = measure(path)
+
+        for (obj, group), totals in scene.groups.items():
+            sys.stdout.write("{0}\t{1}\t{2}\t{3}\n".format(
+                obj, group, totals.faces, _format_ratio(totals)))
+
+        sys.stdout.write("{0}\t{1}\t{2}\n".format(
+            path, scene.total.faces, _format_ratio(scene.total)))
+
+
+def _format_ratio(totals):
+    try:
+        return repr(totals.ratio)
+    except RuntimeError:
+        return "-"
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+UVRatio command plugin, loaded on demand by :mod:`UVRatio.undo`.
+"""
+from maya.api import OpenMaya
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+def maya_useNewAPI():
+    """Tells Maya this plugin uses the Python API 2.0"""
+    pass
+
+
+class UndoCommand(OpenMaya.MPxCommand):
+    """
+    Puts an edit made through :func:`UVRatio.undo.commit` on the undo queue.
+    """
+    name = "uvRatioUndo"
+
+    def __init__(self):
+
+        super(UndoCommand, self).__init__()
+
+        self.undo = None
+        self.redo = None
+
+    @classmethod
+    def creator(cls):
+        return cls()
+
+    def doIt(self, args):
+        from UVRatio import undo
+
+        # the edit is already done, only keep what reverts it
+        self.undo, self.redo = undo.pop()
+
+    def undoIt(self):
+        self.undo()
+
+    def redoIt(self):
+        self.redo()
+
+    def isUndoable(self):
+        return True
+
+
+class ScaleCommand(OpenMaya.MPxCommand):
+    """
+    Scales uvs of a mesh around a pivot and writes them to the shape,
+    without adding a polyTweakUV node::
+
+        uvRatioScale -scale 1.5 -pivotU 0.5 -pivotV 0.5 pPlaneShape1;
+
+    Every uv of the uv set is scaled, or the ids handed over by
+    :func:`UVRatio.undo.scale_uvs`. Undo and redo only keep the ids of
+    the scaled uvs and their old positions, 12 bytes a uv. With
+    ``-constructionHistory on`` the uvs are scaled by polyEditUV instead,
+    which keeps a polyTweakUV node in the mesh's history.
+    """
+    name = "uvRatioScale"
+
+    def __init__(self):
+
+        super(ScaleCommand, self).__init__()
+
+        self.dag = None
+        self.uv_set = None
+        self.scale = 1.0
+        self.pivot = (0.0, 0.0)
+
+        # int32 ids and float32 (n, 2) positions before the scale
+        self.uv_ids = None
+        self.old_uvs = None
+
+        # runs polyEditUV with construction history
+        self.modifier = None
+
+    @classmethod
+    def creator(cls):
+        return cls()
+
+    @staticmethod
+    def create_syntax():
+
+        syntax = OpenMaya.MSyntax()
+        syntax.addFlag("-s", "-scale", OpenMaya.MSyntax.kDouble)
+        syntax.addFlag("-pu", "-pivotU", OpenMaya.MSyntax.kDouble)
+        syntax.addFlag("-pv", "-pivotV", OpenMaya.MSyntax.kDouble)
+        syntax.addFlag("-uvs", "-uvSetName", OpenMaya.MSyntax.kString)
+        syntax.addFlag("-ch", "-constructionHistory",
+                       OpenMaya.MSyntax.kBoolean)
+        syntax.setObjectType(OpenMaya.MSyntax.kSelectionList, 1, 1)
+        syntax.useSelectionAsDefault(True)
+        return syntax
+
+    def doIt(self, args):
+        from UVRatio import undo
+
+        # taken first, so they aren't left for the next call
+        uv_ids = undo.pop_uv_ids()
+
+        if numpy is None:
+            raise RuntimeError("{0} requires numpy!".format(self.name))
+
+        database = OpenMaya.MArgDatabase(self.syntax(), args)
+
+        def get_double(flag, default):
+            if database.isFlagSet(flag):
+                return database.flagArgumentDouble(flag, 0)
+            return default
+
+        self.scale = get_double("-scale", 1.0)
+        self.pivot = (get_double("-pivotU", 0.0), get_double("-pivotV", 0.0))
+
+        self.dag = database.getObjectList().getDagPath(0)
+        self.dag.extendToShape()
+        fn_mesh = OpenMaya.MFnMesh(self.dag)
+
+        self.uv_set = fn_mesh.currentUVSetName()
+        if database.isFlagSet("-uvSetName"):
+            self.uv_set = database.flagArgumentString("-uvSetName", 0)
+
+        if uv_ids is None:
+            uv_ids = numpy.arange(fn_mesh.numUVs(self.uv_set))
+        self.uv_ids = numpy.asarray(uv_ids, dtype=numpy.int32)
+
+        history = (database.isFlagSet("-constructionHistory") and
+                   database.flagArgumentBool("-constructionHistory", 0))
+
+        if history and self.uv_ids.size:
+            self.modifier = OpenMaya.MDGModifier()
+            self.modifier.pythonCommandToExecute(self.get_poly_edit_uv())
+            self.modifier.doIt()
+            return
+
+        uvs = self.read_uvs()
+        self.old_uvs = uvs[self.uv_ids]
+        self.write_scaled(uvs)
+
+    def redoIt(self):
+        if self.modifier is not None:
+            self.modifier.doIt()
+            return
+
+        self.write_scaled(self.read_uvs())
+
+    def undoIt(self):
+        if self.modifier is not None:
+            self.modifier.undoIt()
+            return
+
+        uvs = self.read_uvs()
+        uvs[self.uv_ids] = self.old_uvs
+        self.write_uvs(uvs)
+
+    def isUndoable(self):
+        return True
+
+    def read_uvs(self):
+        """(n, 2) float32 uvs of the shape"""
+        us, vs = OpenMaya.MFnMesh(self.dag).getUVs(self.uv_set)
+        uvs = numpy.empty((len(us), 2), dtype=numpy.float32)
+        uvs[:, 0] = us
+        uvs[:, 1] = vs
+        return uvs
+
+    def write_scaled(self, uvs):
+        """Writes uvs with the scaled ones moved from their old place"""
+        pivot = numpy.array(self.pivot, dtype=numpy.float64)
+        uvs[self.uv_ids] = (self.old_uvs - pivot) * self.scale + pivot
+        self.write_uvs(uvs)
+
+    def write_uvs(self, uvs):
+        OpenMaya.MFnMesh(self.dag).setUVs(
+            OpenMaya.MFloatArray(uvs[:, 0].tolist()),
+            OpenMaya.MFloatArray(uvs[:, 1].tolist()), self.uv_set)
+
+    def get_poly_edit_uv(self):
+        """
+        Python scaling the uvs with polyEditUV, runs of consecutive ids
+        are named as ranges.
+        """
+        ids = numpy.sort(self.uv_ids)
+
+        # a run ends where the next id isn't one more
+        ends = numpy.flatnonzero(numpy.diff(ids) != 1)
+        firsts = ids[numpy.concatenate(([0], ends + 1))]
+        lasts = ids[numpy.concatenate((ends, [ids.size - 1]))]
+
+        shape = self.dag.fullPathName()
+        names = ["{0}.map[{1}:{2}]".format(shape, first, last)
+                 for first, last in zip(firsts.tolist(), lasts.tolist())]
+
+        return ("import maya.cmds\n"
+                "maya.cmds.polyEditUV({0!r}, pivotU={1!r}, pivotV={2!r}, "
+                "scaleU={3!r}, scaleV={3!r}, uvSetName={4!r})".format(
+                    names, self.pivot[0], self.pivot[1], self.scale,
+                    self.uv_set))
+
+
+def initializePlugin(plugin):
+
+    fn_plugin = OpenMaya.MFnPlugin(plugin, "Christopher DeVito", "1.0.0")
+    fn_plugin.registerCommand(UndoCommand.name, UndoCommand.creator)
+    fn_plugin.registerCommand(ScaleCommand.name, ScaleCommand.creator,
+                              ScaleCommand.create_syntax)
+
+
+def uninitializePlugin(plugin):
+
+    fn_plugin = OpenMaya.MFnPlugin(plugin)
+    fn_plugin.deregisterCommand(UndoCommand.name)
+    fn_plugin.deregisterCommand(ScaleCommand.name)
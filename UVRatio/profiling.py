@@ -0,0 +1,324 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Timing spans around the hot paths, and opt-in profile captures.
+
+Spans nest, every top level span is an operation, handed back by the
+job or capture that ran it for the ui to show::
+
+    with profiling.span("get_info") as timer:
+        ...
+        timer.set(faces=faces)
+
+Every thread nests its own spans, and jobs running in steps keep theirs
+with :func:`fork` and :func:`resume`, so measuring on a thread or
+interleaving jobs doesn't mix their spans up. Work a thread waits on
+elsewhere nests under the thread's spans with :func:`current`.
+
+Until :func:`enable` is called, :func:`span` hands back one shared span
+that does nothing, so instrumented code only pays for a function call
+and a check. :func:`capture` runs cProfile, and tracemalloc if asked,
+over a block and writes what they found to a file.
+"""
+from __future__ import division
+
+import cProfile
+import contextlib
+import pstats
+import threading
+import time
+
+try:
+    from StringIO import StringIO
+except ImportError:
+    from io import StringIO
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+_enabled = False
+
+# spans started and not finished yet on each thread, innermost last
+_local = threading.local()
+
+
+class Span(object):
+    """
+    Wall-clock time of a named block, the counts attached to it and the
+    spans run inside it.
+
+    :ivar name: what was timed
+    :ivar seconds: wall-clock seconds, None while running
+    :ivar counts: face, uv... counts attached with :meth:`set`
+    :ivar children: spans run inside this one, in order
+    """
+
+    def __init__(self, name, counts=None):
+
+        self.name = name
+        self.seconds = None
+        self.counts = dict(counts or {})
+        self.children = []
+        self._start = None
+        self._parent = None
+
+    def __enter__(self):
+        stack = _get_stack()
+        # a job may outlive the spans it was queued under
+        while stack and stack[-1].seconds is not None:
+            stack.pop()
+        if stack:
+            self._parent = stack[-1]
+            self._parent.children.append(self)
+        stack.append(self)
+        self._start = time.time()
+        return self
+
+    def __exit__(self, *args):
+
+        self.seconds = time.time() - self._start
+
+        # scheduler jobs keep spans open across yields, so they don't
+        # always finish innermost first
+        stack = _get_stack()
+        for i in range(len(stack) - 1, -1, -1):
+            if stack[i] is self:
+                del stack[i]
+                break
+
+        return False
+
+    def __repr__(self):
+        return "Span({0!r}, {1!r})".format(self.name, self.seconds)
+
+    def set(self, **counts):
+        """Attaches counts, added to the ones already there"""
+        for key, value in counts.items():
+            self.counts[key] = self.counts.get(key, 0) + value
+
+    def walk(self, depth=0):
+        """
+        This span and every one inside it, depth first.
+
+        :return: (depth, span) pairs
+        :rtype: generator
+        """
+        yield depth, self
+        for child in self.children:
+            for item in child.walk(depth + 1):
+                yield item
+
+
+def _get_stack():
+    """Spans started and not finished yet on this thread"""
+    try:
+        return _local.stack
+    except AttributeError:
+        _local.stack = []
+        return _local.stack
+
+
+def fork():
+    """
+    Spans open on this thread, for a job that runs in steps to nest its
+    own spans under, see :func:`resume`.
+
+    :raises: None
+
+    :return: copy of the open spans, innermost last
+    :rtype: list
+    """
+    return list(_get_stack())
+
+
+def current():
+    """
+    Spans open on this thread, for work the thread waits on another one
+    to nest under, see :func:`resume`.
+
+    :raises: None
+
+    :return: the open spans themselves, innermost last
+    :rtype: list
+    """
+    return _get_stack()
+
+
+@contextlib.contextmanager
+def resume(stack):
+    """
+    Runs a step of a job with its own open spans, so interleaved jobs
+    don't nest spans in each other.
+
+    :param stack: spans of the job, from :func:`fork`, kept up to date
+    :type stack: list
+
+    :raises: None
+    """
+    saved = _get_stack()
+    _local.stack = stack
+    try:
+        yield
+    finally:
+        _local.stack = saved
+
+
+class _NullSpan(object):
+    """Span handed out while spans are off, it records nothing"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def set(self, **counts):
+        pass
+
+
+_null = _NullSpan()
+
+
+def span(name, **counts):
+    """
+    Times a block, as a context manager.
+
+    :param name: what is timed
+    :type name: str
+    :param counts: face, uv... counts known up front
+
+    :raises: None
+
+    :return: a :class:`Span`, or one doing nothing while spans are off
+    :rtype: :class:`Span`
+    """
+    if not _enabled:
+        return _null
+    return Span(name, counts)
+
+
+def enable(state=True):
+    """
+    Turns spans on or off.
+
+    :raises: None
+
+    :return: None
+    :rtype: NoneType
+    """
+    global _enabled
+    _enabled = bool(state)
+
+
+def is_enabled():
+    return _enabled
+
+
+def format_span(root):
+    """
+    Breakdown of an operation, a line per span, indented by depth.
+
+    :raises: None
+
+    :return: text of the breakdown
+    :rtype: str
+    """
+    if root is None:
+        return ""
+
+    lines = []
+    for depth, item in root.walk():
+
+        share = ""
+        if root.seconds and depth:
+            share = " {0:5.1f}%".format(100 * item.seconds / root.seconds)
+
+        counts = ", ".join("{0}={1}".format(key, item.counts[key])
+                           for key in sorted(item.counts))
+
+        lines.append("{0}{1} {2:.4f}s{3}{4}".format(
+            "  " * depth, item.name, item.seconds, share,
+            "  ({0})".format(counts) if counts else ""))
+
+    return "\n".join(lines)
+
+
+class capture(object):
+    """
+    Profiles a block with cProfile, and tracemalloc if asked, then writes
+    the statistics to a text file.
+
+    Spans are on during the capture, their breakdown is written too.
+
+    :param path: text file written when the block ends
+    :type path: str
+    :param memory: also trace allocations, slower
+    :type memory: bool
+    :param limit: functions and allocation sites listed
+    :type limit: int
+
+    :ivar root: span of the block, once it started
+
+    :raises: ``RuntimeError`` if memory is asked without tracemalloc
+    """
+
+    def __init__(self, path, memory=False, limit=40):
+
+        if memory and tracemalloc is None:
+            raise RuntimeError("Memory captures need tracemalloc!")
+
+        self.path = path
+        self.memory = memory
+        self.limit = limit
+
+        self._profile = cProfile.Profile()
+        self._was_enabled = _enabled
+        self.root = None
+
+    def __enter__(self):
+
+        enable()
+        if self.memory:
+            tracemalloc.start()
+
+        self.root = Span("capture")
+        self.root.__enter__()
+        self._profile.enable()
+        return self
+
+    def __exit__(self, *args):
+
+        self._profile.disable()
+        self.root.__exit__()
+
+        snapshot = peak = None
+        if self.memory:
+            snapshot = tracemalloc.take_snapshot()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+        enable(self._was_enabled)
+        self.write(snapshot, peak)
+
+        return False
+
+    def write(self, snapshot=None, peak=None):
+        """Writes the spans, profile and allocations of the capture"""
+        stream = StringIO()
+        stats = pstats.Stats(self._profile, stream=stream)
+        stats.sort_stats("cumulative").print_stats(self.limit)
+
+        with open(self.path, "w") as f:
+
+            f.write("# spans\n")
+            f.write("{0}\n\n".format(format_span(self.root)))
+
+            f.write("# profile\n")
+            f.write(stream.getvalue())
+
+            if snapshot is not None:
+                f.write("\n# allocations, peak {0} bytes\n".format(peak))
+                for stat in snapshot.statistics("lineno")[:self.limit]:
+                    f.write("{0}\n".format(stat))
@@ -0,0 +1,406 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Texel density reports of measured meshes, as JSON or CSV.
+
+Objects are written as soon as they are added, only the histogram, the
+running totals and the worst faces are kept until the report is closed,
+so a scene-wide report never holds the whole document in memory.
+
+Face densities are the same square root of uv area over world area as
+``Mesh.ratio``, compared to a reference ratio as doublings, ``log2(face
+ratio / reference)``, so a face at +1 has twice the texel density.
+"""
+from __future__ import division
+
+import csv
+import heapq
+import json
+import math
+import os
+
+import numpy
+
+#: Percentiles of the face ratios given per object and for the report.
+PERCENTILES = (5, 25, 50, 75, 95)
+
+#: Histogram edges in doublings from the reference ratio, faces outside
+#: of them fall in an open bin at either end.
+DEFAULT_EDGES = numpy.linspace(-4.0, 4.0, 33)
+
+#: Faces furthest from the reference listed in the report.
+DEFAULT_WORST = 100
+
+FORMATS = ("json", "csv")
+
+CSV_COLUMNS = ("kind", "object", "uv_set", "face", "faces", "world_area",
+               "uv_area", "ratio", "min", "max") + tuple(
+    "p{0:02d}".format(p) for p in PERCENTILES) + ("low", "high", "count")
+
+
+class Report(object):
+    """
+    Streams a texel density report to a file object.
+
+    :param stream: text file object the report is written to
+    :type stream: file
+    :param fmt: "json" or "csv", see :data:`FORMATS`
+    :type fmt: str
+    :param reference: ratio faces are compared to, the ratio of the first
+                      object added by default
+    :type reference: float
+    :param worst: number of faces furthest from the reference to list
+    :type worst: int
+    :param edges: histogram edges in doublings from the reference
+    :type edges: numpy.ndarray
+
+    :raises: ``RuntimeError`` if the format is unknown
+    """
+
+    def __init__(self, stream, fmt="json", reference=None,
+                 worst=DEFAULT_WORST, edges=DEFAULT_EDGES):
+
+        if fmt not in FORMATS:
+            raise RuntimeError("Unknown report format {0}!".format(fmt))
+
+        self.stream = stream
+        self.fmt = fmt
+        self.reference = reference
+        self.worst = worst
+        self.edges = numpy.asarray(edges, dtype=float)
+
+        self.counts = numpy.zeros(len(self.edges) + 1, dtype=numpy.int64)
+        self.objects = 0
+        self.faces = 0
+        self.degenerate = 0
+        self.world_area = 0.0
+        self.uv_area = 0.0
+        self.min = None
+        self.max = None
+
+        # (deviation, order, row) of the worst faces, smallest first
+        self._worst = []
+        self._order = 0
+        self._closed = False
+
+        if self.fmt == "csv":
+            self._writer = csv.writer(stream, lineterminator="\n")
+            self._writer.writerow(CSV_COLUMNS)
+
+    def add(self, mesh):
+        """
+        Adds every object and uv set of a measured mesh.
+
+        Per face figures need the bulk engine, objects measured with the
+        iterator engine only get their totals.
+
+        :param mesh: measured mesh
+        :type mesh: :class:`UVRatio.ui.models.Mesh`
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        for transform, info, world_area, faces in zip(
+                mesh.transforms, mesh.uv_set_info, mesh.world_areas,
+                mesh.counts):
+            for uv_set, set_info in info.items():
+
+                measurement = set_info.measurement
+
+                if measurement is None:
+                    self.add_totals(transform, uv_set, set_info.uv_area,
+                                    world_area, faces)
+                    continue
+
+                self.add_faces(
+                    transform, uv_set, measurement.faces,
+                    measurement.world_areas, measurement.uv_areas)
+
+    def add_totals(self, name, uv_set, uv_area, world_area, faces):
+        """
+        Adds an object known only by its areas.
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        row = self._get_row(name, uv_set, faces, world_area, uv_area)
+        self._write_object(row)
+
+    def add_faces(self, name, uv_set, faces, world_areas, uv_areas):
+        """
+        Adds an object from the areas of each of its faces.
+
+        :param name: object name
+        :type name: str
+        :param uv_set: uv set the uv areas were measured in
+        :type uv_set: str
+        :param faces: face ids
+        :type faces: numpy.ndarray
+        :param world_areas: world area of each face
+        :type world_areas: numpy.ndarray
+        :param uv_areas: uv area of each face
+        :type uv_areas: numpy.ndarray
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        world_area = float(world_areas.sum())
+        uv_area = float(uv_areas.sum())
+        row = self._get_row(name, uv_set, len(faces), world_area, uv_area)
+
+        valid = world_areas > 0
+        self.degenerate += int(len(faces) - valid.sum())
+
+        if not valid.any():
+            self._write_object(row)
+            return
+
+        faces = numpy.asarray(faces)[valid]
+        ratios = numpy.sqrt(uv_areas[valid] / world_areas[valid])
+
+        if self.reference is None and row["ratio"]:
+            self.reference = row["ratio"]
+
+        row["min"] = float(ratios.min())
+        row["max"] = float(ratios.max())
+        for p, value in zip(PERCENTILES, numpy.percentile(
+                ratios, PERCENTILES)):
+            row["p{0:02d}".format(p)] = float(value)
+
+        self.min = row["min"] if self.min is None else min(
+            self.min, row["min"])
+        self.max = row["max"] if self.max is None else max(
+            self.max, row["max"])
+
+        if self.reference:
+            with numpy.errstate(divide="ignore"):
+                deviations = numpy.log2(ratios / self.reference)
+
+            self.counts += numpy.bincount(
+                numpy.searchsorted(self.edges, deviations, side="right"),
+                minlength=len(self.counts))
+
+            self._keep_worst(name, uv_set, faces, ratios, deviations)
+
+        self._write_object(row)
+
+    def close(self):
+        """
+        Writes the histogram, the worst faces and the summary.
+
+        Doesn't close the stream.
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        if self._closed:
+            return
+        self._closed = True
+
+        summary = self._get_row(None, None, self.faces, self.world_area,
+                                self.uv_area)
+        summary.update({"objects": self.objects,
+                        "degenerate": self.degenerate,
+                        "reference": self.reference,
+                        "min": self.min,
+                        "max": self.max})
+        for p in PERCENTILES:
+            summary["p{0:02d}".format(p)] = self.get_percentile(p)
+
+        worst = [row for _, _, row in sorted(self._worst, reverse=True)]
+
+        if self.fmt == "json":
+            if not self.objects:
+                self.stream.write("{\n  \"objects\": [")
+            self.stream.write("\n  ],\n  \"histogram\": ")
+            self.stream.write(json.dumps(self.get_histogram()))
+            self.stream.write(",\n  \"worst\": ")
+            self.stream.write(json.dumps(worst, sort_keys=True))
+            self.stream.write(",\n  \"summary\": ")
+            self.stream.write(json.dumps(summary, sort_keys=True))
+            self.stream.write("\n}\n")
+            return
+
+        for low, high, count in self.get_histogram():
+            self._write_csv({"kind": "bin", "low": low, "high": high,
+                             "count": count})
+        for row in worst:
+            self._write_csv(dict(row, kind="face"))
+        self._write_csv(dict(summary, kind="summary"))
+
+    def get_histogram(self):
+        """
+        :return: low and high edge, in doublings, and face count of each
+                 bin, the open bins at either end have None edges
+        :rtype: list
+        """
+        edges = [None] + [float(edge) for edge in self.edges] + [None]
+        return [(edges[i], edges[i + 1], int(count))
+                for i, count in enumerate(self.counts)]
+
+    def get_percentile(self, percent):
+        """
+        Percentile of the face ratios of the whole report.
+
+        Interpolated in the histogram, as faces aren't kept.
+
+        :return: ratio, None if no face was added
+        :rtype: float or NoneType
+        """
+        total = self.counts.sum()
+        if not total or not self.reference:
+            return None
+
+        target = percent / 100.0 * total
+        below = numpy.cumsum(self.counts)
+        i = int(numpy.searchsorted(below, target))
+
+        # open bins at either end have no width to interpolate in
+        if i == 0:
+            return self.min
+        if i == len(self.counts) - 1:
+            return self.max
+
+        low, high = self.edges[i - 1], self.edges[i]
+        start = below[i] - self.counts[i]
+        doublings = low + (high - low) * (target - start) / self.counts[i]
+        value = self.reference * 2.0 ** doublings
+
+        return float(min(max(value, self.min), self.max))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        return False
+
+    def _get_row(self, name, uv_set, faces, world_area, uv_area):
+
+        ratio = None
+        if world_area:
+            ratio = math.sqrt(uv_area / world_area)
+
+        return {"object": name, "uv_set": uv_set, "faces": faces,
+                "world_area": world_area, "uv_area": uv_area,
+                "ratio": ratio}
+
+    def _write_object(self, row):
+
+        self.objects += 1
+        self.faces += row["faces"]
+        self.world_area += row["world_area"]
+        self.uv_area += row["uv_area"]
+
+        if self.fmt == "csv":
+            self._write_csv(dict(row, kind="object"))
+            return
+
+        if self.objects == 1:
+            self.stream.write("{\n  \"objects\": [\n    ")
+        else:
+            self.stream.write(",\n    ")
+        self.stream.write(json.dumps(row, sort_keys=True))
+
+    def _write_csv(self, row):
+        self._writer.writerow([_format_cell(row.get(column))
+                               for column in CSV_COLUMNS])
+
+    def _keep_worst(self, name, uv_set, faces, ratios, deviations):
+        """Keeps the faces furthest from the reference seen so far"""
+        if not self.worst:
+            return
+
+        distance = numpy.abs(deviations)
+        if len(distance) > self.worst:
+            candidates = numpy.argpartition(
+                -distance, self.worst - 1)[:self.worst]
+        else:
+            candidates = numpy.arange(len(distance))
+
+        for i in candidates:
+            self._order += 1
+            item = (float(distance[i]), self._order, {
+                "object": name, "uv_set": uv_set, "face": int(faces[i]),
+                "ratio": float(ratios[i])})
+
+            if len(self._worst) < self.worst:
+                heapq.heappush(self._worst, item)
+            elif item[0] > self._worst[0][0]:
+                heapq.heapreplace(self._worst, item)
+
+
+def write(meshes, path, fmt=None, reference=None, worst=DEFAULT_WORST):
+    """
+    Writes the report of measured meshes to a file.
+
+    Meshes can be a generator, each one is dropped once written.
+
+    :param meshes: measured meshes
+    :type meshes: iterable of :class:`UVRatio.ui.models.Mesh`
+    :param path: path of the .json or .csv file
+    :type path: str
+    :param fmt: "json" or "csv", from the extension by default
+    :type fmt: str
+    :param reference: ratio faces are compared to
+    :type reference: float
+    :param worst: number of faces furthest from the reference to list
+    :type worst: int
+
+    :raises: ``RuntimeError`` if the format is unknown
+
+    :return: summary of the report
+    :rtype: :class:`Report`
+    """
+    if fmt is None:
+        fmt = os.path.splitext(path)[1][1:].lower() or "json"
+
+    with open(path, "w") as f:
+        with Report(f, fmt=fmt, reference=reference, worst=worst) as report:
+            for mesh in meshes:
+                report.add(mesh)
+
+    return report
+
+
+def scene_meshes(engine=None):
+    """
+    Measures every mesh of the scene, one at a time.
+
+    :param engine: measurement engine, see ``models.ENGINES``
+    :type engine: str
+
+    :raises: None
+
+    :return: measured meshes, meshes that can't be measured are skipped
+    :rtype: generator of :class:`UVRatio.ui.models.Mesh`
+    """
+    from maya import cmds
+    from maya.api import OpenMaya
+    from UVRatio.ui import models
+
+    for shape in cmds.ls(type="mesh", noIntermediate=True, long=True):
+
+        selection = OpenMaya.MSelectionList()
+        selection.add(shape)
+
+        try:
+            yield models.Mesh(engine=engine, selection=selection)
+        except RuntimeError:
+            continue
+
+
+def _format_cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return repr(value)
+    return value
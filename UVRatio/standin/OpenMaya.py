@@ -0,0 +1,1080 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Stand-in for ``maya.api.OpenMaya``.
+"""
+from __future__ import division
+
+import math
+
+import numpy
+
+from UVRatio.standin.scene import scene
+
+
+class MFn(object):
+    kInvalid = 0
+    kTransform = 110
+    kMesh = 296
+    kMeshEdgeComponent = 547
+    kMeshPolygonComponent = 548
+    kMeshVertComponent = 550
+    kMeshVtxFaceComponent = 551
+    kMeshMapComponent = 813
+
+
+class MSpace(object):
+    kInvalid = 0
+    kTransform = 1
+    kPreTransform = 2
+    kPostTransform = 3
+    kWorld = 4
+    kObject = kPreTransform
+
+
+class _Array(object):
+    """
+    Maya array over a numpy array.
+
+    Converts to numpy at once, but like Maya's arrays it is only indexed
+    by one int at a time.
+    """
+    dtype = numpy.float64
+
+    def __init__(self, values=()):
+        self._data = numpy.array(values, dtype=self.dtype)
+
+    @classmethod
+    def _wrap(cls, data):
+        array = cls.__new__(cls)
+        array._data = data
+        return array
+
+    def __len__(self):
+        return len(self._data)
+
+    def __getitem__(self, index):
+        return self._data[int(index)].item()
+
+    def __setitem__(self, index, value):
+        self._data[int(index)] = value
+
+    def __iter__(self):
+        return iter(self._data.tolist())
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self._data.copy()
+        return self._data.astype(dtype)
+
+    def __repr__(self):
+        return "{0}({1})".format(type(self).__name__, self._data.tolist())
+
+    def append(self, value):
+        self._data = numpy.append(self._data, value)
+
+
+class MIntArray(_Array):
+    dtype = numpy.int32
+
+
+class MFloatArray(_Array):
+    dtype = numpy.float32
+
+
+class MDoubleArray(_Array):
+    dtype = numpy.float64
+
+
+class MPoint(object):
+
+    def __init__(self, *values):
+        if len(values) == 1:
+            values = tuple(values[0])
+        values = tuple(float(v) for v in values) + (0.0, 0.0, 0.0, 1.0)[
+            len(values):]
+        self.x, self.y, self.z, self.w = values[:4]
+
+    def __len__(self):
+        return 4
+
+    def __getitem__(self, index):
+        return (self.x, self.y, self.z, self.w)[index]
+
+    def __iter__(self):
+        return iter((self.x, self.y, self.z, self.w))
+
+    def __repr__(self):
+        return "MPoint({0}, {1}, {2}, {3})".format(
+            self.x, self.y, self.z, self.w)
+
+
+class MPointArray(_Array):
+    """Points as (n, 4) rows, indexing returns :class:`MPoint`"""
+
+    def __init__(self, values=()):
+        data = numpy.array([tuple(MPoint(v)) for v in values],
+                           dtype=numpy.float64).reshape(-1, 4)
+        self._data = data
+
+    def __getitem__(self, index):
+        return MPoint(self._data[int(index)])
+
+    def __iter__(self):
+        return (MPoint(row) for row in self._data)
+
+
+class MMatrix(object):
+    """4x4 row vector matrix, iterates over its 16 values"""
+
+    def __init__(self, values=None):
+        if values is None:
+            self._data = numpy.identity(4)
+        else:
+            self._data = numpy.array(
+                list(values), dtype=numpy.float64).reshape(4, 4)
+
+    def __iter__(self):
+        return iter(self._data.ravel().tolist())
+
+    def __len__(self):
+        return 16
+
+    def __mul__(self, other):
+        return MMatrix(numpy.dot(self._data, other._data).ravel())
+
+    def __eq__(self, other):
+        return numpy.array_equal(self._data, other._data)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def getElement(self, row, column):
+        return float(self._data[row, column])
+
+
+class MObject(object):
+    """
+    A node, or a component of a mesh when ``kind`` is a component type.
+    """
+    kNullObj = None
+
+    def __init__(self, other=None):
+        self._node = None
+        self._kind = MFn.kInvalid
+        self._elements = None
+
+        if other is not None:
+            self._node = other._node
+            self._kind = other._kind
+            self._elements = other._elements
+
+    @classmethod
+    def _from_node(cls, node):
+        obj = cls()
+        obj._node = node
+        obj._kind = MFn.kMesh if node.type == "mesh" else MFn.kTransform
+        return obj
+
+    @classmethod
+    def _component(cls, kind, elements):
+        obj = cls()
+        obj._kind = kind
+        obj._elements = elements
+        return obj
+
+    def isNull(self):
+        return self._kind == MFn.kInvalid
+
+    def hasFn(self, fn):
+        return self._kind == fn
+
+    def apiType(self):
+        return self._kind
+
+    def __eq__(self, other):
+        return (isinstance(other, MObject) and self._node is other._node and
+                self._kind == other._kind and
+                self._elements == other._elements)
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash((id(self._node), self._kind))
+
+
+MObject.kNullObj = MObject()
+
+
+class MDagPath(object):
+    """Nodes from the world down to a transform or a shape"""
+
+    def __init__(self, other=None):
+        self._path = list(other._path) if other is not None else []
+
+    @classmethod
+    def _from_path(cls, path):
+        dag = cls()
+        dag._path = list(path)
+        return dag
+
+    @property
+    def _node(self):
+        if not self._path:
+            raise RuntimeError("(kInvalidParameter): Object is invalid")
+        return self._path[-1]
+
+    @staticmethod
+    def getAllPathsTo(obj):
+        return [MDagPath._from_path(path) for path in _get_paths(obj._node)]
+
+    @staticmethod
+    def getAPathTo(obj):
+        return MDagPath.getAllPathsTo(obj)[0]
+
+    def isValid(self):
+        return bool(self._path)
+
+    def isInstanced(self, indirect=True):
+        return any(len(node.parents) > 1 for node in self._path)
+
+    def instanceNumber(self):
+        paths = _get_paths(self._node)
+        for i, path in enumerate(paths):
+            if all(a is b for a, b in zip(path, self._path)):
+                return i
+        return 0
+
+    def length(self):
+        return len(self._path)
+
+    def node(self):
+        return MObject._from_node(self._node)
+
+    def transform(self):
+        for node in reversed(self._path):
+            if node.type == "transform":
+                return MObject._from_node(node)
+        raise RuntimeError("(kInvalidParameter): Object is invalid")
+
+    def apiType(self):
+        return self.node().apiType()
+
+    def hasFn(self, fn):
+        node = self._node
+        if node.type == "transform" and fn == MFn.kMesh:
+            # Maya answers for the shape below a transform
+            return any(child.type == "mesh" for child in node.children)
+        return self.node().hasFn(fn)
+
+    def extendToShape(self):
+        node = self._node
+        if node.type == "transform":
+            shapes = [child for child in node.children if child.type == "mesh"]
+            if len(shapes) != 1:
+                raise RuntimeError("(kInvalidParameter): No unique shape")
+            self._path.append(shapes[0])
+        return self
+
+    def fullPathName(self):
+        return "|" + "|".join(node.name for node in self._path)
+
+    def partialPathName(self):
+        node = self._node
+        if len(node.parents) > 1 and len(self._path) > 1:
+            return "{0}|{1}".format(self._path[-2].name, node.name)
+        return node.name
+
+    def inclusiveMatrix(self):
+        matrix = numpy.identity(4)
+        for node in self._path:
+            matrix = numpy.dot(node.matrix, matrix)
+        return MMatrix(matrix.ravel())
+
+    def __eq__(self, other):
+        return (isinstance(other, MDagPath) and
+                len(self._path) == len(other._path) and
+                all(a is b for a, b in zip(self._path, other._path)))
+
+    def __ne__(self, other):
+        return not self == other
+
+
+class MSelectionList(object):
+
+    def __init__(self, other=None):
+        self._items = []
+        # elements of each merged component, by path and component type
+        self._merged = {}
+
+        if other is not None:
+            for item in other._items:
+                self.add(item)
+
+    def add(self, item, mergeWithExisting=True):
+        """
+        Adds a name, a dag path, or a (dag path, component) pair.
+
+        :raises: ``RuntimeError`` if the name matches nothing
+        """
+        if isinstance(item, tuple):
+            dag, component = MDagPath(item[0]), MObject(item[1])
+        elif isinstance(item, MDagPath):
+            dag, component = MDagPath(item), MObject()
+        else:
+            dag, component = _parse_name(item)
+
+        if not component.isNull():
+            component._elements = list(component._elements)
+
+            # components of one path are merged into one item, as in Maya
+            key = (tuple(id(node) for node in dag._path), component.apiType())
+            if mergeWithExisting and key in self._merged:
+                elements, known = self._merged[key]
+                for element in component._elements:
+                    if element not in known:
+                        known.add(element)
+                        elements.append(element)
+                return self
+
+            self._merged[key] = (component._elements,
+                                 set(component._elements))
+
+        self._items.append((dag, component))
+        return self
+
+    def length(self):
+        return len(self._items)
+
+    def isEmpty(self):
+        return not self._items
+
+    def clear(self):
+        self._items = []
+        self._merged = {}
+        return self
+
+    def getDagPath(self, index):
+        return MDagPath(self._items[index][0])
+
+    def getDependNode(self, index):
+        return self._items[index][0].node()
+
+    def getComponent(self, index):
+        dag, component = self._items[index]
+        return MDagPath(dag), MObject(component)
+
+    def getSelectionStrings(self, index=None):
+        items = self._items if index is None else [self._items[index]]
+        names = []
+        for dag, component in items:
+            names.extend(_format_names(dag, component))
+        return names
+
+
+class MGlobal(object):
+
+    @staticmethod
+    def getActiveSelectionList(orderedSelectionIfAvailable=False):
+        selection = MSelectionList()
+        for dag, component in scene.selection:
+            selection.add((dag, component))
+        return selection
+
+    @staticmethod
+    def setActiveSelectionList(selection, listAdjustment=0):
+        scene.selection = [selection.getComponent(i)
+                           for i in range(selection.length())]
+        scene.notify("SelectionChanged")
+
+
+class MFnDependencyNode(object):
+
+    def __init__(self, obj=None):
+        self._object = obj
+
+    def name(self):
+        return self._object._node.name
+
+    def typeName(self):
+        return self._object._node.type
+
+
+class MFnDagNode(MFnDependencyNode):
+
+    def __init__(self, obj=None):
+        if isinstance(obj, MDagPath):
+            self._path = MDagPath(obj)
+            obj = obj.node()
+        else:
+            self._path = None
+        super(MFnDagNode, self).__init__(obj)
+
+    def _get_path(self):
+        if self._path is not None:
+            return self._path
+        # the first path of the node
+        return MDagPath._from_path(scene.get_path(self.name()))
+
+    def dagPath(self):
+        return MDagPath(self._get_path())
+
+    def fullPathName(self):
+        return self._get_path().fullPathName()
+
+    def partialPathName(self):
+        return self._get_path().partialPathName()
+
+
+class MFnMesh(MFnDagNode):
+    """Bulk access to a mesh, points are in object space"""
+
+    def __init__(self, obj=None):
+        if isinstance(obj, MDagPath):
+            obj = MDagPath(obj).extendToShape()
+        super(MFnMesh, self).__init__(obj)
+
+        if obj is not None and self._object._node.type != "mesh":
+            raise RuntimeError("(kInvalidParameter): Object is incompatible "
+                               "with this method")
+
+    @property
+    def _data(self):
+        return self._object._node.data
+
+    def _changed(self):
+        scene.changed(self._object._node)
+
+    def create(self, vertices, polygonCounts, polygonConnects, uValues=None,
+               vValues=None, parent=None):
+        """
+        Makes a mesh, under a new transform unless a parent is given.
+
+        :return: the transform, or the shape when a parent is given
+        :rtype: :class:`MObject`
+        """
+        from UVRatio.standin.scene import MeshData
+
+        points = numpy.array([tuple(MPoint(p))[:3] for p in vertices])
+        data = MeshData(points, list(polygonCounts), list(polygonConnects))
+        data.add_uv_set("map1", numpy.column_stack(
+            (list(uValues or []), list(vValues or []))),
+            numpy.zeros(len(data.counts)), [])
+
+        if parent is None or parent.isNull():
+            transform = scene.add_node("polySurface1", "transform")
+            result = transform
+        else:
+            transform = parent._node
+            result = None
+
+        shape = scene.add_node(transform.name + "Shape", "mesh",
+                               transform, data)
+        self._object = MObject._from_node(shape)
+        self._path = MDagPath._from_path(scene.get_path(shape.name))
+
+        return MObject._from_node(result or shape)
+
+    @property
+    def numVertices(self):
+        return len(self._data.points)
+
+    @property
+    def numPolygons(self):
+        return len(self._data.counts)
+
+    @property
+    def numEdges(self):
+        return len(self._data.edges)
+
+    @property
+    def numFaceVertices(self):
+        return len(self._data.connects)
+
+    def polygonVertexCount(self, polygonId):
+        return int(self._data.counts[polygonId])
+
+    def getPolygonVertices(self, polygonId):
+        start = self._data.offsets[polygonId]
+        return MIntArray._wrap(self._data.connects[
+            start:start + self._data.counts[polygonId]].copy())
+
+    def getEdgeVertices(self, edgeId):
+        a, b = self._data.edges[edgeId]
+        return int(a), int(b)
+
+    def getPolygonUVid(self, polygonId, vertex, uvSet=None):
+        _, uv_counts, uv_ids = self._data.get_uv_set(uvSet)
+        if not uv_counts[polygonId] or vertex >= uv_counts[polygonId]:
+            raise RuntimeError("(kFailure): Face has no uvs")
+        start = int(uv_counts[:polygonId].sum())
+        return int(uv_ids[start + vertex])
+
+    def createUVSet(self, uvSetName):
+        name = uvSetName
+        i = 1
+        while name in self._data.uv_sets:
+            name = "{0}{1}".format(uvSetName, i)
+            i += 1
+        self._data.add_uv_set(name, numpy.zeros((0, 2)),
+                              numpy.zeros(len(self._data.counts)), [])
+        return name
+
+    def setCurrentUVSetName(self, uvSet):
+        self._data.get_uv_set(uvSet)
+        self._data.current_uv_set = uvSet
+
+    def assignUVs(self, uvCounts, uvIds, uvSet=None):
+        uv_set = self._data.get_uv_set(uvSet)
+        uv_set[1] = numpy.array(uvCounts, dtype=numpy.int32)
+        uv_set[2] = numpy.array(uvIds, dtype=numpy.int32)
+        self._changed()
+
+    def numUVs(self, uvSet=None):
+        return len(self._data.get_uv_set(uvSet)[0])
+
+    def currentUVSetName(self, instance=-1):
+        return self._data.current_uv_set
+
+    def getUVSetNames(self):
+        return list(self._data.uv_sets)
+
+    def getPoints(self, space=MSpace.kObject):
+        points = _in_space(self._data.points, self._get_path(), space)
+        data = numpy.ones((len(points), 4))
+        data[:, :3] = points
+        return MPointArray._wrap(data)
+
+    def getPoint(self, index, space=MSpace.kObject):
+        point = _in_space(
+            self._data.points[[int(index)]], self._get_path(), space)[0]
+        return MPoint(point)
+
+    def setPoints(self, points, space=MSpace.kObject):
+        points = numpy.array(points, dtype=numpy.float64)[:, :3]
+        if len(points) != len(self._data.points):
+            raise RuntimeError("(kInvalidParameter): Wrong point count")
+        self._data.points = points
+        self._changed()
+
+    def setPoint(self, index, point, space=MSpace.kObject):
+        self._data.points[int(index)] = tuple(MPoint(point))[:3]
+        self._changed()
+
+    def getVertices(self):
+        return (MIntArray._wrap(self._data.counts.copy()),
+                MIntArray._wrap(self._data.connects.copy()))
+
+    def getUVs(self, uvSet=None):
+        uvs = self._data.get_uv_set(uvSet)[0]
+        return (MFloatArray._wrap(uvs[:, 0].copy()),
+                MFloatArray._wrap(uvs[:, 1].copy()))
+
+    def getUV(self, uvId, uvSet=None):
+        u, v = self._data.get_uv_set(uvSet)[0][int(uvId)]
+        return float(u), float(v)
+
+    def getAssignedUVs(self, uvSet=None):
+        _, uv_counts, uv_ids = self._data.get_uv_set(uvSet)
+        return (MIntArray._wrap(uv_counts.copy()),
+                MIntArray._wrap(uv_ids.copy()))
+
+    def setUVs(self, uArray, vArray, uvSet=None):
+        """Not undoable, as in Maya"""
+        uvs = numpy.column_stack((numpy.array(uArray, dtype=numpy.float32),
+                                  numpy.array(vArray, dtype=numpy.float32)))
+        self._data.get_uv_set(uvSet)[0] = uvs
+        self._changed()
+
+    def setUV(self, uvId, u, v, uvSet=None):
+        self._data.get_uv_set(uvSet)[0][int(uvId)] = (u, v)
+        self._changed()
+
+
+class MItMeshPolygon(object):
+    """Walks the faces of a mesh, or of a face component, one at a time"""
+
+    def __init__(self, dag, component=None):
+        self._path = MDagPath(dag).extendToShape()
+        self._data = self._path._node.data
+        self._offsets = self._data.offsets
+
+        if component is None or component.isNull():
+            self._faces = range(len(self._data.counts))
+        else:
+            self._faces = list(component._elements)
+
+        self._i = 0
+        # start of each face in the uv ids of a uv set
+        self._uv_offsets = {}
+
+    def count(self):
+        return len(self._faces)
+
+    def isDone(self):
+        return self._i >= len(self._faces)
+
+    def next(self, *args):
+        self._i += 1
+
+    def reset(self):
+        self._i = 0
+
+    def index(self):
+        return self._faces[self._i]
+
+    def polygonVertexCount(self):
+        return int(self._data.counts[self.index()])
+
+    def getVertices(self):
+        start = self._offsets[self.index()]
+        return MIntArray._wrap(self._data.connects[
+            start:start + self.polygonVertexCount()].copy())
+
+    def getPoints(self, space=MSpace.kObject):
+        points = self._data.points[numpy.array(self.getVertices())]
+        data = numpy.ones((len(points), 4))
+        data[:, :3] = _in_space(points, self._path, space)
+        return MPointArray._wrap(data)
+
+    def getArea(self, space=MSpace.kObject):
+        """Sum of the fan triangles of the face"""
+        points = [tuple(p)[:3] for p in self.getPoints(space)]
+        area = 0.0
+        for i in range(1, len(points) - 1):
+            area += _triangle_area(points[0], points[i], points[i + 1])
+        return area
+
+    def hasUVs(self, uvSet=None):
+        return bool(self._data.get_uv_set(uvSet)[1][self.index()])
+
+    def _uv_start(self, uvSet):
+        uv_counts = self._data.get_uv_set(uvSet)[1]
+        if not uv_counts[self.index()]:
+            raise RuntimeError("(kFailure): Face has no uvs")
+
+        # uv ids are only stored for mapped faces
+        if uvSet not in self._uv_offsets:
+            self._uv_offsets[uvSet] = numpy.cumsum(uv_counts) - uv_counts
+        return int(self._uv_offsets[uvSet][self.index()])
+
+    def getUVIndex(self, vertex, uvSet=None):
+        uv_ids = self._data.get_uv_set(uvSet)[2]
+        return int(uv_ids[self._uv_start(uvSet) + vertex])
+
+    def getUV(self, vertex, uvSet=None):
+        uvs = self._data.get_uv_set(uvSet)[0]
+        u, v = uvs[self.getUVIndex(vertex, uvSet)]
+        return [float(u), float(v)]
+
+    def getUVs(self, uvSet=None):
+        uvs = [self.getUV(v, uvSet)
+               for v in range(self.polygonVertexCount())]
+        return (MFloatArray([u for u, _ in uvs]),
+                MFloatArray([v for _, v in uvs]))
+
+    def getEdges(self):
+        start = self._offsets[self.index()]
+        return MIntArray._wrap(self._data.face_edges[
+            start:start + self.polygonVertexCount()].astype(numpy.int32))
+
+    def numTriangles(self):
+        return max(0, self.polygonVertexCount() - 2)
+
+    def getUVArea(self, uvSet=None):
+        uvs = [self.getUV(v, uvSet)
+               for v in range(self.polygonVertexCount())]
+        area = 0.0
+        for i in range(len(uvs)):
+            u0, v0 = uvs[i]
+            u1, v1 = uvs[(i + 1) % len(uvs)]
+            area += u0 * v1 - u1 * v0
+        return abs(area) / 2.0
+
+
+class MItMeshEdge(object):
+    """Walks the edges of a mesh, or of an edge component, one at a time"""
+
+    def __init__(self, dag, component=None):
+        self._path = MDagPath(dag).extendToShape()
+        self._data = self._path._node.data
+
+        if component is None or component.isNull():
+            self._edges = range(len(self._data.edges))
+        else:
+            self._edges = list(component._elements)
+
+        self._i = 0
+
+    def count(self):
+        return len(self._edges)
+
+    def isDone(self):
+        return self._i >= len(self._edges)
+
+    def next(self):
+        self._i += 1
+
+    def reset(self):
+        self._i = 0
+
+    def index(self):
+        return self._edges[self._i]
+
+    def vertexId(self, index):
+        return int(self._data.edges[self.index()][index])
+
+
+class MFnSingleIndexedComponent(object):
+
+    def __init__(self, obj=None):
+        self._object = obj
+
+    def create(self, kind):
+        self._object = MObject._component(kind, [])
+        return self._object
+
+    def getElements(self):
+        return MIntArray(self._object._elements)
+
+    def addElements(self, elements):
+        self._object._elements.extend(int(e) for e in elements)
+
+    def addElement(self, element):
+        self._object._elements.append(int(element))
+
+    @property
+    def elementCount(self):
+        return len(self._object._elements)
+
+
+class MFnDoubleIndexedComponent(MFnSingleIndexedComponent):
+    """Components indexed by pairs, vertex faces are (vertex, face)"""
+
+    def getElements(self):
+        return [tuple(element) for element in self._object._elements]
+
+    def addElements(self, elements):
+        self._object._elements.extend(tuple(e) for e in elements)
+
+    def addElement(self, first, second):
+        self._object._elements.append((int(first), int(second)))
+
+
+class MMessage(object):
+    _next_id = [0]
+
+    @staticmethod
+    def removeCallback(callback):
+        scene.callbacks.pop(callback, None)
+        for node in scene.nodes.values():
+            node.callbacks.pop(callback, None)
+
+    @staticmethod
+    def removeCallbacks(callbacks):
+        for callback in callbacks:
+            MMessage.removeCallback(callback)
+
+    @classmethod
+    def _add(cls, obj, kind, function, client_data):
+        cls._next_id[0] += 1
+        callbacks = scene.callbacks if obj is None else obj._node.callbacks
+        callbacks[cls._next_id[0]] = (kind, function, client_data)
+        return cls._next_id[0]
+
+
+class MNodeMessage(MMessage):
+
+    @staticmethod
+    def addAttributeChangedCallback(node, function, clientData=None):
+        return MMessage._add(node, "attributeChanged", function, clientData)
+
+    @staticmethod
+    def addNodeDirtyCallback(node, function, clientData=None):
+        return MMessage._add(node, "nodeDirty", function, clientData)
+
+    @staticmethod
+    def addNodePreRemovalCallback(node, function, clientData=None):
+        return MMessage._add(node, "preRemoval", function, clientData)
+
+
+class MSceneMessage(MMessage):
+    kBeforeNew = "beforeNew"
+    kBeforeOpen = "beforeOpen"
+
+    @staticmethod
+    def addCallback(message, function, clientData=None):
+        return MMessage._add(None, message, function, clientData)
+
+
+class MEventMessage(MMessage):
+
+    @staticmethod
+    def addEventCallback(eventName, function, clientData=None):
+        return MMessage._add(None, eventName, function, clientData)
+
+
+class MArgList(object):
+    """Arguments of a plugin command, as given to ``cmds.<name>``"""
+
+    def __init__(self):
+        self._objects = []
+        self._flags = {}
+
+    @classmethod
+    def _from_call(cls, args, kwargs):
+        arg_list = cls()
+        for arg in args:
+            if isinstance(arg, (list, tuple)):
+                arg_list._objects.extend(arg)
+            else:
+                arg_list._objects.append(arg)
+        arg_list._flags = dict(kwargs)
+        return arg_list
+
+
+class MSyntax(object):
+    kNoArg = 1
+    kBoolean = 2
+    kLong = 3
+    kDouble = 5
+    kString = 7
+
+    kNone = 1
+    kStringObjects = 2
+    kSelectionList = 3
+
+    def __init__(self):
+        # (short, long) names of each flag, without the dash
+        self._flags = []
+        self._use_selection = False
+
+    def addFlag(self, shortName, longName, *argTypes):
+        self._flags.append((shortName.lstrip("-"), longName.lstrip("-")))
+        return self
+
+    def setObjectType(self, objectType, minObjects=0, maxObjects=None):
+        return self
+
+    def useSelectionAsDefault(self, value):
+        self._use_selection = bool(value)
+        return self
+
+    def enableQuery(self, value=True):
+        return self
+
+    def enableEdit(self, value=True):
+        return self
+
+
+class MArgDatabase(object):
+    """
+    Flags and objects of a plugin command call, keyword arguments are
+    matched to flags by their short or long name.
+
+    :raises: ``RuntimeError`` for a flag the syntax doesn't have
+    """
+
+    def __init__(self, syntax, argList):
+        self._syntax = syntax
+        self._objects = argList._objects
+        self._values = {}
+
+        names = {}
+        for short, long_name in syntax._flags:
+            names[short] = names[long_name] = short
+
+        for name, value in argList._flags.items():
+            if name not in names:
+                raise RuntimeError("Invalid flag '{0}'".format(name))
+            self._values[names[name]] = value
+
+    def _get(self, flag):
+        flag = flag.lstrip("-")
+        for short, long_name in self._syntax._flags:
+            if flag in (short, long_name):
+                return self._values.get(short)
+        return None
+
+    def isFlagSet(self, flag):
+        return self._get(flag) is not None
+
+    def flagArgumentBool(self, flag, index):
+        return bool(self._get(flag))
+
+    def flagArgumentDouble(self, flag, index):
+        return float(self._get(flag))
+
+    def flagArgumentInt(self, flag, index):
+        return int(self._get(flag))
+
+    def flagArgumentString(self, flag, index):
+        return str(self._get(flag))
+
+    def getObjectStrings(self):
+        return [str(name) for name in self._objects]
+
+    def getObjectList(self):
+        if not self._objects and self._syntax._use_selection:
+            return MGlobal.getActiveSelectionList()
+
+        selection = MSelectionList()
+        for name in self._objects:
+            selection.add(name)
+        return selection
+
+
+class MDGModifier(object):
+    """
+    Runs queued Python commands, and undoes what they recorded. The
+    stand-in runs no MEL.
+    """
+
+    def __init__(self):
+        self._commands = []
+        self._done = []
+
+    def pythonCommandToExecute(self, command):
+        self._commands.append(command)
+        return self
+
+    def commandToExecute(self, command):
+        raise RuntimeError("The stand-in can't run MEL!")
+
+    def doIt(self):
+        # what the commands record is kept here, not on the queue
+        scene.open_chunk()
+        try:
+            for command in self._commands:
+                exec(command, {})
+        finally:
+            self._done = scene.chunks.pop()
+
+    def undoIt(self):
+        for undo, _ in reversed(self._done):
+            undo()
+
+
+class MPxCommand(object):
+
+    def __init__(self):
+        self._syntax = MSyntax()
+
+    def syntax(self):
+        return self._syntax
+
+    def isUndoable(self):
+        return False
+
+
+class MFnPlugin(object):
+    """Registers commands of a plugin as functions of ``maya.cmds``"""
+
+    def __init__(self, obj=None, vendor="", version="", apiVersion="Any"):
+        self._object = obj
+
+    def registerCommand(self, name, creator, syntaxCreator=None):
+        from UVRatio.standin import cmds
+        cmds._register(name, creator, syntaxCreator)
+
+    def deregisterCommand(self, name):
+        from UVRatio.standin import cmds
+        cmds._deregister(name)
+
+
+def _in_space(points, dag, space):
+    """Points of a mesh moved by its path's matrix in world space"""
+    if space != MSpace.kWorld:
+        return points
+
+    matrix = numpy.array(list(dag.inclusiveMatrix())).reshape(4, 4)
+    return numpy.dot(points, matrix[:3, :3]) + matrix[3, :3]
+
+
+def _triangle_area(a, b, c):
+    ab = [b[i] - a[i] for i in range(3)]
+    ac = [c[i] - a[i] for i in range(3)]
+    cross = (ab[1] * ac[2] - ab[2] * ac[1],
+             ab[2] * ac[0] - ab[0] * ac[2],
+             ab[0] * ac[1] - ab[1] * ac[0])
+    return 0.5 * math.sqrt(sum(x * x for x in cross))
+
+
+_COMPONENTS = {"f": MFn.kMeshPolygonComponent,
+               "e": MFn.kMeshEdgeComponent,
+               "vtx": MFn.kMeshVertComponent,
+               "map": MFn.kMeshMapComponent,
+               "vtxFace": MFn.kMeshVtxFaceComponent}
+
+
+def _get_paths(node):
+    """Every dag path of a node"""
+    if not node.parents:
+        return [[node]]
+
+    return [path + [node]
+            for parent in node.parents for path in _get_paths(parent)]
+
+
+def _parse_range(indices, size):
+    """Indices of ``*``, ``i`` or ``i:j``"""
+    if indices == "*":
+        return list(range(size))
+    if ":" in indices:
+        start, end = indices.split(":")
+        return list(range(int(start), int(end) + 1))
+    return [int(indices)]
+
+
+def _parse_name(name):
+    """
+    Dag path and component of a name like ``pMesh1.f[2:5]``.
+
+    :raises: ``RuntimeError`` if the name matches nothing
+    """
+    node_name, _, component = name.partition(".")
+    dag = MDagPath._from_path(scene.get_path(node_name))
+
+    if not component:
+        return dag, MObject()
+
+    kind, _, indices = component.partition("[")
+    if kind not in _COMPONENTS or not indices.endswith("]"):
+        raise RuntimeError("No object matches name: {0}".format(name))
+
+    if dag._node.type == "transform":
+        dag.extendToShape()
+
+    data = dag._node.data
+    sizes = {"f": len(data.counts),
+             "e": len(data.edges),
+             "vtx": len(data.points),
+             "map": len(data.get_uv_set()[0])}
+
+    if kind == "vtxFace":
+        # vtxFace[vertices][faces], the pairs of those that touch
+        vertices, _, faces = indices[:-1].partition("][")
+        vertices = set(_parse_range(vertices, len(data.points)))
+        faces = _parse_range(faces, len(data.counts))
+        offsets = data.offsets
+        elements = [(int(v), f) for f in faces
+                    for v in data.connects[offsets[f]:offsets[f + 1]]
+                    if v in vertices]
+    else:
+        elements = _parse_range(indices[:-1], sizes[kind])
+
+    return dag, MObject._component(_COMPONENTS[kind], elements)
+
+
+def _format_names(dag, component):
+    if component.isNull():
+        return [dag.partialPathName()]
+
+    kind = dict((v, k) for k, v in _COMPONENTS.items())[component.apiType()]
+    if kind == "vtxFace":
+        return ["{0}.vtxFace[{1}][{2}]".format(dag.partialPathName(), v, f)
+                for v, f in component._elements]
+
+    return ["{0}.{1}[{2}]".format(dag.partialPathName(), kind, e)
+            for e in component._elements]
@@ -0,0 +1,89 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Stand-in for the parts of Maya UVRatio uses, over numpy mesh data.
+
+It lets the real code paths of :mod:`UVRatio.ui.models` run, be profiled
+and benchmarked on machines without Maya::
+
+    from UVRatio import standin
+    standin.install()
+
+    transform = standin.scene.create_mesh(points, counts, connects,
+                                          uvs, uv_counts, uv_ids)
+
+    from maya import cmds
+    from UVRatio.ui import models
+
+    cmds.select(transform)
+    mesh = models.Mesh()
+
+Only the calls UVRatio makes are implemented. Arrays returned by the
+stand-in convert to numpy without copying element by element, so timings
+of bulk reads are a lower bound of Maya's.
+"""
+import sys
+import types
+
+from UVRatio.standin import scene
+
+__all__ = ["install", "uninstall", "scene"]
+
+# modules installed by install(), with what they replaced
+_replaced = {}
+
+
+def install():
+    """
+    Makes ``maya``, ``maya.cmds``, ``maya.api.OpenMaya``,
+    ``maya.standalone`` and ``maya.utils`` import the stand-in.
+
+    :raises: None
+
+    :return: None
+    :rtype: NoneType
+    """
+    if _replaced:
+        return
+
+    from UVRatio.standin import OpenMaya, cmds, standalone, utils
+
+    maya = types.ModuleType("maya")
+    api = types.ModuleType("maya.api")
+    maya.__path__ = []
+    api.__path__ = []
+
+    maya.cmds = cmds
+    maya.api = api
+    maya.standalone = standalone
+    maya.utils = utils
+    api.OpenMaya = OpenMaya
+
+    modules = {"maya": maya,
+               "maya.api": api,
+               "maya.api.OpenMaya": OpenMaya,
+               "maya.cmds": cmds,
+               "maya.standalone": standalone,
+               "maya.utils": utils}
+
+    for name, module in modules.items():
+        _replaced[name] = sys.modules.get(name)
+        sys.modules[name] = module
+
+
+def uninstall():
+    """
+    Puts back the modules :func:`install` replaced.
+
+    :raises: None
+
+    :return: None
+    :rtype: NoneType
+    """
+    for name, module in _replaced.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+
+    _replaced.clear()
@@ -0,0 +1,395 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Stand-in for ``maya.cmds``.
+"""
+import os
+import sys
+
+import numpy
+
+from UVRatio.standin import OpenMaya
+from UVRatio.standin.scene import scene
+
+# name -> plugin module of loaded plugins
+_plugins = {}
+
+
+def file(*args, **kwargs):
+    """
+    Starts new scenes, and opens .obj files, one mesh per object.
+
+    :raises: ``RuntimeError`` for other files, and to save
+    """
+    if kwargs.get("new") or kwargs.get("n"):
+        scene.new()
+        return "untitled"
+
+    if (kwargs.get("open") or kwargs.get("o")) and args:
+        path = args[0]
+        if not path.lower().endswith(".obj"):
+            raise RuntimeError("The stand-in only opens .obj files!")
+
+        scene.notify("beforeOpen")
+        scene.new()
+        _open_obj(path)
+        return path
+
+    raise RuntimeError("The stand-in can't save files!")
+
+
+def ls(*args, **kwargs):
+
+    selection = kwargs.get("selection", kwargs.get("sl", False))
+    node_type = kwargs.get("type", kwargs.get("typ"))
+    long_names = kwargs.get("long", kwargs.get("l", False))
+
+    if selection:
+        items = [dag for dag, _ in scene.selection]
+    else:
+        items = []
+        for node in scene.nodes.values():
+            for path in OpenMaya._get_paths(node):
+                items.append(OpenMaya.MDagPath._from_path(path))
+
+    names = []
+    for dag in items:
+        if node_type and dag._node.type != node_type:
+            continue
+        names.append(dag.fullPathName() if long_names
+                     else dag.partialPathName())
+
+    return names
+
+
+def select(*args, **kwargs):
+    """
+    Replaces, or adds to, the active selection.
+
+    :raises: ``RuntimeError`` if a name matches nothing
+    """
+    if kwargs.get("clear", kwargs.get("cl", False)):
+        scene.selection = []
+        scene.notify("SelectionChanged")
+        return
+
+    names = []
+    for arg in args:
+        names.extend([arg] if isinstance(arg, str) else arg)
+
+    selection = OpenMaya.MSelectionList()
+    if kwargs.get("add", False):
+        selection = OpenMaya.MGlobal.getActiveSelectionList()
+
+    for name in names:
+        selection.add(name)
+
+    OpenMaya.MGlobal.setActiveSelectionList(selection)
+
+
+def objExists(name):
+    try:
+        OpenMaya.MSelectionList().add(name)
+    except (RuntimeError, KeyError, ValueError, IndexError):
+        return False
+    return True
+
+
+def delete(*args, **kwargs):
+    """
+    Deletes nodes, not undoable in the stand-in.
+
+    :raises: ``RuntimeError`` if a name matches nothing
+    """
+    names = []
+    for arg in args:
+        names.extend([arg] if isinstance(arg, str) else arg)
+
+    for name in names:
+        scene.delete_node(scene.get_node(name))
+
+
+def xform(name, **kwargs):
+    """
+    Queries or sets the matrix of a transform, as 16 row vector values.
+
+    Only ``matrix``, ``translation`` and ``scale`` are known, in object
+    space, or ``worldSpace`` for queries.
+    """
+    path = scene.get_path(name)
+    node = path[-1]
+
+    if kwargs.get("query", kwargs.get("q", False)):
+        matrix = node.matrix
+        if kwargs.get("worldSpace", kwargs.get("ws", False)):
+            matrix = numpy.array(list(OpenMaya.MDagPath._from_path(
+                path).inclusiveMatrix())).reshape(4, 4)
+
+        if kwargs.get("translation", kwargs.get("t", False)):
+            return matrix[3, :3].tolist()
+        return matrix.ravel().tolist()
+
+    old = node.matrix.copy()
+    new = old.copy()
+
+    if "matrix" in kwargs or "m" in kwargs:
+        new = numpy.array(kwargs.get("matrix", kwargs.get("m")),
+                          dtype=float).reshape(4, 4)
+    if "scale" in kwargs or "s" in kwargs:
+        scale = kwargs.get("scale", kwargs.get("s"))
+        new[:3, :3] = numpy.diag(scale)
+    if "translation" in kwargs or "t" in kwargs:
+        new[3, :3] = kwargs.get("translation", kwargs.get("t"))
+
+    def apply(matrix):
+        node.matrix = matrix
+        # shapes below move too
+        for child in [node] + node.children:
+            scene.changed(child)
+
+    apply(new)
+    scene.record(lambda: apply(old), lambda: apply(new))
+
+
+def polyEvaluate(name, **kwargs):
+    """Counts of a mesh, one count or a dict of every asked one"""
+    dag = OpenMaya.MDagPath._from_path(scene.get_path(name)).extendToShape()
+    data = dag._node.data
+
+    counts = {"vertex": len(data.points), "face": len(data.counts),
+              "edge": len(data.edges),
+              "uv": len(data.get_uv_set(kwargs.get("uvSetName"))[0])}
+
+    asked = [key for key in counts if kwargs.get(key)]
+    if len(asked) == 1:
+        return counts[asked[0]]
+    return dict((key, counts[key]) for key in asked or counts)
+
+
+def getAttr(attribute, **kwargs):
+    """
+    Only the ``edge`` attribute of a mesh, as (vertex, vertex, hard)
+    tuples of a range of edges.
+
+    :raises: ``RuntimeError`` for any other attribute
+    """
+    name, _, plug = attribute.partition(".")
+    if not plug.startswith("edge") and not plug.startswith("ed"):
+        raise RuntimeError("The stand-in only gets mesh edges!")
+
+    dag = OpenMaya.MDagPath._from_path(scene.get_path(name)).extendToShape()
+    edges = dag._node.data.edges
+
+    indices = plug.partition("[")[2].rstrip("]") or "*"
+    ids = OpenMaya._parse_range(indices, len(edges))
+
+    return [(int(edges[i, 0]), int(edges[i, 1]), 0) for i in ids]
+
+
+def currentUnit(**kwargs):
+    """Linear unit of the scene, the only one the stand-in knows"""
+    if kwargs.get("query", kwargs.get("q", False)):
+        return scene.linear_unit
+
+    linear = kwargs.get("linear", kwargs.get("l"))
+    if linear:
+        scene.linear_unit = linear
+
+
+def nodeType(name, **kwargs):
+    return scene.get_node(name).type
+
+
+def listRelatives(name, **kwargs):
+
+    node = scene.get_node(name)
+
+    if kwargs.get("parent", kwargs.get("p", False)):
+        nodes = node.parents
+    else:
+        nodes = node.children
+        if kwargs.get("shapes", kwargs.get("s", False)):
+            nodes = [n for n in nodes if n.type != "transform"]
+
+    node_type = kwargs.get("type", kwargs.get("typ"))
+    if node_type:
+        nodes = [n for n in nodes if n.type == node_type]
+
+    return [n.name for n in nodes] or None
+
+
+def polyEditUV(components, **kwargs):
+    """
+    Moves or scales uvs given as ``name.map[i]`` strings, undoable.
+
+    :raises: ``RuntimeError`` if a name matches nothing
+    """
+    if isinstance(components, str):
+        components = [components]
+
+    pivot = numpy.array([kwargs.get("pivotU", kwargs.get("pu", 0.0)),
+                         kwargs.get("pivotV", kwargs.get("pv", 0.0))])
+    scale = numpy.array([kwargs.get("scaleU", kwargs.get("su", 1.0)),
+                         kwargs.get("scaleV", kwargs.get("sv", 1.0))])
+    offset = numpy.array([kwargs.get("u", 0.0), kwargs.get("v", 0.0)])
+    uv_set = kwargs.get("uvSetName", kwargs.get("uvs"))
+
+    selection = OpenMaya.MSelectionList()
+    for name in components:
+        selection.add(name)
+
+    edits = []
+    for i in range(selection.length()):
+        dag, component = selection.getComponent(i)
+        if not component.hasFn(OpenMaya.MFn.kMeshMapComponent):
+            continue
+
+        data = dag._node.data
+        ids = numpy.array(component._elements, dtype=numpy.int64)
+        uvs = data.get_uv_set(uv_set)[0]
+
+        old = uvs[ids].copy()
+        new = ((old - pivot) * scale + pivot + offset).astype(numpy.float32)
+        edits.append((dag._node, ids, old, new))
+
+    def apply(which):
+        for node, ids, old, new in edits:
+            node.data.get_uv_set(uv_set)[0][ids] = (old, new)[which]
+            scene.changed(node)
+
+    apply(1)
+    scene.record(lambda: apply(0), lambda: apply(1))
+
+
+def undoInfo(*args, **kwargs):
+
+    if kwargs.get("openChunk", kwargs.get("ock", False)):
+        scene.open_chunk()
+    elif kwargs.get("closeChunk", kwargs.get("cck", False)):
+        scene.close_chunk()
+    elif "state" in kwargs or "st" in kwargs:
+        state = kwargs.get("state", kwargs.get("st"))
+        if kwargs.get("query", kwargs.get("q", False)):
+            return scene.undo_enabled
+        scene.undo_enabled = bool(state)
+
+
+def undo(*args, **kwargs):
+    scene.undo()
+
+
+def redo(*args, **kwargs):
+    scene.redo()
+
+
+def refresh(*args, **kwargs):
+
+    if "suspend" in kwargs:
+        scene.refresh_suspended = bool(kwargs["suspend"])
+
+
+def pluginInfo(name, **kwargs):
+    name = os.path.splitext(os.path.basename(name))[0]
+    return name in _plugins
+
+
+def loadPlugin(path, **kwargs):
+    """Imports a Python API 2.0 plugin and initializes it"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    if name in _plugins:
+        return [name]
+
+    module = _load_source("_standin_plugin_" + name, path)
+    module.initializePlugin(OpenMaya.MObject())
+    _plugins[name] = module
+
+    return [name]
+
+
+def unloadPlugin(name, **kwargs):
+    name = os.path.splitext(os.path.basename(name))[0]
+    _plugins.pop(name).uninitializePlugin(OpenMaya.MObject())
+
+
+def _register(name, creator, syntax_creator=None):
+    """Makes a plugin command callable as ``cmds.<name>``"""
+
+    def command(*args, **kwargs):
+        instance = creator()
+        if syntax_creator is not None:
+            instance._syntax = syntax_creator()
+        result = instance.doIt(OpenMaya.MArgList._from_call(args, kwargs))
+
+        if instance.isUndoable():
+            scene.record(instance.undoIt, instance.redoIt)
+
+        return result
+
+    command.__name__ = name
+    setattr(sys.modules[__name__], name, command)
+
+
+def _deregister(name):
+    delattr(sys.modules[__name__], name)
+
+
+def _open_obj(path):
+    """Makes a mesh of every object of an .obj file"""
+    from UVRatio import obj
+    from UVRatio.standin.scene import create_mesh
+
+    reader = obj.Reader(path)
+    chunks = list(reader)
+    objects = [name for name, _ in reader.names]
+
+    def join(name):
+        return numpy.concatenate(
+            [getattr(chunk, name) for chunk in chunks]) if chunks else []
+
+    counts = join("counts")
+    connects = join("connects")
+    uv_counts = join("uv_counts")
+    uv_ids = join("uv_ids")
+    groups = join("groups")
+
+    face_objects = numpy.array(objects)[groups] if len(groups) else []
+
+    for name in sorted(set(objects), key=objects.index):
+        faces = numpy.flatnonzero(numpy.asarray(face_objects) == name)
+        if not len(faces):
+            continue
+
+        corners = _get_corners(counts, faces)
+        uv_corners = _get_corners(uv_counts, faces)
+
+        # every object keeps only the points and uvs its faces use
+        used, face_connects = numpy.unique(
+            connects[corners], return_inverse=True)
+        used_uvs, face_uv_ids = numpy.unique(
+            uv_ids[uv_corners], return_inverse=True)
+
+        create_mesh(reader.points.array[used], counts[faces],
+                    face_connects.ravel(), reader.uvs.array[used_uvs],
+                    uv_counts[faces], face_uv_ids.ravel(), name=name)
+
+
+def _get_corners(counts, faces):
+    """Face-vertex positions of some faces, face after face"""
+    starts = numpy.cumsum(counts) - counts
+    wanted = counts[faces]
+    first = numpy.cumsum(wanted) - wanted
+    return (numpy.repeat(starts[faces] - first, wanted) +
+            numpy.arange(int(wanted.sum()))).astype(numpy.int64)
+
+
+def _load_source(name, path):
+    try:
+        from importlib import util
+    except ImportError:
+        import imp
+        return imp.load_source(name, path)
+
+    spec = util.spec_from_file_location(name, path)
+    module = util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
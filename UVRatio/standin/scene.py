@@ -0,0 +1,346 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Scene of the stand-in: dag nodes, mesh data, selection and undo queue.
+"""
+from collections import OrderedDict
+
+import numpy
+
+
+class Node(object):
+    """
+    A dag node, a transform or a mesh shape.
+
+    Shapes can have several parents, one per instance.
+    """
+
+    def __init__(self, name, node_type, data=None):
+
+        self.name = name
+        self.type = node_type
+        self.data = data
+        self.parents = []
+        self.children = []
+        self.matrix = numpy.identity(4)
+
+        # callback id -> (kind, function, client data)
+        self.callbacks = OrderedDict()
+
+    def __repr__(self):
+        return "Node({0!r}, {1!r})".format(self.name, self.type)
+
+
+class MeshData(object):
+    """
+    Arrays of a mesh, laid out the way ``MFnMesh`` returns them.
+
+    Uvs are stored as float32, as Maya does.
+    """
+
+    def __init__(self, points, counts, connects):
+
+        self.points = numpy.array(points, dtype=numpy.float64).reshape(-1, 3)
+        self.counts = numpy.array(counts, dtype=numpy.int32)
+        self.connects = numpy.array(connects, dtype=numpy.int32)
+        self.uv_sets = OrderedDict()
+        self.current_uv_set = "map1"
+
+        self._edges = None
+        self._face_edges = None
+
+    def add_uv_set(self, name, uvs, uv_counts, uv_ids):
+
+        self.uv_sets[name] = [
+            numpy.array(uvs, dtype=numpy.float32).reshape(-1, 2),
+            numpy.array(uv_counts, dtype=numpy.int32),
+            numpy.array(uv_ids, dtype=numpy.int32)]
+
+    def get_uv_set(self, name=None):
+        """
+        :raises: ``RuntimeError`` if the mesh has no such uv set
+        """
+        name = name or self.current_uv_set
+        try:
+            return self.uv_sets[name]
+        except KeyError:
+            raise RuntimeError("No uv set {0}!".format(name))
+
+    @property
+    def offsets(self):
+        offsets = numpy.zeros(len(self.counts) + 1, dtype=numpy.int64)
+        numpy.cumsum(self.counts, out=offsets[1:])
+        return offsets
+
+    @property
+    def edges(self):
+        """(n, 2) point ids of every edge, numbered as faces first use them"""
+        if self._edges is None:
+            self._build_edges()
+        return self._edges
+
+    @property
+    def face_edges(self):
+        """Edge id of each face-vertex, from that corner to the next one"""
+        if self._face_edges is None:
+            self._build_edges()
+        return self._face_edges
+
+    def _build_edges(self):
+
+        offsets = self.offsets
+        following = numpy.arange(len(self.connects)) + 1
+        closed = self.counts > 0
+        following[offsets[1:][closed] - 1] = offsets[:-1][closed]
+
+        a = self.connects.astype(numpy.int64)
+        b = a[following]
+        keys = numpy.minimum(a, b) * len(self.points) + numpy.maximum(a, b)
+
+        _, first, inverse = numpy.unique(
+            keys, return_index=True, return_inverse=True)
+        order = numpy.argsort(first, kind="stable")
+        rank = numpy.empty_like(order)
+        rank[order] = numpy.arange(len(order))
+
+        self._edges = numpy.column_stack((a[first[order]], b[first[order]]))
+        self._face_edges = rank[inverse.ravel()]
+
+    def set_topology(self, points, counts, connects):
+        """Replaces the points and faces, uv sets are dropped"""
+        self.__init__(points, counts, connects)
+
+
+class Scene(object):
+    """Every node of the stand-in, the active selection and undo queue"""
+
+    def __init__(self):
+        # callback id -> (message, function, client data), they outlive
+        # scenes
+        self.callbacks = OrderedDict()
+        self.nodes = OrderedDict()
+        self.new()
+
+    def new(self):
+        """Empties the scene"""
+        self.notify("beforeNew")
+        self.nodes = OrderedDict()
+        # (node path, component) pairs, component is None for whole nodes
+        self.selection = []
+        self.undo_queue = []
+        self.redo_queue = []
+        self.chunks = []
+        self.undo_enabled = True
+        self.refresh_suspended = False
+        self.linear_unit = "cm"
+
+    def unique_name(self, name):
+
+        if name not in self.nodes:
+            return name
+
+        base = name.rstrip("0123456789")
+        i = 1
+        while "{0}{1}".format(base, i) in self.nodes:
+            i += 1
+        return "{0}{1}".format(base, i)
+
+    def delete_node(self, node):
+        """Removes a node, and the shapes only it was the parent of"""
+        self.changed(node, "preRemoval")
+
+        for child in list(node.children):
+            child.parents.remove(node)
+            if not child.parents:
+                self.delete_node(child)
+
+        for parent in node.parents:
+            parent.children.remove(node)
+
+        self.nodes.pop(node.name, None)
+        self.selection = [(dag, component)
+                          for dag, component in self.selection
+                          if node not in dag._path]
+
+    def add_node(self, name, node_type, parent=None, data=None):
+
+        node = Node(self.unique_name(name), node_type, data)
+        self.nodes[node.name] = node
+
+        if parent is not None:
+            parent.children.append(node)
+            node.parents.append(parent)
+
+        return node
+
+    def get_node(self, name):
+        """
+        Node from a name or a dag path.
+
+        :raises: ``RuntimeError`` if there is no such node
+        """
+        try:
+            return self.nodes[name.split("|")[-1]]
+        except KeyError:
+            raise RuntimeError("No object matches name: {0}".format(name))
+
+    def get_path(self, name):
+        """
+        Nodes from the world down to a node, for a name or a dag path.
+
+        A name only picks the first path of an instanced node.
+
+        :raises: ``RuntimeError`` if there is no such node or path
+        """
+        names = [n for n in name.split("|") if n]
+        path = [self.get_node(names[-1])]
+
+        while path[0].parents:
+            parent = path[0].parents[0]
+            if len(names) >= len(path) + 1:
+                parent = self.get_node(names[-len(path) - 1])
+                if parent not in path[0].parents:
+                    raise RuntimeError(
+                        "No object matches name: {0}".format(name))
+            path.insert(0, parent)
+
+        return path
+
+    def record(self, undo, redo):
+        """Puts an undoable edit on the undo queue"""
+        if not self.undo_enabled:
+            return
+
+        self.redo_queue = []
+
+        if self.chunks:
+            self.chunks[-1].append((undo, redo))
+        else:
+            self.undo_queue.append([(undo, redo)])
+
+    def open_chunk(self):
+        self.chunks.append([])
+
+    def close_chunk(self):
+        if not self.chunks:
+            return
+
+        chunk = self.chunks.pop()
+        if not chunk:
+            return
+
+        if self.chunks:
+            self.chunks[-1].extend(chunk)
+        else:
+            self.undo_queue.append(chunk)
+
+    def undo(self):
+        if not self.undo_queue:
+            return False
+
+        chunk = self.undo_queue.pop()
+        for undo, _ in reversed(chunk):
+            undo()
+        self.redo_queue.append(chunk)
+        return True
+
+    def redo(self):
+        if not self.redo_queue:
+            return False
+
+        chunk = self.redo_queue.pop()
+        for _, redo in chunk:
+            redo()
+        self.undo_queue.append(chunk)
+        return True
+
+    def notify(self, message):
+        """Runs the scene callbacks of a message"""
+        for callback_message, function, client_data in list(
+                self.callbacks.values()):
+            if callback_message == message:
+                function(client_data)
+
+    def changed(self, node, kind="attributeChanged"):
+        """Runs the callbacks registered on a node"""
+        for callback_kind, function, client_data in list(
+                node.callbacks.values()):
+            if callback_kind == "nodeDirty" and kind != "preRemoval":
+                function(node, client_data)
+            elif callback_kind == kind == "preRemoval":
+                function(node, None, client_data)
+            elif callback_kind == kind:
+                function(2048, None, None, client_data)
+
+
+def create_mesh(points, counts, connects, uvs=None, uv_counts=None,
+                uv_ids=None, name="pMesh1", matrix=None, uv_set="map1"):
+    """
+    Adds a mesh, a transform and its shape, to the scene.
+
+    :param points: (n, 3) point positions
+    :type points: numpy.ndarray
+    :param counts: vertex count of each face
+    :type counts: numpy.ndarray
+    :param connects: face-vertex point indices
+    :type connects: numpy.ndarray
+    :param uvs: (n, 2) uv positions, no uvs if None
+    :type uvs: numpy.ndarray
+    :param uv_counts: uv count of each face, zero for unmapped faces
+    :type uv_counts: numpy.ndarray
+    :param uv_ids: face-vertex uv indices of the mapped faces
+    :type uv_ids: numpy.ndarray
+    :param name: transform name, made unique
+    :type name: str
+    :param matrix: 4x4 row vector matrix of the transform
+    :type matrix: numpy.ndarray
+
+    :raises: None
+
+    :return: transform name
+    :rtype: str
+    """
+    data = MeshData(points, counts, connects)
+
+    if uvs is not None:
+        data.add_uv_set(uv_set, uvs, uv_counts, uv_ids)
+    else:
+        data.add_uv_set(uv_set, numpy.zeros((0, 2)),
+                        numpy.zeros(len(data.counts)), [])
+    data.current_uv_set = uv_set
+
+    transform = scene.add_node(name, "transform")
+    if matrix is not None:
+        transform.matrix = numpy.array(matrix, dtype=float).reshape(4, 4)
+
+    scene.add_node(
+        transform.name.replace("pMesh", "pMeshShape", 1)
+        if transform.name.startswith("pMesh")
+        else transform.name + "Shape", "mesh", transform, data)
+
+    return transform.name
+
+
+def instance(transform, name=None, matrix=None):
+    """
+    Adds a transform instancing the shape of another one.
+
+    :raises: ``RuntimeError`` if there is no such transform
+
+    :return: new transform name
+    :rtype: str
+    """
+    shape = scene.get_node(transform).children[0]
+
+    node = scene.add_node(name or transform, "transform")
+    if matrix is not None:
+        node.matrix = numpy.array(matrix, dtype=float).reshape(4, 4)
+
+    node.children.append(shape)
+    shape.parents.append(node)
+
+    return node.name
+
+
+#: The one scene of the stand-in.
+scene = Scene()
@@ -0,0 +1,14 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Stand-in for ``maya.standalone``.
+"""
+from UVRatio.standin.scene import scene
+
+
+def initialize(name="python"):
+    scene.new()
+
+
+def uninitialize():
+    scene.new()
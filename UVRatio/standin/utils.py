@@ -0,0 +1,30 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Stand-in for ``maya.utils``.
+
+There is no main thread event loop to hand work to, calls run on the
+calling thread, one at a time.
+"""
+import threading
+
+_lock = threading.RLock()
+
+# functions waiting for processIdleEvents
+_deferred = []
+
+
+def executeInMainThreadWithResult(function, *args, **kwargs):
+    with _lock:
+        return function(*args, **kwargs)
+
+
+def executeDeferred(function, *args, **kwargs):
+    _deferred.append((function, args, kwargs))
+
+
+def processIdleEvents():
+    """Runs the deferred functions, as Maya does when idle"""
+    while _deferred:
+        function, args, kwargs = _deferred.pop(0)
+        executeInMainThreadWithResult(function, *args, **kwargs)
@@ -1,4 +1,2 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
-
-from UVRatio.ui import ui
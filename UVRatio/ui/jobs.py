@@ -0,0 +1,148 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Measurement run off the Qt main thread, so Maya keeps drawing the ui.
+
+Maya's API may only be called from the main thread, a :class:`MeasureJob`
+hands every read to ``maya.utils.executeInMainThreadWithResult`` and does
+the numeric work on its own thread. Progress and results come back as
+signals, which Qt delivers on the main thread.
+"""
+import threading
+
+from maya.api import OpenMaya
+
+from UVRatio import profiling
+from UVRatio.ui import models
+from UVRatio.packages.Qt import QtCore
+
+
+# jobs whose thread is running, kept alive if their ui goes away
+_running = set()
+
+
+class Cancelled(RuntimeError):
+    """Raised inside a job's measurement when it was cancelled"""
+
+
+class MeasureJob(QtCore.QThread):
+    """
+    Builds a :class:`models.Mesh` of the active selection on a thread.
+
+    The selection is taken when the job is made, on the main thread.
+
+    :param capture: (path, memory) of a :func:`profiling.capture` of the
+                    measurement, none if None
+    :type capture: tuple
+    :param kwargs: arguments of :class:`models.Mesh`
+
+    :ivar root: span of the measurement while spans are on, or of its
+                capture
+
+    :raises: ``RuntimeError`` if nothing is selected
+    """
+
+    #: steps done and steps in all
+    progressed = QtCore.Signal(int, int)
+    #: the measured :class:`models.Mesh`
+    measured = QtCore.Signal(object)
+    #: error message
+    failed = QtCore.Signal(str)
+    cancelled = QtCore.Signal()
+
+    def __init__(self, parent=None, capture=None, **kwargs):
+
+        super(MeasureJob, self).__init__(parent)
+
+        kwargs.setdefault(
+            "selection", OpenMaya.MGlobal.getActiveSelectionList())
+        if kwargs["selection"].length() == 0:
+            raise RuntimeError("Nothing Selected!")
+
+        self.kwargs = kwargs
+        self.capture = capture
+        self.root = None
+        self._cancel = threading.Event()
+
+        self.finished.connect(self._forget)
+
+    def start(self):
+        _running.add(self)
+        super(MeasureJob, self).start()
+
+    def cancel(self):
+        """
+        Asks the job to stop, at the next shape.
+
+        Doesn't wait for the thread, it may be waiting on the main thread.
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def run(self):
+
+        try:
+            if self.capture is not None:
+                path, memory = self.capture
+                with profiling.capture(path, memory=memory) as capture:
+                    self.root = capture.root
+                    mesh = self.measure()
+            else:
+                with profiling.span("measure_job") as root:
+                    self.root = root
+                    mesh = self.measure()
+
+        except Cancelled:
+            self.cancelled.emit()
+
+        except Exception as e:
+            self.failed.emit(str(e))
+
+        else:
+            self.measured.emit(mesh)
+
+    def measure(self):
+        """Measures the selection, on the job's thread"""
+        # reads on the main thread nest under the job's spans, the job's
+        # thread waits for them
+        spans = profiling.current()
+
+        def main_thread(function, *args):
+            return in_main_thread(_in_spans, spans, function, *args)
+
+        return models.Mesh(main_thread=main_thread,
+                           progress=self._progress, **self.kwargs)
+
+    def _forget(self):
+        _running.discard(self)
+
+    def _progress(self, done, total):
+        if self._cancel.is_set():
+            raise Cancelled("Measurement cancelled!")
+        self.progressed.emit(done, total)
+
+
+def in_main_thread(function, *args):
+    """
+    Runs a function on Maya's main thread and waits for its result.
+
+    :raises: whatever the function raises
+
+    :return: the function's result
+    :rtype: object
+    """
+    import maya.utils
+    return maya.utils.executeInMainThreadWithResult(function, *args)
+
+
+def _in_spans(spans, function, *args):
+    """Runs a function with the open spans of another thread"""
+    with profiling.resume(spans):
+        return function(*args)
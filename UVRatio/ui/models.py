@@ -1,57 +1,332 @@
+import array
+import bisect
+import itertools
 import math
-from maya import cmds
-from maya.api import OpenMaya
+import multiprocessing
+import random
+import time
+from collections import OrderedDict
+from functools import partial
+
+from UVRatio import cache
+from UVRatio import profiling
+from UVRatio import undo
+from UVRatio.utils import LazyModule
+
+try:
+    import numpy
+    from UVRatio import core
+except ImportError:
+    numpy = core = None
+
+try:
+    xrange
+except NameError:
+    xrange = range
+
+# Maya is imported once a mesh is measured, not when this module is
+cmds = LazyModule("maya.cmds")
+OpenMaya = LazyModule("maya.api.OpenMaya")
+
+try:
+    from concurrent import futures
+except ImportError:
+    futures = None
+
+#: Measurement engines, "bulk" reads whole arrays per shape through
+#: MFnMesh and needs numpy, "iterator" walks faces with MItMeshPolygon.
+ENGINES = ("bulk", "iterator")
+DEFAULT_ENGINE = "bulk" if numpy is not None else "iterator"
+
+#: Ways of writing rescaled uvs, "command" runs the uvRatioScale command
+#: of the bundled plugin, whose undo only keeps the scaled uvs, "api"
+#: scales in numpy and writes them with MFnMesh.setUVs, "polyEditUV"
+#: passes every uv by name to polyEditUV and adds polyTweakUV nodes.
+WRITE_METHODS = ("command", "api", "polyEditUV")
+DEFAULT_WRITE_METHOD = "command" if numpy is not None else "polyEditUV"
+
+#: Spaces world areas are measured in, "world" applies the transforms of
+#: each dag path, as rendered, "object" ignores them.
+SPACES = ("world", "object")
+DEFAULT_SPACE = "world"
+
+#: Storage of the per face areas and points the bulk engine keeps,
+#: "single" halves them at the cost of precision. Uvs are kept as
+#: float32 either way, as Maya stores them.
+PRECISIONS = ("double", "single")
+DEFAULT_PRECISION = "double"
+
+#: Threads measuring shapes of the bulk engine while the next ones are
+#: read from Maya, 0 measures them on the calling thread.
+DEFAULT_WORKERS = multiprocessing.cpu_count() if futures is not None else 0
+
+#: Relative ratio difference under which a batch leaves a mesh alone.
+DEFAULT_TOLERANCE = 0.001
+
+#: Centimeters in each linear unit Maya knows, ratios are uv units per
+#: scene unit so densities depend on the scene's unit.
+LINEAR_UNITS = OrderedDict([
+    ("mm", 0.1), ("cm", 1.0), ("m", 100.0), ("km", 100000.0),
+    ("in", 2.54), ("ft", 30.48), ("yd", 91.44), ("mi", 160934.4)])
+
+#: Faces the iterator engine walks between pauses of the generator
+#: version of measuring, and uvs polyEditUV is given per call.
+WALK_CHUNK = 1000
+EDIT_CHUNK = 50000
+
+#: Random faces :meth:`Mesh.iter_estimate` walks, and how many between
+#: refinements of the estimate.
+ESTIMATE_SAMPLES = 4000
+ESTIMATE_CHUNK = 250
+
+
+class UVSetInfo(object):
+    """
+    Measured values of one uv set of a selected mesh.
+
+    :ivar uv_area: uv area of the measured faces
+    :ivar uv_indexes: sorted ids of the uvs they use, 32 bit ints
+    :ivar center: u and v of the center of their uv bounding box
+    :ivar measurement: :class:`core.Measurement`, bulk engine only
+    :ivar shells: :class:`core.ShellTable`, bulk engine only
+    :ivar points: object space points the shape was measured from
+    :ivar uvs: uvs the shape was measured from
+    :ivar matrix: matrix the points were measured with
+    :ivar key: cache key of the measurement
+    """
+
+    __slots__ = ("uv_area", "uv_indexes", "center", "measurement", "shells",
+                 "points", "uvs", "matrix", "key")
+
+    def __init__(self, uv_area, uv_indexes, center, measurement=None,
+                 shells=None, points=None, uvs=None, matrix=None, key=None):
+
+        self.uv_area = uv_area
+        self.uv_indexes = uv_indexes
+        self.center = center
+        self.measurement = measurement
+        self.shells = shells
+        self.points = points
+        self.uvs = uvs
+        self.matrix = matrix
+        self.key = key
 
 
 class Mesh(object):
 
-    def __init__(self):
+    def __init__(self, engine=None, selection=None, use_cache=True,
+                 uv_sets=None, space=None, workers=None, main_thread=None,
+                 progress=None, measure=True, precision=None):
+
+        self.engine = engine or DEFAULT_ENGINE
+        self.workers = DEFAULT_WORKERS if workers is None else workers
+        # runs the Maya reads when measuring off the main thread
+        self.main_thread = main_thread or _call
+        self.progress = progress
+        self.uv_sets = uv_sets
+        self.space = space or DEFAULT_SPACE
+        self.precision = precision or DEFAULT_PRECISION
+        self.cache = cache.measurements if use_cache else None
+
+        if self.engine not in ENGINES:
+            raise RuntimeError("Unknown engine {0}!".format(self.engine))
+
+        if self.engine == "bulk" and numpy is None:
+            raise RuntimeError("The bulk engine requires numpy!")
+
+        if self.space not in SPACES:
+            raise RuntimeError("Unknown space {0}!".format(self.space))
+
+        if self.precision not in PRECISIONS:
+            raise RuntimeError(
+                "Unknown precision {0}!".format(self.precision))
+
+        if selection is None:
+            selection = OpenMaya.MGlobal.getActiveSelectionList()
 
-        active_sel = OpenMaya.MGlobal.getActiveSelectionList()
+        active_sel = self.selection = selection
 
         self.mesh_count = active_sel.length()
 
         if self.mesh_count == 0:
             raise RuntimeError("Nothing Selected!")
 
+        with profiling.span("Mesh", selected=self.mesh_count):
+
+            with profiling.span("parse selection"):
+                self.main_thread(self._parse_selection)
+
+            # otherwise left to iter_measure
+            if measure:
+                for _ in self.iter_measure():
+                    pass
+
+    def iter_measure(self):
+        """
+        Measures the selection as a generator job, pausing between chunks
+        of work, see :mod:`UVRatio.ui.scheduler`. The constructor does it
+        unless made with ``measure=False``.
+        """
+        # get info
+        for _ in self.iter_info():
+            yield
+
+        # get ratio
+        with profiling.span("get_ratio"):
+            self.ratio = self.get_ratio()
+
+    def is_cached(self):
+        """
+        Whether every selected mesh is measured in the cache, so
+        :meth:`iter_measure` reads no arrays from Maya.
+
+        :raises: None
+
+        :return: True if measuring is only a matter of summing
+        :rtype: bool
+        """
+        if self.cache is None or self.engine != "bulk":
+            return False
+
+        for dag, component in self.meshes:
+            shape = OpenMaya.MDagPath(dag)
+            shape.extendToShape()
+            keys = self._get_keys(shape, OpenMaya.MFnMesh(shape),
+                                  _get_face_mask(component),
+                                  self._get_matrix(shape))
+            if not all(key in self.cache for key in keys.values()):
+                return False
+
+        return True
+
+    def iter_estimate(self, samples=ESTIMATE_SAMPLES):
+        """
+        Estimates the ratio from random faces of the selection as a
+        generator job, :attr:`estimate` is refined every
+        :data:`ESTIMATE_CHUNK` faces and :attr:`sampled` counts them.
+
+        Faces are drawn uniformly over every selected mesh, so the ratio
+        of the sampled areas tends to the ratio of the whole selection.
+        Selections of no more faces than ``samples`` yield nothing,
+        measuring them is as quick.
+
+        :param samples: faces walked at most
+        :type samples: int
+        """
+        self.estimate = None
+        self.sampled = 0
+
+        faces = []
+        for dag, component in self.meshes:
+            if component.isNull():
+                faces.append(xrange(OpenMaya.MFnMesh(dag).numPolygons))
+            else:
+                faces.append(list(OpenMaya.MFnSingleIndexedComponent(
+                    component).getElements()))
+
+        # index of the first face of each mesh among all of them
+        starts = [0]
+        for ids in faces:
+            starts.append(starts[-1] + len(ids))
+        total = starts.pop()
+
+        if total <= samples:
+            return
+
+        space = (OpenMaya.MSpace.kWorld if self.space == "world"
+                 else OpenMaya.MSpace.kObject)
+        picked = random.sample(xrange(total), samples)
+        world_area = uv_area = 0.0
+
+        with profiling.span("estimate", faces=total, samples=samples):
+
+            for start in xrange(0, samples, ESTIMATE_CHUNK):
+
+                chunk = OrderedDict()
+                for index in picked[start:start + ESTIMATE_CHUNK]:
+                    i = bisect.bisect_right(starts, index) - 1
+                    chunk.setdefault(i, []).append(
+                        faces[i][index - starts[i]])
+
+                for i, ids in chunk.items():
+                    areas = self.main_thread(
+                        self._sample_faces, self.meshes[i][0], ids, space)
+                    world_area += areas[0]
+                    uv_area += areas[1]
+                    self.sampled += len(ids)
+
+                if world_area:
+                    self.estimate = math.sqrt(uv_area / world_area)
+                yield
+
+    def _sample_faces(self, dag, ids, space):
+        """
+        World and uv area of some faces of a mesh, in the uv set its
+        ratio is about.
+
+        :return: world and uv area
+        :rtype: tuple
+        """
+        fn_mesh = OpenMaya.MFnMesh(dag)
+        uv_set = self._get_uv_sets(fn_mesh)[0]
+
+        face_component = OpenMaya.MFnSingleIndexedComponent()
+        component = face_component.create(
+            OpenMaya.MFn.kMeshPolygonComponent)
+        face_component.addElements(ids)
+
+        world_area = uv_area = 0.0
+        mesh_iter = OpenMaya.MItMeshPolygon(dag, component)
+
+        while not mesh_iter.isDone():
+            world_area += mesh_iter.getArea(space)
+            if mesh_iter.hasUVs(uv_set):
+                uv_area += mesh_iter.getUVArea(uv_set)
+            mesh_iter.next(1)
+
+        return world_area, uv_area
+
+    def _parse_selection(self):
+        """
+        Finds the mesh, components, transform and shape of each item.
+
+        Items of the same shape are merged, edge, vertex, uv and vertex
+        face components are converted to the faces they touch.
+        """
         self.meshes = []
         self.transforms = []
         self.shapes = []
 
-        for x in xrange(self.mesh_count):
+        # shape path: [dag, components], no components for whole meshes
+        items = OrderedDict()
 
-            dag, component = active_sel.getComponent(x)
+        for x in xrange(self.selection.length()):
+
+            dag, component = self.selection.getComponent(x)
 
             if not dag.hasFn(OpenMaya.MFn.kMesh):
                 raise RuntimeError("Selected is not a mesh!")
 
             if not component.isNull():
+                _check_component(component)
 
-                if component.hasFn(OpenMaya.MFn.kMeshPolygonComponent):
-                    pass
-
-                elif component.hasFn(OpenMaya.MFn.kMeshEdgeComponent):
-                    raise RuntimeError(
-                        "Edges not supported! "
-                        "Please convert to faces.")
+            path = OpenMaya.MDagPath(dag).extendToShape().fullPathName()
+            item = items.setdefault(path, [dag, []])
 
-                elif component.hasFn(OpenMaya.MFn.kMeshVertComponent):
-                    raise RuntimeError(
-                        "Vertices not supported! "
-                        "Please convert to faces.")
+            if component.isNull():
+                item[1] = None
+            elif item[1] is not None:
+                item[1].append(component)
 
-                elif component.hasFn(OpenMaya.MFn.kMeshMapComponent):
-                    raise RuntimeError(
-                        "UVs not supported! "
-                        "Please convert to faces.")
+        for dag, components in items.values():
 
-                elif component.hasFn(OpenMaya.MFn.kMeshVtxFaceComponent):
-                    raise RuntimeError(
-                        "Vertex Faces not supported! "
-                        "Please convert to faces.")
-
-                else:
-                    raise RuntimeError("Object is not a mesh!")
+            if not components:
+                component = OpenMaya.MObject()
+            elif (len(components) == 1 and components[0].hasFn(
+                    OpenMaya.MFn.kMeshPolygonComponent)):
+                component = components[0]
+            else:
+                component = self._to_faces(dag, components)
 
             self.meshes.append([dag, component])
 
@@ -65,58 +340,575 @@ class Mesh(object):
                 self.shapes.append(cmds.listRelatives(
                     dag.partialPathName(), children=True)[0])
 
-        # init values
-        self.uv_area = 0
-        self.world_area = 0
+        self.mesh_count = len(self.meshes)
 
-        # get info
-        self.get_info()
+    def _to_faces(self, dag, components):
+        """
+        Converts components of a shape to one face component, with the
+        integer arrays of the components and of the mesh's topology.
 
-        # get ratio
-        self.ratio = self.get_ratio()
+        :param dag: path of the shape
+        :type dag: MDagPath
+        :param components: components of the shape
+        :type components: list
+
+        :raises: None
+
+        :return: face component
+        :rtype: MObject
+        """
+        fn_mesh = OpenMaya.MFnMesh(dag)
+        MFn = OpenMaya.MFn
+
+        # topology is only read for the kinds of components selected
+        topology = {}
+
+        def get_vertices():
+            if "vertices" not in topology:
+                counts, connects = fn_mesh.getVertices()
+                topology["vertices"] = (
+                    numpy.array(counts, dtype=numpy.int64),
+                    numpy.array(connects, dtype=numpy.int64))
+            return topology["vertices"]
+
+        faces = []
+
+        for component in components:
+
+            if component.hasFn(MFn.kMeshVtxFaceComponent):
+                pairs = OpenMaya.MFnDoubleIndexedComponent(
+                    component).getElements()
+                faces.append(numpy.array(
+                    pairs, dtype=numpy.int64).reshape(-1, 2)[:, 1])
+                continue
+
+            ids = numpy.array(OpenMaya.MFnSingleIndexedComponent(
+                component).getElements(), dtype=numpy.int64)
+
+            if component.hasFn(MFn.kMeshPolygonComponent):
+                faces.append(ids)
+
+            elif component.hasFn(MFn.kMeshVertComponent):
+                counts, connects = get_vertices()
+                faces.append(core.get_faces_using(
+                    connects, counts, ids, fn_mesh.numVertices))
+
+            elif component.hasFn(MFn.kMeshMapComponent):
+                uv_counts, uv_ids = fn_mesh.getAssignedUVs()
+                faces.append(core.get_faces_using(
+                    numpy.array(uv_ids, dtype=numpy.int64),
+                    numpy.array(uv_counts, dtype=numpy.int64), ids,
+                    fn_mesh.numUVs()))
+
+            elif component.hasFn(MFn.kMeshEdgeComponent):
+                counts, connects = get_vertices()
+                faces.append(core.get_edge_faces(
+                    counts, connects, self._get_edges(dag, ids),
+                    fn_mesh.numVertices))
+
+        face_component = OpenMaya.MFnSingleIndexedComponent()
+        component = face_component.create(MFn.kMeshPolygonComponent)
+        face_component.addElements(
+            core.get_used(numpy.concatenate(faces)).tolist())
+
+        return component
+
+    @staticmethod
+    def _get_edges(dag, ids):
+        """
+        Point ids of edges.
+
+        :return: (n, 2) point ids
+        :rtype: numpy.ndarray
+        """
+        # the point ids of every edge in one walk, then picked
+        edge_iter = OpenMaya.MItMeshEdge(dag)
+        edges = numpy.empty((edge_iter.count(), 2), dtype=numpy.int64)
+
+        while not edge_iter.isDone():
+            edges[edge_iter.index()] = (edge_iter.vertexId(0),
+                                        edge_iter.vertexId(1))
+            edge_iter.next()
+
+        return edges[ids]
 
     def get_info(self):
         """Gets info needed"""
+        for _ in self.iter_info():
+            pass
 
-        min_x, min_y = 9999, 9999
-        max_x, max_y = -9999, -9999
+    def iter_info(self):
+        """:meth:`get_info` as a generator job"""
 
         self.counts = []
-        self.centers = []
-        self.uv_indexes = []
+        self.world_areas = []
+        self.uv_set_info = []
+
+        # the iterator engine walks every instance path on its own
+        self.dedup_stats = {"paths": len(self.meshes),
+                            "shapes": len(self.meshes),
+                            "reads_saved": 0,
+                            "matmuls_saved": 0}
+
+        # bulk shapes are read, then measured, iterator shapes walked
+        self._done = 0
+        self._total = len(self.meshes) * (2 if self.engine == "bulk" else 1)
+
+        with profiling.span("get_info", shapes=len(self.meshes)) as timer:
+
+            if self.engine == "bulk":
+                steps = self._iter_info_bulk()
+            else:
+                steps = self._iter_info_iterator()
+
+            for _ in steps:
+                yield
+
+            self._sum_uv_sets()
+            timer.set(faces=sum(self.counts), uvs=sum(
+                len(indexes) for indexes in self.uv_indexes))
+
+    def _get_uv_sets(self, fn_mesh):
+        """
+        Names of the uv sets to measure on a shape, the first one is the
+        one :attr:`ratio` is about.
+        """
+        current = fn_mesh.currentUVSetName()
+
+        if self.uv_sets is None:
+            return [current]
+
+        names = fn_mesh.getUVSetNames()
+
+        if self.uv_sets == "all":
+            return [current] + [name for name in names if name != current]
+
+        for name in self.uv_sets:
+            if name not in names:
+                raise RuntimeError("{0} has no uv set {1}!".format(
+                    fn_mesh.partialPathName(), name))
+
+        return list(self.uv_sets)
+
+    def _iter_info_iterator(self):
+        """Gets info by walking each face with MItMeshPolygon"""
 
         for dag, component in self.meshes:
 
-            mesh_iter = OpenMaya.MItMeshPolygon(dag, component)
-            self.counts.append(mesh_iter.count())
-            uv_index = set()
+            # every chunk of faces is walked on the main thread
+            walk = self._walk_shape(dag, component)
+            while self.main_thread(next, walk, None):
+                yield
+
+            self._step()
+            yield
+
+    def _walk_shape(self, dag, component):
+        """
+        Walks the faces of one selected mesh, yields True every
+        :data:`WALK_CHUNK` faces.
+        """
+
+        fn_mesh = OpenMaya.MFnMesh(dag)
+        uv_sets = self._get_uv_sets(fn_mesh)
+        space = (OpenMaya.MSpace.kWorld if self.space == "world"
+                 else OpenMaya.MSpace.kObject)
+
+        world_area = 0
+        uv_areas = dict((uv_set, 0) for uv_set in uv_sets)
+        # a byte per uv of the mesh marks the used ones
+        uv_index = dict((uv_set, bytearray(fn_mesh.numUVs(uv_set)))
+                        for uv_set in uv_sets)
+        bounds = dict((uv_set, [9999, 9999, -9999, -9999])
+                      for uv_set in uv_sets)
+
+        mesh_iter = OpenMaya.MItMeshPolygon(dag, component)
+        self.counts.append(mesh_iter.count())
+        walked = 0
+
+        with profiling.span("walk faces", faces=mesh_iter.count()):
 
             while not mesh_iter.isDone():
 
-                self.uv_area += mesh_iter.getUVArea()
-                self.world_area += mesh_iter.getArea()
+                world_area += mesh_iter.getArea(space)
 
-                for v in xrange(mesh_iter.polygonVertexCount()):
+                for uv_set in uv_sets:
 
-                    # get index and store it
-                    uv_index.add(mesh_iter.getUVIndex(v))
+                    if not mesh_iter.hasUVs(uv_set):
+                        continue
 
-                    # check min max value
-                    x, y = mesh_iter.getUV(v)
-                    if x < min_x:
-                        min_x = x
-                    if y < min_y:
-                        min_y = y
-                    if x > max_x:
-                        max_x = x
-                    if y > max_y:
-                        max_y = y
+                    uv_areas[uv_set] += mesh_iter.getUVArea(uv_set)
+                    bound = bounds[uv_set]
+
+                    for v in xrange(mesh_iter.polygonVertexCount()):
+
+                        # get index and mark it
+                        uv_index[uv_set][
+                            mesh_iter.getUVIndex(v, uv_set)] = 1
+
+                        # check min max value
+                        x, y = mesh_iter.getUV(v, uv_set)
+                        if x < bound[0]:
+                            bound[0] = x
+                        if y < bound[1]:
+                            bound[1] = y
+                        if x > bound[2]:
+                            bound[2] = x
+                        if y > bound[3]:
+                            bound[3] = y
 
                 mesh_iter.next(1)
 
-            self.centers.append([((max_x - min_x) / 2.0) + min_x,
-                                ((max_y - min_y) / 2.0) + min_y])
-            self.uv_indexes.append(uv_index)
+                walked += 1
+                if walked % WALK_CHUNK == 0:
+                    yield True
+
+        self.world_areas.append(world_area)
+
+        info = OrderedDict()
+        for uv_set in uv_sets:
+            min_x, min_y, max_x, max_y = bounds[uv_set]
+            # shells need the face-vertex arrays of the bulk engine
+            info[uv_set] = UVSetInfo(
+                uv_areas[uv_set], _get_marked(uv_index[uv_set]),
+                [((max_x - min_x) / 2.0) + min_x,
+                 ((max_y - min_y) / 2.0) + min_y])
+        self.uv_set_info.append(info)
+
+    def _iter_info_bulk(self):
+        """
+        Gets info from whole arrays read once per shape.
+
+        Arrays are read from Maya through :attr:`main_thread`, and the
+        numeric work is handed to a thread pool as soon as a shape is
+        read, so shapes are measured while the next ones are read. Results
+        are put back in selection order, totals are the same for any
+        number of workers.
+        """
+        # object space arrays and measurements of each shape node, shared
+        # by every instance path of it
+        shared = OrderedDict()
+        instances = []
+        self.dedup_stats["shapes"] = 0
+
+        # copies of the cached arrays, instances share theirs
+        copies = {}
+
+        executor = _get_executor(self.workers)
+        placed = []
+
+        try:
+
+            for dag, component in self.meshes:
+                instances.append(self.main_thread(
+                    self._prepare_shape, executor, dag, component, shared,
+                    copies))
+                self._step()
+                yield
+
+            # instances only need the measurement of their shape node,
+            # what is left of the pool's work is waited for here
+            with profiling.span("measure", shapes=len(shared)):
+
+                for shape, matrix, keys, cached, node_key in instances:
+                    future = None
+                    if not all(cached.get(uv_set) for uv_set in keys):
+                        points, measured = shared[node_key]
+                        future = executor.submit(
+                            _place_shape, measured, points, matrix)
+                    placed.append(future)
+
+                for (shape, matrix, keys, cached, node_key), future in zip(
+                        instances, placed):
+
+                    if future is not None:
+                        points, uv_sets = future.result()
+                        for uv_set, placed_set in uv_sets.items():
+                            measurement, shells, uvs = placed_set
+                            value = (measurement, shells, points, uvs)
+                            if not cached.get(uv_set):
+                                cached[uv_set] = value
+                                self.main_thread(self._cache_put,
+                                                 keys[uv_set], value, shape)
+
+                    info = OrderedDict()
+                    for uv_set, key in keys.items():
+                        measurement, shells, points, uvs = cached[uv_set]
+                        info[uv_set] = UVSetInfo(
+                            measurement.uv_area, measurement.uv_indexes,
+                            measurement.pivot, measurement, shells, points,
+                            uvs, matrix, key)
+
+                    self.counts.append(len(measurement.faces))
+                    self.world_areas.append(measurement.world_area)
+                    self.uv_set_info.append(info)
+                    self._step()
+                    yield
+
+        finally:
+            # a job closed while measuring drops the pool's queued work
+            # rather than waiting for it on the main thread
+            for future in placed + [measured for _, measured
+                                    in shared.values()]:
+                if future is not None:
+                    future.cancel()
+            executor.shutdown(wait=False)
+
+    def _prepare_shape(self, executor, dag, component, shared, copies):
+        """
+        Looks a selected mesh up in the cache, and starts reading and
+        measuring its shape node unless another path of it already did.
+
+        :return: shape, matrix, cache keys, cached values and node key
+        :rtype: tuple
+        """
+        shape = OpenMaya.MDagPath(dag)
+        shape.extendToShape()
+        fn_mesh = OpenMaya.MFnMesh(shape)
+
+        face_mask = _get_face_mask(component)
+        matrix = self._get_matrix(shape)
+        keys = self._get_keys(shape, fn_mesh, face_mask, matrix)
+        cached = {}
+
+        if self.cache is not None:
+            for uv_set, key in keys.items():
+                value = self.cache.get(key)
+                if value is not None:
+                    value = _copy_cached(value, copies)
+                cached[uv_set] = value
+
+        node_key = cache.make_key(
+            OpenMaya.MFnDagNode(shape.node()).fullPathName(),
+            face_mask)
+
+        if node_key in shared:
+            self.dedup_stats["reads_saved"] += 1
+
+        elif not all(cached.get(uv_set) for uv_set in keys):
+            with profiling.span("read arrays") as timer:
+                shared[node_key] = self._read_shape(
+                    executor, fn_mesh, keys, face_mask)
+                timer.set(faces=fn_mesh.numPolygons)
+            self.dedup_stats["shapes"] += 1
+
+        if matrix is not None and core.get_area_scale(matrix) is not None:
+            self.dedup_stats["matmuls_saved"] += 1
+
+        return shape, matrix, keys, cached, node_key
+
+    def _get_keys(self, shape, fn_mesh, face_mask, matrix):
+        """Cache keys of every uv set measured on a shape"""
+        keys = OrderedDict()
+        for uv_set in self._get_uv_sets(fn_mesh):
+            keys[uv_set] = cache.make_key(
+                shape.fullPathName(), face_mask, uv_set, matrix,
+                self.precision)
+        return keys
+
+    def _read_shape(self, executor, fn_mesh, uv_sets, face_mask):
+        """
+        Reads the arrays of a shape node and starts measuring them.
+
+        :return: object space points and the future measurement
+        :rtype: tuple
+        """
+        dtype = self._get_dtype()
+        counts, connects = fn_mesh.getVertices()
+        points = _read_points(fn_mesh, dtype)
+
+        arrays = {}
+        for uv_set in uv_sets:
+            uv_counts, uv_ids = fn_mesh.getAssignedUVs(uv_set)
+            arrays[uv_set] = (_read_uvs(fn_mesh, uv_set), uv_counts, uv_ids)
+
+        return points, executor.submit(
+            _measure_shape, points, counts, connects, arrays, face_mask,
+            dtype)
+
+    def _get_dtype(self):
+        """Storage of per face areas and points of :attr:`precision`"""
+        if self.precision == "single":
+            return numpy.float32
+        return numpy.float64
+
+    def _step(self):
+        """Reports one more step of :meth:`get_info` done"""
+        self._done += 1
+        if self.progress is not None:
+            self.progress(self._done, self._total)
+
+    def _sum_uv_sets(self):
+        """Totals and ratio of every uv set over the measured shapes"""
+
+        self.world_area = sum(self.world_areas)
+        self.uv_area = 0
+
+        # per shape values of the uv set ratio is about
+        self.centers = []
+        self.uv_indexes = []
+        self.measurements = []
+        self.shells = []
+
+        uv_areas = OrderedDict()
+        world_areas = OrderedDict()
+
+        for world_area, info in zip(self.world_areas, self.uv_set_info):
+
+            primary = next(iter(info.values()))
+            self.uv_area += primary.uv_area
+            self.centers.append(primary.center)
+            self.uv_indexes.append(primary.uv_indexes)
+            self.measurements.append(primary.measurement)
+            self.shells.append(primary.shells)
+
+            for uv_set, values in info.items():
+                uv_areas[uv_set] = uv_areas.get(uv_set, 0) + values.uv_area
+                world_areas[uv_set] = world_areas.get(uv_set, 0) + world_area
+
+        self.ratios = OrderedDict()
+        for uv_set in uv_areas:
+            try:
+                self.ratios[uv_set] = math.sqrt(
+                    uv_areas[uv_set] / world_areas[uv_set])
+            except ZeroDivisionError:
+                self.ratios[uv_set] = 0.0
+
+    def update(self, changes=None):
+        """
+        Measures again only the faces whose points or uvs moved.
+
+        The iterator engine, and a change of topology, measure everything
+        again with :meth:`get_info` instead.
+
+        :param changes: point ids and uv ids that moved, per measured
+                        shape; found by comparing the arrays read last
+                        time with the current ones when None. Uv ids are
+                        for the uv set :attr:`ratio` is about.
+        :type changes: list
+        """
+        if self.engine != "bulk":
+            self.get_info()
+            self.ratio = self.get_ratio()
+            return
+
+        # instances share their arrays, each array is compared once
+        point_diffs = {}
+        uv_diffs = {}
+
+        for i, (dag, _) in enumerate(self.meshes):
+
+            shape = OpenMaya.MDagPath(dag)
+            shape.extendToShape()
+            fn_mesh = OpenMaya.MFnMesh(shape)
+
+            info = self.uv_set_info[i]
+            primary = next(iter(info))
+            points = info[primary].points
+            matrix = info[primary].matrix
+
+            if not _same_matrix(matrix, self._get_matrix(shape)):
+                self.get_info()
+                self.ratio = self.get_ratio()
+                return
+
+            if id(points) not in point_diffs:
+
+                if changes is None:
+                    # read as stored, single precision points compare
+                    # equal when they didn't move
+                    new_points = _read_points(fn_mesh, points.dtype)
+
+                    if new_points.shape != points.shape:
+                        self.get_info()
+                        self.ratio = self.get_ratio()
+                        return
+
+                    point_ids = numpy.nonzero(
+                        (new_points != points).any(axis=1))[0]
+                    new_points = new_points[point_ids]
+
+                else:
+                    point_ids = numpy.asarray(
+                        changes[i][0], dtype=numpy.int64)
+                    new_points = numpy.array(
+                        [fn_mesh.getPoint(int(x)) for x in point_ids]
+                    ).reshape(-1, 4)[:, :3]
+
+                points[point_ids] = new_points
+                point_diffs[id(points)] = point_ids
+
+            point_ids = point_diffs[id(points)]
+
+            for uv_set, values in info.items():
+
+                uvs = values.uvs
+
+                if id(uvs) not in uv_diffs:
+
+                    if changes is not None and uv_set == primary:
+                        uv_ids = numpy.asarray(
+                            changes[i][1], dtype=numpy.int64)
+                        new_uvs = numpy.array(
+                            [fn_mesh.getUV(int(x), uv_set) for x in uv_ids]
+                        ).reshape(-1, 2)
+                    else:
+                        new_uvs = _read_uvs(fn_mesh, uv_set)
+
+                        if new_uvs.shape != uvs.shape:
+                            self.get_info()
+                            self.ratio = self.get_ratio()
+                            return
+
+                        uv_ids = numpy.nonzero(
+                            (new_uvs != uvs).any(axis=1))[0]
+                        new_uvs = new_uvs[uv_ids]
+
+                    old_uvs = uvs[uv_ids]
+                    uvs[uv_ids] = new_uvs
+                    uv_diffs[id(uvs)] = (uv_ids, old_uvs)
+
+                uv_ids, old_uvs = uv_diffs[id(uvs)]
+
+                measurement = values.measurement
+                faces, world_delta, uv_delta = core.remeasure(
+                    measurement, points, uvs, point_ids, uv_ids, old_uvs,
+                    matrix=matrix)
+                core.update_shells(values.shells, measurement, uvs,
+                                   faces, world_delta, uv_delta)
+
+                values.uv_area = measurement.uv_area
+                values.center = measurement.pivot
+                self._cache_put(values.key, (
+                    measurement, values.shells, points, uvs), shape)
+
+            self.world_areas[i] = measurement.world_area
+
+        self._sum_uv_sets()
+        self.ratio = self.get_ratio()
+
+    def _get_matrix(self, dag):
+        """
+        Matrix a shape's points are measured with, None in object space.
+
+        Every instance path has its own inclusive matrix, so instances of
+        one shape are measured where they are.
+        """
+        if self.space == "object":
+            return None
+
+        return numpy.array(list(dag.inclusiveMatrix())).reshape(4, 4)
+
+    def _cache_put(self, key, value, shape):
+        """Caches the measurement, shells and arrays of a shape"""
+        if self.cache is None:
+            return
+
+        measurement, shells, points, uvs = value
+        self.cache.put(key, value,
+                       measurement.nbytes + shells.nbytes +
+                       points.nbytes + uvs.nbytes,
+                       node=shape.node())
 
     def get_ratio(self):
         try:
@@ -125,19 +917,708 @@ class Mesh(object):
             raise RuntimeError(
                 "Unable to calculate area because it's zero...")
 
-    def resize(self, new_ratio):
+    def resize(self, new_ratio, method=None, uv_set=None):
         """
         Resize ratio
+
+        :param new_ratio: ratio to scale the uvs to
+        :type new_ratio: float
+        :param method: how uvs are written, see :data:`WRITE_METHODS`
+        :type method: str
+        :param uv_set: measured uv set to scale, by default the one
+                       :attr:`ratio` is about
+        :type uv_set: str
+        """
+        if uv_set is None:
+            scale_amt = new_ratio / self.ratio
+        elif uv_set in self.ratios:
+            scale_amt = new_ratio / self.ratios[uv_set]
+        else:
+            raise RuntimeError("UV set {0} wasn't measured!".format(uv_set))
+
+        self.scale(dict.fromkeys(self._get_nodes(), scale_amt), method,
+                   uv_set)
+
+        if uv_set is None:
+            self.ratio = new_ratio
+        else:
+            self.ratios[uv_set] = new_ratio
+            self.ratio = self.get_ratio()
+
+    def iter_resize(self, new_ratio, method=None, uv_set=None):
+        """
+        :meth:`resize` as a generator job.
+
+        Uvs are all written in the one step after its first pause, so its
+        undo chunk is never left open while other work runs. Closed
+        before that, nothing is scaled.
+        """
+        yield
+        self.resize(new_ratio, method, uv_set)
+
+    def get_node_ratios(self, uv_set=None):
+        """
+        Ratio of every selected shape node on its own. Instances of a
+        shape share its uvs, its ratio is over all the selected ones.
+
+        :param uv_set: measured uv set, by default the one :attr:`ratio`
+                       is about
+        :type uv_set: str
+
+        :return: ratio per full path of shape node, None where the uv set
+                 wasn't measured and 0.0 where an area is zero
+        :rtype: OrderedDict
+        """
+        # uv and world area of each shape node
+        areas = OrderedDict()
+        for node, world_area, info in zip(
+                self._get_nodes(), self.world_areas, self.uv_set_info):
+
+            total = areas.setdefault(node, None)
+            values = info.get(uv_set or next(iter(info)))
+            if values is None:
+                continue
+
+            if total is None:
+                total = areas[node] = [0.0, 0.0]
+            total[0] += values.uv_area
+            total[1] += world_area
+
+        ratios = OrderedDict()
+        for node, total in areas.items():
+            if total is None:
+                ratios[node] = None
+                continue
+
+            try:
+                ratios[node] = math.sqrt(total[0] / total[1])
+            except ZeroDivisionError:
+                ratios[node] = 0.0
+
+        return ratios
+
+    def _get_nodes(self):
+        """Full path of the shape node of every selected mesh"""
+        nodes = []
+        for dag, _ in self.meshes:
+            shape = OpenMaya.MDagPath(dag)
+            shape.extendToShape()
+            nodes.append(OpenMaya.MFnDagNode(shape.node()).fullPathName())
+        return nodes
+
+    def iter_scale(self, scales, method=None, uv_set=None):
+        """:meth:`scale` as a generator job like :meth:`iter_resize`"""
+        yield
+        self.scale(scales, method, uv_set)
+
+    def scale(self, scales, method=None, uv_set=None):
+        """
+        Scales the uvs of every selected shape node by its own amount,
+        around its center.
+
+        The writes are one undo chunk, with viewport refresh suspended.
+
+        :param scales: scale per full path of shape node, see
+                       :meth:`get_node_ratios`, shapes left out or None
+                       are left alone
+        :type scales: dict
+        :param method: how uvs are written, see :data:`WRITE_METHODS`
+        :type method: str
+        :param uv_set: measured uv set to scale, by default the one
+                       :attr:`ratio` is about
+        :type uv_set: str
+        """
+        method = method or DEFAULT_WRITE_METHOD
+
+        if method not in WRITE_METHODS:
+            raise RuntimeError("Unknown write method {0}!".format(method))
+
+        if method != "polyEditUV" and numpy is None:
+            raise RuntimeError(
+                "The {0} write method requires numpy!".format(method))
+
+        # instances share their uvs, which are only scaled once
+        scaled = {}
+
+        # shape index, uv set, its measured values, scale and uv ids
+        targets = []
+        for i, (info, node) in enumerate(
+                zip(self.uv_set_info, self._get_nodes())):
+            name = uv_set or next(iter(info))
+            scale_amt = scales.get(node)
+            if name not in info or scale_amt is None:
+                continue
+
+            uv_ids = _get_unscaled(info[name].uv_indexes,
+                                   scaled.setdefault((node, name), []))
+            targets.append((i, name, info[name], scale_amt, uv_ids))
+
+        if method == "command":
+            writes = self._resize_command(targets)
+        elif method == "api":
+            writes = self._resize_api(targets)
+        else:
+            writes = self._resize_poly_edit_uv(targets)
+
+        cmds.undoInfo(openChunk=True, chunkName="UVRatio")
+        cmds.refresh(suspend=True)
+
+        with profiling.span("resize", shapes=len(targets)) as timer:
+            try:
+                for target in writes:
+                    # scaling around the pivot keeps centers and scales
+                    # areas
+                    _, _, values, scale_amt, uv_ids = target
+                    values.uv_area *= scale_amt * scale_amt
+                    # per face and shell areas are what reports and the
+                    # shells table are made of
+                    if values.measurement is not None:
+                        core.scale_measurement(
+                            values.measurement, values.uvs, uv_ids,
+                            scale_amt, values.center)
+                    if values.shells is not None:
+                        core.scale_shells(values.shells, scale_amt,
+                                          values.center)
+                    timer.set(uvs=len(uv_ids))
+
+            finally:
+                writes.close()
+                cmds.refresh(suspend=False)
+                cmds.undoInfo(closeChunk=True)
+                self._sum_uv_sets()
+                self.ratio = self.get_ratio()
+
+    def _resize_command(self, targets):
+        """
+        Scales uvs with the uvRatioScale command of the bundled plugin,
+        one call per target.
+
+        Yields every scaled target.
+        """
+        for target in targets:
+            i, uv_set, values, scale_amt, uv_ids = target
+
+            # another instance of the shape may have scaled them all
+            if len(uv_ids):
+                shape = OpenMaya.MDagPath(self.meshes[i][0]).extendToShape()
+                undo.scale_uvs(shape.fullPathName(), uv_ids, scale_amt,
+                               values.center, uv_set)
+
+            yield target
+
+    def _resize_poly_edit_uv(self, targets):
+        """
+        Scales uvs with polyEditUV, one call per transform, uv set and
+        :data:`EDIT_CHUNK` uvs.
+
+        Yields every scaled target.
+        """
+        for target in targets:
+            i, uv_set, values, scale_amt, uv_ids = target
+
+            names = ["{0}.map[{1}]".format(self.transforms[i], m)
+                     for m in uv_ids]
+
+            for start in xrange(0, len(names), EDIT_CHUNK):
+                cmds.polyEditUV(
+                    names[start:start + EDIT_CHUNK],
+                    pivotU=values.center[0],
+                    pivotV=values.center[1],
+                    scaleU=scale_amt,
+                    scaleV=scale_amt,
+                    uvSetName=uv_set)
+
+            yield target
+
+    def _resize_api(self, targets):
+        """
+        Scales uvs in numpy and writes them with MFnMesh.setUVs.
+
+        Yields every scaled target, the targets written are one undo step
+        however far it got.
         """
-        scale_amt = new_ratio / self.ratio
+        edits = []
+
+        def set_uvs(which):
+            for dag, uv_set, uvs in edits:
+                us, vs = uvs[which]
+                OpenMaya.MFnMesh(dag).setUVs(us, vs, uv_set)
+
+        try:
+            for target in targets:
+                i, uv_set, values, scale_amt, uv_ids = target
+
+                dag = self.meshes[i][0]
+                fn_mesh = OpenMaya.MFnMesh(dag)
+
+                old_us, old_vs = fn_mesh.getUVs(uv_set)
+                uvs = numpy.column_stack((old_us, old_vs))
+
+                uv_index = numpy.asarray(uv_ids)
+                pivot = numpy.array(values.center)
+                uvs[uv_index] = (uvs[uv_index] - pivot) * scale_amt + pivot
+
+                new_us = OpenMaya.MFloatArray(uvs[:, 0].tolist())
+                new_vs = OpenMaya.MFloatArray(uvs[:, 1].tolist())
+
+                fn_mesh.setUVs(new_us, new_vs, uv_set)
+                edits.append((OpenMaya.MDagPath(dag), uv_set,
+                              ((old_us, old_vs), (new_us, new_vs))))
+
+                yield target
+
+        finally:
+            if edits:
+                undo.commit(partial(set_uvs, 0), partial(set_uvs, 1))
+
+
+class BatchResult(object):
+    """
+    Outcome of :func:`match_ratio` and :func:`match_density`.
+
+    :ivar ratio: ratio the meshes were matched to
+    :ivar mesh: the selection, measured once and rescaled
+    :ivar changed: (transforms, scale) of every rescaled shape node
+    :ivar skipped: (transforms, scale) of every shape node already within
+                   tolerance
+    :ivar scales: scale of every shape node to change, by full path
+    :ivar elapsed: wall-clock seconds the batch took
+    :ivar dry_run: whether uvs were left untouched
+    """
+
+    def __init__(self, ratio, dry_run=False):
+
+        self.ratio = ratio
+        self.mesh = None
+        self.changed = []
+        self.skipped = []
+        self.scales = {}
+        self.elapsed = 0.0
+        self.dry_run = dry_run
+
+    def __str__(self):
+        return "{0} {1}, {2} skipped in {3:.3f}s".format(
+            len(self.changed), "to change" if self.dry_run else "changed",
+            len(self.skipped), self.elapsed)
+
+    def describe(self):
+        """
+        A line per mesh with the scale it got, or would get.
+
+        :rtype: str
+        """
+        lines = []
+        for entries, state in ((self.changed, "scale"),
+                               (self.skipped, "skip")):
+            for name, scale_amt in entries:
+                lines.append("{0}\t{1}\t{2:.4f}".format(
+                    name, state, scale_amt))
+        return "\n".join(lines)
+
+
+def match_ratio(new_ratio, selection=None, tolerance=DEFAULT_TOLERANCE,
+                engine=None, method=None):
+    """
+    Measures the selection once and rescales every shape node in it to a
+    ratio on its own. Instances of a shape share its uvs and are scaled
+    once, by the ratio of all the selected ones.
+
+    The whole batch is one undo chunk and viewport refresh is suspended
+    while it runs.
+
+    :param new_ratio: ratio to match, usually a source ``Mesh.ratio``
+    :type new_ratio: float
+    :param selection: meshes to match, the active selection by default
+    :type selection: OpenMaya.MSelectionList
+    :param tolerance: relative ratio difference left alone
+    :type tolerance: float
+    :param engine: measurement engine, see :data:`ENGINES`
+    :type engine: str
+    :param method: how uvs are written, see :data:`WRITE_METHODS`
+    :type method: str
+
+    :raises: ``RuntimeError`` if nothing is selected
+
+    :return: the measured selection, changed and skipped shapes and the
+             time taken
+    :rtype: :class:`BatchResult`
+    """
+    result = BatchResult(new_ratio)
+
+    with profiling.span("match_ratio"):
+        for _ in iter_match(result, selection, tolerance, engine):
+            pass
+        apply_match(result, method)
+
+    return result
+
+
+def get_scene_unit():
+    """Linear unit of the scene, such as ``cm``"""
+    return cmds.currentUnit(query=True, linear=True)
+
+
+def density_to_ratio(density, resolution, unit="m", scene_unit=None):
+    """
+    Ratio giving a texel density, for a texture resolution.
+
+    512 px per meter on a 2048 texture, in a centimeter scene, is a ratio
+    of 512 / 2048 / 100 = 0.0025 uv units per centimeter.
+
+    :param density: pixels per ``unit``
+    :type density: float
+    :param resolution: texture pixels across the 0-1 uv range
+    :type resolution: int
+    :param unit: linear unit of the density, see :data:`LINEAR_UNITS`
+    :type unit: str
+    :param scene_unit: linear unit of the scene, asked to Maya if None
+    :type scene_unit: str
+
+    :raises: ``RuntimeError`` for an unknown unit or a resolution of zero
+
+    :return: ratio to resize to
+    :rtype: float
+    """
+    if not resolution:
+        raise RuntimeError("Texture resolution can't be zero!")
+
+    return density / float(resolution) / _get_units(unit, scene_unit)
+
+
+def ratio_to_density(ratio, resolution, unit="m", scene_unit=None):
+    """
+    Texel density of a ratio, the inverse of :func:`density_to_ratio`.
+
+    :raises: ``RuntimeError`` for an unknown unit
+
+    :return: pixels per ``unit``
+    :rtype: float
+    """
+    return ratio * resolution * _get_units(unit, scene_unit)
+
+
+def _get_units(unit, scene_unit):
+    """Scene units in one ``unit``"""
+    scene_unit = scene_unit or get_scene_unit()
+
+    for name in (unit, scene_unit):
+        if name not in LINEAR_UNITS:
+            raise RuntimeError("Unknown linear unit {0}!".format(name))
+
+    return LINEAR_UNITS[unit] / LINEAR_UNITS[scene_unit]
+
+
+def match_density(density, resolution, unit="m", selection=None,
+                  tolerance=DEFAULT_TOLERANCE, engine=None, method=None,
+                  dry_run=False):
+    """
+    Rescales every selected shape node to a texel density on its own,
+    like :func:`match_ratio`.
+
+    :param density: pixels per ``unit``, such as 512 px/m
+    :type density: float
+    :param resolution: texture pixels across the 0-1 uv range
+    :type resolution: int
+    :param unit: linear unit of the density, see :data:`LINEAR_UNITS`
+    :type unit: str
+    :param selection: meshes to match, the active selection by default
+    :type selection: OpenMaya.MSelectionList
+    :param tolerance: relative scale difference left alone
+    :type tolerance: float
+    :param engine: measurement engine, see :data:`ENGINES`
+    :type engine: str
+    :param method: how uvs are written, see :data:`WRITE_METHODS`
+    :type method: str
+    :param dry_run: only work out the scale each mesh would get
+    :type dry_run: bool
+
+    :raises: ``RuntimeError`` if nothing is selected, or for an unknown
+             unit
+
+    :return: the measured selection, changed and skipped shapes and the
+             time taken
+    :rtype: :class:`BatchResult`
+    """
+    result = BatchResult(density_to_ratio(density, resolution, unit),
+                         dry_run=dry_run)
+
+    with profiling.span("match_density", dry_run=int(dry_run)):
+        for _ in iter_match(result, selection, tolerance, engine):
+            pass
+        apply_match(result, method)
+
+    return result
+
+
+def iter_match(result, selection=None, tolerance=DEFAULT_TOLERANCE,
+               engine=None):
+    """
+    Measuring and planning of :func:`match_ratio` and
+    :func:`match_density` as a generator job, pausing while measuring.
+    No uvs are written, :func:`apply_match` scales them afterwards.
+
+    :param result: batch to fill in, its ratio is the one matched
+    :type result: :class:`BatchResult`
+
+    :raises: ``RuntimeError`` if nothing is selected
+    """
+    start = time.time()
+
+    mesh = result.mesh = Mesh(engine=engine, selection=selection,
+                              measure=False)
+    for _ in mesh.iter_measure():
+        yield
+
+    # transforms of each shape node, instances have several
+    names = OrderedDict()
+    for node, transform in zip(mesh._get_nodes(), mesh.transforms):
+        names.setdefault(node, []).append(transform)
+
+    scales = result.scales
+    for node, ratio in mesh.get_node_ratios().items():
+        if not ratio:
+            continue
+
+        scale_amt = result.ratio / ratio
+        entry = (" ".join(names[node]), scale_amt)
+
+        if abs(scale_amt - 1.0) <= tolerance:
+            result.skipped.append(entry)
+        else:
+            result.changed.append(entry)
+            scales[node] = scale_amt
+
+    result.elapsed = time.time() - start
+
+
+def apply_match(result, method=None):
+    """
+    Scales the uvs a batch planned by :func:`iter_match`, in one undo
+    chunk. Dry runs are left untouched.
+
+    :param result: batch measured by :func:`iter_match`
+    :type result: :class:`BatchResult`
+    :param method: how uvs are written, see :data:`WRITE_METHODS`
+    :type method: str
+
+    :raises: None
+
+    :return: None
+    :rtype: NoneType
+    """
+    if result.dry_run or not result.scales:
+        return
+
+    start = time.time()
+
+    try:
+        result.mesh.scale(result.scales, method)
+    finally:
+        result.elapsed += time.time() - start
+
+
+def _measure_shape(points, counts, connects, arrays, face_mask, dtype):
+    """Numeric work of a shape node, run by the thread pool"""
+    world, measured = core.measure_shape(
+        points, counts, connects, arrays, face_mask=face_mask, dtype=dtype)
+    return world, measured, dict(
+        (uv_set, uvs) for uv_set, (uvs, _, _) in arrays.items())
+
+
+def _place_shape(measured, points, matrix):
+    """Numeric work of an instance path, run by the thread pool"""
+    world, measured, uvs = measured.result()
+    placed = core.place_shape(world, measured, points, matrix)
+    return points, dict(
+        (uv_set, (measurement, shells, uvs[uv_set]))
+        for uv_set, (measurement, shells) in placed.items())
+
+
+class _SerialExecutor(object):
+    """
+    Runs submitted work when its result is asked for, when there is no
+    thread pool, so it runs on the thread waiting for it.
+    """
+
+    def submit(self, fn, *args, **kwargs):
+        return _Deferred(fn, args, kwargs)
+
+    def shutdown(self, wait=True):
+        pass
+
+
+class _Deferred(object):
+
+    def __init__(self, fn, args, kwargs):
+        self.call = (fn, args, kwargs)
+
+    def result(self):
+        if self.call is not None:
+            fn, args, kwargs = self.call
+            self.value = fn(*args, **kwargs)
+            self.call = None
+        return self.value
+
+    def cancel(self):
+        cancelled = self.call is not None
+        self.call = None
+        return cancelled
+
+
+def _copy_cached(value, copies):
+    """
+    Copy of a cached measurement, shells, points and uvs that a mesh can
+    update and scale without touching the cache or other meshes.
+
+    :param value: cached value
+    :type value: tuple
+    :param copies: copies made so far by id of the cached arrays, so
+                   instances of a shape keep sharing their points and uvs
+    :type copies: dict
+
+    :return: the copy
+    :rtype: tuple
+    """
+    measurement, shells, points, uvs = value
+
+    for array in (points, uvs):
+        if id(array) not in copies:
+            # the cached array is kept alive so its id isn't reused
+            copies[id(array)] = (array, array.copy())
+
+    return (core.copy_measurement(measurement), core.copy_shells(shells),
+            copies[id(points)][1], copies[id(uvs)][1])
+
+
+def _get_face_mask(component):
+    """Selected face ids of a component, None for a full mesh"""
+    if component.isNull():
+        return None
+    return numpy.array(OpenMaya.MFnSingleIndexedComponent(
+        component).getElements(), dtype=numpy.int64)
+
+
+def _read_points(fn_mesh, dtype):
+    """(n, 3) object space points of a mesh, stored as dtype"""
+    return numpy.array(fn_mesh.getPoints())[:, :3].astype(dtype)
+
+
+def _read_uvs(fn_mesh, uv_set):
+    """(n, 2) uvs of a mesh as float32, which Maya stores them as"""
+    us, vs = fn_mesh.getUVs(uv_set)
+    uvs = numpy.empty((len(us), 2), dtype=numpy.float32)
+    uvs[:, 0] = us
+    uvs[:, 1] = vs
+    return uvs
+
+
+def _get_unscaled(uv_ids, scaled):
+    """
+    Uv ids not among the ones already scaled, which they are added to.
+
+    :param uv_ids: sorted uv ids
+    :type uv_ids: numpy.ndarray or array.array
+    :param scaled: uv ids scaled before on the same shape and uv set
+    :type scaled: list
+
+    :return: uv ids left to scale
+    :rtype: numpy.ndarray or list
+    """
+    if scaled:
+        if numpy is not None:
+            uv_ids = uv_ids[~numpy.isin(uv_ids, numpy.concatenate(scaled))]
+        else:
+            done = set(itertools.chain.from_iterable(scaled))
+            uv_ids = [m for m in uv_ids if m not in done]
+
+    scaled.append(uv_ids)
+    return uv_ids
+
+
+def _get_marked(marks):
+    """
+    Sorted positions of the non zero bytes of a bytearray.
+
+    :return: 32 bit ids, a numpy array or an array.array without numpy
+    :rtype: numpy.ndarray or array.array
+    """
+    if numpy is not None:
+        return numpy.flatnonzero(
+            numpy.frombuffer(marks, dtype=numpy.uint8)).astype(numpy.int32)
+
+    return array.array("i", (i for i, mark in enumerate(marks) if mark))
+
+
+def _call(function, *args):
+    """Runs a function on this thread, the default :attr:`Mesh.main_thread`"""
+    return function(*args)
+
+
+def _check_component(component):
+    """
+    Checks a selected component can be measured, converting components
+    other than faces needs numpy.
+
+    :raises: ``RuntimeError`` if it can't
+    """
+    MFn = OpenMaya.MFn
+
+    if component.hasFn(MFn.kMeshPolygonComponent):
+        return
+
+    names = [(MFn.kMeshEdgeComponent, "Edges"),
+             (MFn.kMeshVertComponent, "Vertices"),
+             (MFn.kMeshMapComponent, "UVs"),
+             (MFn.kMeshVtxFaceComponent, "Vertex Faces")]
+
+    for kind, name in names:
+        if component.hasFn(kind):
+            if numpy is None:
+                raise RuntimeError(
+                    "{0} not supported without numpy! "
+                    "Please convert to faces.".format(name))
+            return
+
+    raise RuntimeError("Object is not a mesh!")
+
+
+def _get_executor(workers):
+    """Thread pool of the numeric phase, serial with no workers"""
+    if not workers or futures is None:
+        return _SerialExecutor()
+    return futures.ThreadPoolExecutor(max_workers=workers)
+
+
+def _same_matrix(a, b):
+    """Whether two matrices, or object space Nones, are the same"""
+    if a is None or b is None:
+        return a is b
+    return numpy.array_equal(a, b)
+
+
+def compare_engines(tolerance=1e-4):
+    """
+    Measures the active selection with every engine and checks they agree.
+
+    :param tolerance: relative tolerance allowed between the engines
+    :type tolerance: float
+
+    :raises: ``RuntimeError`` if the engines disagree
+
+    :return: Meshes measured, keyed by engine
+    :rtype: dict
+    """
+    results = dict((engine, Mesh(engine=engine)) for engine in ENGINES)
+    reference = results["iterator"]
+
+    for engine, mesh in results.items():
+        for attr in ("world_area", "uv_area", "ratio"):
+            expected = getattr(reference, attr)
+            value = getattr(mesh, attr)
+            if abs(value - expected) > tolerance * max(abs(expected), 1.0):
+                raise RuntimeError(
+                    "{0} engine {1} is {2}, expected {3}!".format(
+                        engine, attr, value, expected))
 
-        for i, transform in enumerate(self.transforms):
-            cmds.polyEditUV(
-                ["{0}.map[{1}]".format(transform, m)
-                 for m in self.uv_indexes[i]],
-                pivotU=self.centers[i][0],
-                pivotV=self.centers[i][1],
-                scaleU=scale_amt,
-                scaleV=scale_amt)
+    return results
 
-        self.ratio = new_ratio
@@ -0,0 +1,222 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Cooperative scheduler running generator jobs in time slices on the main
+thread.
+
+A job is a generator that yields whenever it can be paused, such as
+:meth:`models.Mesh.iter_measure` or :func:`models.iter_match`. A
+zero interval QTimer, which fires when Qt has no other events, runs the
+highest priority job for a slice then hands control back, so Maya keeps
+drawing and answering clicks. Jobs of the same priority take turns::
+
+    task = scheduler.submit(mesh.iter_measure(), priority=1,
+                            finished=on_finished)
+    task.cancel()
+"""
+import heapq
+import itertools
+import time
+
+from UVRatio import profiling
+from UVRatio.packages.Qt import QtCore
+
+#: Milliseconds a slice runs jobs for before giving control back.
+DEFAULT_SLICE = 20
+
+PENDING, RUNNING, DONE, CANCELLED, FAILED = (
+    "pending", "running", "done", "cancelled", "failed")
+
+
+class Task(object):
+    """
+    A generator job and its state.
+
+    :ivar name: what the job does, for the ui
+    :ivar priority: higher priorities run first
+    :ivar state: one of pending, running, done, cancelled or failed
+    :ivar error: exception of a failed job
+    :ivar root: span of the job while spans are on, None otherwise
+    """
+
+    def __init__(self, generator, priority=0, name=None, finished=None):
+
+        self.generator = generator
+        self.priority = priority
+        self.name = name
+        self.state = PENDING
+        self.error = None
+        self.steps = 0
+        self.finished = finished
+        self.root = None
+
+        # cancel() from inside the job's own step waits for the step
+        self._stepping = False
+        self._cancelled = False
+
+        # spans of the job nest under the ones open when it was queued
+        self._spans = profiling.fork()
+
+    def __repr__(self):
+        return "Task({0!r}, {1})".format(self.name, self.state)
+
+    def is_done(self):
+        return self.state in (DONE, CANCELLED, FAILED)
+
+    def cancel(self):
+        """
+        Stops the job, its generator is closed so ``finally`` blocks run.
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        if self.is_done():
+            return
+
+        if self._stepping:
+            self._cancelled = True
+            return
+
+        with profiling.resume(self._spans):
+            self.generator.close()
+        self._finish(CANCELLED)
+
+    def step(self):
+        """
+        Runs the job to its next yield.
+
+        :return: whether the job has more to do
+        :rtype: bool
+        """
+        self.state = RUNNING
+        self._stepping = True
+
+        try:
+            with profiling.resume(self._spans):
+                if self.root is None and profiling.is_enabled():
+                    self.root = profiling.Span(self.name or "task")
+                    self.root.__enter__()
+                next(self.generator)
+
+        except StopIteration:
+            self._finish(DONE)
+            return False
+
+        except Exception as e:
+            self.error = e
+            self._finish(FAILED)
+            return False
+
+        finally:
+            self._stepping = False
+
+        self.steps += 1
+
+        if self._cancelled:
+            self.cancel()
+            return False
+
+        return True
+
+    def _finish(self, state):
+        self.state = state
+        if self.root is not None:
+            with profiling.resume(self._spans):
+                self.root.__exit__()
+        if self.finished is not None:
+            self.finished(self)
+
+
+class Scheduler(object):
+    """
+    Runs tasks in slices from a zero interval QTimer.
+
+    :param slice_ms: milliseconds each slice runs for
+    :type slice_ms: int
+    """
+
+    def __init__(self, slice_ms=DEFAULT_SLICE):
+
+        self.slice_ms = slice_ms
+
+        # (-priority, turn, task), a task gets a new turn after its slice
+        self._queue = []
+        self._turns = itertools.count()
+
+        self._timer = None
+
+    def __len__(self):
+        return len([entry for entry in self._queue
+                    if not entry[2].is_done()])
+
+    def submit(self, generator, priority=0, name=None, finished=None):
+        """
+        Queues a generator job.
+
+        :param generator: job, paused at every yield
+        :type generator: generator
+        :param priority: higher priorities run first
+        :type priority: int
+        :param name: what the job does
+        :type name: str
+        :param finished: called with the task once done, cancelled or
+                         failed
+        :type finished: callable
+
+        :raises: None
+
+        :return: the queued task
+        :rtype: :class:`Task`
+        """
+        task = Task(generator, priority, name, finished)
+        heapq.heappush(self._queue, (-priority, next(self._turns), task))
+        self._start()
+        return task
+
+    def run_slice(self):
+        """
+        Runs the highest priority task for one slice.
+
+        :return: whether tasks are left
+        :rtype: bool
+        """
+        while self._queue and self._queue[0][2].is_done():
+            heapq.heappop(self._queue)
+
+        if not self._queue:
+            return False
+
+        priority, _, task = heapq.heappop(self._queue)
+        end = time.time() + self.slice_ms / 1000.0
+
+        while task.step():
+            if time.time() >= end:
+                heapq.heappush(
+                    self._queue, (priority, next(self._turns), task))
+                break
+
+        return bool(self._queue)
+
+    def run(self):
+        """Runs every task to the end, without giving control back"""
+        while self.run_slice():
+            pass
+
+    def _start(self):
+        if self._timer is None:
+            self._timer = QtCore.QTimer()
+            self._timer.setInterval(0)
+            self._timer.timeout.connect(self._tick)
+
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def _tick(self):
+        if not self.run_slice():
+            self._timer.stop()
+
+
+#: Scheduler of the ui.
+scheduler = Scheduler()
@@ -5,12 +5,33 @@ from __future__ import division
 import os
 from functools import partial
 
+from maya.api import OpenMaya
+
+from UVRatio import profiling
+from UVRatio import report
+from UVRatio.ui import jobs
 from UVRatio.ui import models
+from UVRatio.ui.scheduler import scheduler, DONE, FAILED
 from UVRatio.packages.Qt import QtWidgets, QtCore
 
 this_package = os.path.abspath(os.path.dirname(__file__))
 this_path = partial(os.path.join, this_package)
 
+# texture resolutions offered for texel densities
+RESOLUTIONS = ("256", "512", "1024", "2048", "4096", "8192")
+
+# shells listed in the table, worst offenders first
+MAX_SHELL_ROWS = 500
+SHELL_COLUMNS = ("Object", "Shell", "Faces", "World Area", "UV Area",
+                 "Ratio", "Center")
+
+#: Milliseconds the selection must stay put before the live ratio is
+#: measured, rapid changes only measure the last selection.
+LIVE_DELAY = 25
+
+#: Live measurements give way to the jobs of the buttons.
+LIVE_PRIORITY = -1
+
 
 class UI(QtWidgets.QDialog):
     """
@@ -23,7 +44,7 @@ class UI(QtWidgets.QDialog):
         # Set window
         self.setWindowTitle("UVRatio")
         self.setObjectName("UVRatio")
-        self.resize(600, 150)
+        self.resize(600, 400)
 
         # Grab stylesheet
         with open(this_path("style.css")) as f:
@@ -41,6 +62,9 @@ class UI(QtWidgets.QDialog):
 
         self.source_node = None
         self.dest_node = None
+        self.job = None
+        self.live_callback = None
+        self.live_task = None
 
         self.create_layout()
         self.create_connections()
@@ -73,8 +97,110 @@ class UI(QtWidgets.QDialog):
         self.dest_lnedt.setEnabled(False)
         self.dest_btn = QtWidgets.QPushButton("<<")
 
+        self.live_chk = QtWidgets.QCheckBox("Live ratio")
+        self.live_lbl = QtWidgets.QLabel("")
+        self.live_timer = QtCore.QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_DELAY)
+
+        self.live_layout = QtWidgets.QHBoxLayout()
+        self.live_layout.addWidget(self.live_chk)
+        self.live_layout.addWidget(self.live_lbl)
+        self.live_layout.addStretch()
+
+        self.batch_chk = QtWidgets.QCheckBox(
+            "Match each destination mesh separately")
+        self.tolerance_lbl = QtWidgets.QLabel("Tolerance")
+        self.tolerance_spn = QtWidgets.QDoubleSpinBox()
+        self.tolerance_spn.setDecimals(4)
+        self.tolerance_spn.setRange(0.0, 1.0)
+        self.tolerance_spn.setSingleStep(0.001)
+        self.tolerance_spn.setValue(models.DEFAULT_TOLERANCE)
+        self.tolerance_spn.setEnabled(False)
+
+        self.batch_layout = QtWidgets.QHBoxLayout()
+        self.batch_layout.addWidget(self.batch_chk)
+        self.batch_layout.addStretch()
+        self.batch_layout.addWidget(self.tolerance_lbl)
+        self.batch_layout.addWidget(self.tolerance_spn)
+
+        self.density_chk = QtWidgets.QCheckBox("Target texel density")
+        self.density_spn = QtWidgets.QDoubleSpinBox()
+        self.density_spn.setRange(0.001, 1000000.0)
+        self.density_spn.setDecimals(3)
+        self.density_spn.setValue(512.0)
+        self.unit_cmb = QtWidgets.QComboBox()
+        self.unit_cmb.addItems(list(models.LINEAR_UNITS))
+        self.unit_cmb.setCurrentIndex(list(models.LINEAR_UNITS).index("m"))
+        self.resolution_lbl = QtWidgets.QLabel("at")
+        self.resolution_cmb = QtWidgets.QComboBox()
+        self.resolution_cmb.setEditable(True)
+        self.resolution_cmb.addItems(RESOLUTIONS)
+        self.resolution_cmb.setCurrentIndex(RESOLUTIONS.index("2048"))
+        self.dry_run_btn = QtWidgets.QPushButton("Dry Run")
+
+        self.density_layout = QtWidgets.QHBoxLayout()
+        self.density_layout.addWidget(self.density_chk)
+        self.density_layout.addStretch()
+        self.density_layout.addWidget(self.density_spn)
+        self.density_layout.addWidget(QtWidgets.QLabel("px per"))
+        self.density_layout.addWidget(self.unit_cmb)
+        self.density_layout.addWidget(self.resolution_lbl)
+        self.density_layout.addWidget(self.resolution_cmb)
+        self.density_layout.addWidget(self.dry_run_btn)
+
         self.doit_btn = QtWidgets.QPushButton("Match UV Ratio")
         self.doit_btn.setMinimumHeight(40)
+        self.status_lbl = QtWidgets.QLabel("")
+        self.report_btn = QtWidgets.QPushButton("Export Report...")
+
+        self.progress_bar = QtWidgets.QProgressBar()
+        self.progress_bar.setVisible(False)
+        self.cancel_btn = QtWidgets.QPushButton("Cancel")
+        self.cancel_btn.setVisible(False)
+
+        self.status_layout = QtWidgets.QHBoxLayout()
+        self.status_layout.addWidget(self.status_lbl)
+        self.status_layout.addWidget(self.progress_bar)
+        self.status_layout.addWidget(self.cancel_btn)
+        self.status_layout.addStretch()
+        self.status_layout.addWidget(self.report_btn)
+
+        self.shells_lbl = QtWidgets.QLabel("Shells")
+        self.shells_tbl = QtWidgets.QTableWidget(0, len(SHELL_COLUMNS))
+        self.shells_tbl.setHorizontalHeaderLabels(SHELL_COLUMNS)
+        self.shells_tbl.setEditTriggers(
+            QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.shells_tbl.verticalHeader().setVisible(False)
+
+        # collapsed performance panel, breakdown of the last operation
+        self.perf_btn = QtWidgets.QToolButton()
+        self.perf_btn.setText("Performance")
+        self.perf_btn.setCheckable(True)
+        self.perf_btn.setToolButtonStyle(QtCore.Qt.ToolButtonTextBesideIcon)
+        self.perf_btn.setArrowType(QtCore.Qt.RightArrow)
+
+        self.spans_chk = QtWidgets.QCheckBox("Time operations")
+        self.capture_chk = QtWidgets.QCheckBox("Capture profile to")
+        self.capture_lnedt = QtWidgets.QLineEdit("")
+        self.capture_btn = QtWidgets.QPushButton("...")
+        self.memory_chk = QtWidgets.QCheckBox("Trace memory")
+        self.spans_txt = QtWidgets.QPlainTextEdit()
+        self.spans_txt.setReadOnly(True)
+
+        self.capture_layout = QtWidgets.QHBoxLayout()
+        self.capture_layout.addWidget(self.spans_chk)
+        self.capture_layout.addWidget(self.capture_chk)
+        self.capture_layout.addWidget(self.capture_lnedt)
+        self.capture_layout.addWidget(self.capture_btn)
+        self.capture_layout.addWidget(self.memory_chk)
+
+        self.perf_wdg = QtWidgets.QWidget()
+        self.perf_layout = QtWidgets.QVBoxLayout(self.perf_wdg)
+        self.perf_layout.setContentsMargins(0, 0, 0, 0)
+        self.perf_layout.addLayout(self.capture_layout)
+        self.perf_layout.addWidget(self.spans_txt)
+        self.perf_wdg.setVisible(False)
 
         self.grid_layout = QtWidgets.QGridLayout()
         self.grid_layout.addWidget(self.source_lbl, 0, 0, QtCore.Qt.AlignRight)
@@ -85,7 +211,15 @@ class UI(QtWidgets.QDialog):
         self.grid_layout.addWidget(self.dest_btn, 1, 2)
 
         self.layout.addLayout(self.grid_layout)
+        self.layout.addLayout(self.live_layout)
+        self.layout.addLayout(self.batch_layout)
+        self.layout.addLayout(self.density_layout)
         self.layout.addWidget(self.doit_btn)
+        self.layout.addLayout(self.status_layout)
+        self.layout.addWidget(self.shells_lbl)
+        self.layout.addWidget(self.shells_tbl)
+        self.layout.addWidget(self.perf_btn)
+        self.layout.addWidget(self.perf_wdg)
 
     def create_connections(self):
         """
@@ -102,8 +236,38 @@ class UI(QtWidgets.QDialog):
         self.dest_btn.clicked.connect(
             self.add_destination)
 
+        self.cancel_btn.clicked.connect(
+            self.cancel_job)
+
         self.doit_btn.clicked.connect(
-            self.copy_uv_ratio)
+            partial(self.run_operation, self.copy_uv_ratio))
+
+        self.live_chk.toggled.connect(
+            self.toggle_live)
+
+        self.live_timer.timeout.connect(
+            self.show_live_ratio)
+
+        self.batch_chk.toggled.connect(
+            self.update_tolerance)
+
+        self.density_chk.toggled.connect(
+            self.update_tolerance)
+
+        self.dry_run_btn.clicked.connect(
+            self.dry_run_density)
+
+        self.report_btn.clicked.connect(
+            self.export_report)
+
+        self.perf_btn.toggled.connect(
+            self.toggle_performance)
+
+        self.spans_chk.toggled.connect(
+            profiling.enable)
+
+        self.capture_btn.clicked.connect(
+            self.browse_capture)
 
     def create_tooltips(self):
         """
@@ -114,23 +278,228 @@ class UI(QtWidgets.QDialog):
         :return: None
         :rtype: NoneType
         """
-        pass
+        self.live_chk.setToolTip(
+            "Show the ratio of the selection whenever it changes, meshes "
+            "measured before show at once, new ones are estimated first.")
+        self.batch_chk.setToolTip(
+            "Measure and rescale every destination mesh on its own, "
+            "in a single undo chunk.")
+        self.tolerance_spn.setToolTip(
+            "Meshes whose ratio is already this close to the source "
+            "ratio are skipped.")
+        self.density_chk.setToolTip(
+            "Match UV Ratio scales every destination mesh to this texel "
+            "density instead of the source ratio, no source needed.")
+        self.dry_run_btn.setToolTip(
+            "List the scale every destination mesh would get at this "
+            "density, without touching uvs.")
+        self.report_btn.setToolTip(
+            "Write the texel density of the source and destination meshes, "
+            "per object and per face, to a JSON or CSV file.")
+        self.spans_chk.setToolTip(
+            "Time selection parsing, measuring and resizing, and show the "
+            "breakdown of the last operation below.")
+        self.capture_chk.setToolTip(
+            "Run every operation under cProfile and write the statistics "
+            "of the last one to this file.")
+        self.memory_chk.setToolTip(
+            "Also trace allocations with tracemalloc while capturing, "
+            "operations run a lot slower.")
+
+    def run_operation(self, operation, *args):
+        """
+        Runs a button's operation, under a profile capture if asked, and
+        shows its timing breakdown.
+
+        :param operation: method of the button
+        :type operation: callable
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        capture = self.get_capture()
+
+        if capture is not None:
+            path, memory = capture
+            with profiling.capture(path, memory=memory) as captured:
+                operation()
+                # jobs the operation queued are part of it
+                scheduler.run()
+            self.show_spans(captured.root)
+        else:
+            with profiling.span(operation.__name__) as root:
+                operation()
+            self.show_spans(root)
+
+    def get_capture(self):
+        """
+        Profile capture asked for in the performance panel.
+
+        :return: (path, memory) of the capture, None if not asked for
+        :rtype: tuple
+        """
+        path = self.capture_lnedt.text()
+        if not self.capture_chk.isChecked() or not path:
+            return None
+        return path, self.memory_chk.isChecked()
+
+    def show_spans(self, root):
+        """
+        Shows the timing breakdown of an operation.
+
+        :param root: top level span of the operation, nothing is shown
+                     for None or while spans were off
+        :type root: :class:`profiling.Span`
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        if isinstance(root, profiling.Span):
+            self.spans_txt.setPlainText(profiling.format_span(root))
+
+    def toggle_performance(self, expanded):
+        """Shows or collapses the performance panel"""
+        self.perf_wdg.setVisible(expanded)
+        self.perf_btn.setArrowType(
+            QtCore.Qt.DownArrow if expanded else QtCore.Qt.RightArrow)
+
+    def browse_capture(self):
+        """Picks the file profile captures are written to"""
+        path = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Profile Capture", "", "Text (*.txt)")[0]
+        if path:
+            self.capture_lnedt.setText(path)
+            self.capture_chk.setChecked(True)
+
+    def measure(self, done):
+        """
+        Measures the selection on a job, with progress and cancel shown
+        in the status bar.
+
+        The bulk engine measures on a thread, the iterator engine only
+        calls Maya so it runs in slices on the scheduler instead.
+
+        :param done: called with the measured mesh
+        :type done: callable
+
+        :raises: ``RuntimeError`` if a job is running, or if nothing is
+                 selected
+
+        :return: None
+        :rtype: NoneType
+        """
+        if self.job is not None:
+            raise RuntimeError("Wait for the running job to finish!")
+
+        if models.DEFAULT_ENGINE != "bulk":
+            mesh = models.Mesh(measure=False, progress=self.show_progress)
+            self.run_task(mesh.iter_measure(), "Measuring...",
+                          partial(done, mesh))
+            return
+
+        self.job = jobs.MeasureJob(capture=self.get_capture())
+        self.job.progressed.connect(self.show_progress)
+        self.job.measured.connect(done)
+        self.job.failed.connect(self.status_lbl.setText)
+        self.job.cancelled.connect(
+            partial(self.status_lbl.setText, "Measurement cancelled"))
+        self.job.finished.connect(self.job_finished)
+
+        self.set_busy("Measuring...")
+        self.job.start()
+
+    def run_task(self, generator, message, done):
+        """
+        Runs a generator job on the scheduler, with cancel shown in the
+        status bar.
+
+        :param generator: job, paused at every yield
+        :type generator: generator
+        :param message: status while it runs
+        :type message: str
+        :param done: called once the job completed
+        :type done: callable
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        def finished(task):
+            if task.state == DONE:
+                done()
+            elif task.state == FAILED:
+                self.status_lbl.setText(str(task.error))
+            else:
+                self.status_lbl.setText("Cancelled")
+            self.job_finished()
+
+        self.set_busy(message)
+        self.job = scheduler.submit(generator, name=message,
+                                    finished=finished)
+
+    def set_busy(self, message):
+        """Shows a job running, and keeps other jobs from starting"""
+        for widget in (self.source_btn, self.dest_btn, self.doit_btn,
+                       self.dry_run_btn):
+            widget.setEnabled(False)
+
+        # busy until the job reports progress
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setVisible(True)
+        self.cancel_btn.setVisible(True)
+        self.status_lbl.setText(message)
+
+    def show_progress(self, done, total):
+        self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(done)
+
+    def cancel_job(self):
+        if self.job is not None:
+            self.job.cancel()
+
+    def job_finished(self):
+        """Puts the ui back once a job ended, however it ended"""
+        root = self.job.root if self.job is not None else None
+        self.job = None
+
+        for widget in (self.source_btn, self.dest_btn, self.doit_btn,
+                       self.dry_run_btn):
+            widget.setEnabled(True)
+        self.progress_bar.setVisible(False)
+        self.cancel_btn.setVisible(False)
+
+        # a cancelled resize still scaled some shapes
+        if self.dest_node:
+            self.show_destination_ratio()
+
+        self.show_spans(root)
 
     def add_source(self):
+        self.measure(self.set_source)
+
+    def add_destination(self):
+        self.measure(self.set_destination)
 
-        # get mesh
-        self.source_node = models.Mesh()
+    def set_source(self, mesh):
+        """Shows a measured source mesh"""
+        self.source_node = mesh
         self.source_ratio = self.source_node.ratio
 
         self.source_lnedt.setText("{0} ({1} faces total)".format(
             " ".join(self.source_node.transforms),
             sum(self.source_node.counts)))
         self.source_lbl.setText("Source ({0:.3f})".format(self.source_ratio))
+        self.show_shells(self.source_node)
+        self.show_dedup(self.source_node)
 
-    def add_destination(self):
-
-        # get mesh
-        self.dest_node = models.Mesh()
+    def set_destination(self, mesh):
+        """Shows a measured destination mesh"""
+        self.dest_node = mesh
         self.dest_ratio = self.dest_node.ratio
 
         self.dest_lnedt.setText("{0} ({1} faces total)".format(
@@ -138,16 +507,309 @@ class UI(QtWidgets.QDialog):
             sum(self.dest_node.counts)))
 
         self.dest_lbl.setText("Destination ({0:.3f})".format(self.dest_ratio))
+        self.show_shells(self.dest_node)
+        self.show_dedup(self.dest_node)
+
+    def show_shells(self, mesh):
+        """
+        Lists the uv shells of a mesh, furthest from its ratio first.
+
+        :param mesh: measured mesh
+        :type mesh: :class:`models.Mesh`
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        rows = []
+        total = 0
+
+        for transform, shells in zip(mesh.transforms, mesh.shells):
+            if shells is None:
+                continue
+
+            total += len(shells)
+            ratios = shells.ratios
+            order = (-abs(ratios - mesh.ratio)).argsort()
+
+            for shell in order[:MAX_SHELL_ROWS]:
+                rows.append((abs(ratios[shell] - mesh.ratio), (
+                    transform,
+                    str(shell),
+                    str(shells.face_counts[shell]),
+                    "{0:.3f}".format(shells.world_areas[shell]),
+                    "{0:.5f}".format(shells.uv_areas[shell]),
+                    "{0:.3f}".format(ratios[shell]),
+                    "{0:.3f}, {1:.3f}".format(*shells.centers[shell]))))
+
+        rows.sort(key=lambda row: row[0], reverse=True)
+        rows = rows[:MAX_SHELL_ROWS]
+
+        self.shells_lbl.setText("Shells ({0} of {1} listed)".format(
+            len(rows), total))
+        self.shells_tbl.setRowCount(len(rows))
+
+        for row, (_, values) in enumerate(rows):
+            for column, value in enumerate(values):
+                self.shells_tbl.setItem(
+                    row, column, QtWidgets.QTableWidgetItem(value))
+
+    def show_dedup(self, mesh):
+        """
+        Reports the work saved by measuring instanced shapes once.
+
+        :param mesh: measured mesh
+        :type mesh: :class:`models.Mesh`
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        stats = mesh.dedup_stats
+        self.status_lbl.setText(
+            "{paths} paths, {shapes} shapes read, {reads_saved} reads and "
+            "{matmuls_saved} matmuls saved by instancing".format(**stats))
+
+    def toggle_live(self, enabled):
+        """
+        Follows the selection with a live ratio, or stops following it.
+
+        :param enabled: whether to follow the selection
+        :type enabled: bool
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        if enabled and self.live_callback is None:
+            self.live_callback = OpenMaya.MEventMessage.addEventCallback(
+                "SelectionChanged", self.selection_changed)
+            self.show_live_ratio()
+
+        elif not enabled and self.live_callback is not None:
+            OpenMaya.MMessage.removeCallback(self.live_callback)
+            self.live_callback = None
+            self.live_timer.stop()
+            self.cancel_live()
+            self.live_lbl.setText("")
+
+    def selection_changed(self, *args):
+        """Measures the selection once it stopped changing"""
+        self.live_timer.start()
+
+    def show_live_ratio(self):
+        """
+        Shows the ratio of the selection.
+
+        Meshes measured before are summed from the cache right away, new
+        ones are estimated from random faces on the scheduler, then
+        measured so they are cached for the next time.
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        self.cancel_live()
+
+        try:
+            mesh = models.Mesh(measure=False)
+
+            if mesh.is_cached():
+                for _ in mesh.iter_measure():
+                    pass
+                self.live_lbl.setText(
+                    "Selection ({0:.3f})".format(mesh.ratio))
+                return
+
+        except RuntimeError as e:
+            self.live_lbl.setText(str(e))
+            return
+
+        self.live_lbl.setText("Selection (measuring...)")
+        self.live_task = scheduler.submit(
+            self.iter_live(mesh), priority=LIVE_PRIORITY, name="Live ratio",
+            finished=self.live_finished)
+
+    def iter_live(self, mesh):
+        """Estimates, then measures, a new selection as a generator job"""
+        for _ in mesh.iter_estimate():
+            if mesh.estimate is not None:
+                self.live_lbl.setText(
+                    "Selection (~{0:.3f}, {1} faces sampled)".format(
+                        mesh.estimate, mesh.sampled))
+            yield
+
+        for _ in mesh.iter_measure():
+            yield
+
+        self.live_lbl.setText("Selection ({0:.3f})".format(mesh.ratio))
+
+    def live_finished(self, task):
+        if task.state == FAILED:
+            self.live_lbl.setText(str(task.error))
+
+        if task is self.live_task:
+            self.live_task = None
+
+    def cancel_live(self):
+        if self.live_task is not None:
+            self.live_task.cancel()
+
+    def update_tolerance(self, *args):
+        """Tolerance applies to batches and densities only"""
+        self.tolerance_spn.setEnabled(
+            self.batch_chk.isChecked() or self.density_chk.isChecked())
+
+    def get_density(self):
+        """
+        Texel density asked for.
+
+        :raises: ``RuntimeError`` if the resolution isn't a number
+
+        :return: pixels, resolution and unit
+        :rtype: tuple
+        """
+        try:
+            resolution = int(self.resolution_cmb.currentText())
+        except ValueError:
+            raise RuntimeError("Texture resolution must be a number!")
+
+        return (self.density_spn.value(), resolution,
+                self.unit_cmb.currentText())
+
+    def match_density(self, done, dry_run=False):
+        """
+        Scales every destination mesh to the texel density asked for, as
+        a job on the scheduler.
+
+        :param done: called with the :class:`models.BatchResult` once
+                     the job completed
+        :type done: callable
+        :param dry_run: only work out the scale each mesh would get
+        :type dry_run: bool
+
+        :raises: ``RuntimeError`` if there is no destination, or for an
+                 unknown unit
+
+        :return: None
+        :rtype: NoneType
+        """
+        if not self.dest_node:
+            raise RuntimeError("Destination meshes needed!")
+
+        density, resolution, unit = self.get_density()
+        self.run_batch(models.BatchResult(
+            models.density_to_ratio(density, resolution, unit),
+            dry_run=dry_run), done)
+
+    def run_batch(self, result, done):
+        """
+        Measures the destination meshes as a job on the scheduler, then
+        scales each of them to the ratio of a batch in one step once it
+        completed, so the undo chunk is never left open between slices.
+
+        :param result: batch to fill in
+        :type result: :class:`models.BatchResult`
+        :param done: called with the batch once the job completed
+        :type done: callable
+
+        :raises: None
+
+        :return: None
+        :rtype: NoneType
+        """
+        generator = models.iter_match(
+            result, selection=self.dest_node.selection,
+            tolerance=self.tolerance_spn.value())
+        def measured():
+            try:
+                models.apply_match(result)
+            except RuntimeError as e:
+                self.status_lbl.setText(str(e))
+                return
+            done(result)
+
+        self.run_task(generator,
+                      "Dry run..." if result.dry_run else "Resizing...",
+                      measured)
+
+    def show_batch(self, result):
+        """Shows the destination a batch measured and rescaled"""
+        self.set_destination(result.mesh)
+        self.status_lbl.setText(str(result))
+
+    def dry_run_density(self):
+        """Lists the scale every destination mesh would get"""
+        self.match_density(self.show_dry_run, dry_run=True)
+
+    def show_dry_run(self, result):
+        """Shows the scale every destination mesh would get"""
+        self.status_lbl.setText(str(result))
+
+        box = QtWidgets.QMessageBox(self)
+        box.setWindowTitle("Dry Run")
+        box.setText("{0}, target ratio {1:.5f}".format(result, result.ratio))
+        box.setDetailedText(result.describe())
+        box.exec_()
 
     def copy_uv_ratio(self):
         """copy that data"""
+        if self.density_chk.isChecked():
+            self.match_density(self.show_batch)
+            return
+
         if not self.source_node or not self.dest_node:
             raise RuntimeError("Both source and destination meshes needed!")
 
-        self.dest_node.resize(self.source_node.ratio)
+        if self.batch_chk.isChecked():
+            self.run_batch(models.BatchResult(self.source_node.ratio),
+                           self.show_batch)
+        else:
+            self.dest_node.resize(self.source_node.ratio)
+            self.show_destination_ratio()
+
+    def show_destination_ratio(self):
         self.dest_lbl.setText(
             "Destination ({0:.3f})".format(self.dest_node.ratio))
 
+    def export_report(self):
+        """
+        Writes the report of the source and destination meshes.
+
+        Faces are compared to the source ratio when there is a source.
+
+        :raises: ``RuntimeError`` if no mesh was added
+
+        :return: None
+        :rtype: NoneType
+        """
+        meshes = [mesh for mesh in (self.source_node, self.dest_node) if mesh]
+        if not meshes:
+            raise RuntimeError("Add a source or destination mesh first!")
+
+        path = QtWidgets.QFileDialog.getSaveFileName(
+            self, "Export Report", "", "JSON (*.json);;CSV (*.csv)")[0]
+        if not path:
+            return
+
+        reference = None
+        if self.source_node:
+            reference = self.source_node.ratio
+
+        written = report.write(meshes, path, reference=reference)
+        self.status_lbl.setText("{0} objects, {1} faces written to {2}".format(
+            written.objects, written.faces, os.path.basename(path)))
+
+    def closeEvent(self, event):
+        # the callback would outlive the deleted dialog
+        self.toggle_live(False)
+        self.cancel_job()
+        super(UI, self).closeEvent(event)
+
     def keyPressEvent(self, event):
         '''
         Override key focus issue.
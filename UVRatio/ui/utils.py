@@ -1,5 +1,3 @@
-import time
-
 from UVRatio.packages.Qt import QtWidgets, QtCore
 
 
@@ -24,15 +22,14 @@ def wait(delay=1):
     """
     Delay python execution for a specified amount of time
 
+    Qt events, and scheduler slices, keep being processed meanwhile,
+    without spinning the cpu.
+
     :raises: None
 
     :return: None
     :rtype: NoneType
     """
-    s = time.clock()
-
-    while True:
-        if time.clock() - s >= delay:
-            return
-
-        QtWidgets.QApplication.instance().processEvents()
+    loop = QtCore.QEventLoop()
+    QtCore.QTimer.singleShot(int(delay * 1000), loop.quit)
+    loop.exec_()
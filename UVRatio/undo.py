@@ -0,0 +1,114 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Undo support for edits made straight through the Maya API.
+
+API calls such as ``MFnMesh.setUVs`` are not recorded by Maya's undo
+queue. :func:`commit` hands a pair of callables to the ``uvRatioUndo``
+command of the bundled plugin, which puts them on the queue.
+:func:`scale_uvs` scales uvs with its ``uvRatioScale`` command, which
+only keeps the ids and old positions of the uvs it scaled.
+"""
+import os
+
+from UVRatio.utils import LazyModule
+
+cmds = LazyModule("maya.cmds")
+
+PLUGIN_NAME = "uvRatio"
+PLUGIN_PATH = os.path.join(
+    os.path.abspath(os.path.dirname(__file__)), "plugins", "uvRatio.py")
+
+# undo and redo callables waiting for the command to pick them up
+_pending = []
+
+# uv ids waiting for uvRatioScale to pick them up
+_uv_ids = []
+
+
+def ensure_plugin():
+    """
+    Loads the bundled plugin if it isn't loaded yet.
+
+    :raises: None
+
+    :return: None
+    :rtype: NoneType
+    """
+    if not cmds.pluginInfo(PLUGIN_NAME, query=True, loaded=True):
+        cmds.loadPlugin(PLUGIN_PATH, quiet=True)
+
+
+def commit(undo, redo):
+    """
+    Records an edit that was already done on the undo queue.
+
+    :param undo: reverts the edit
+    :type undo: callable
+    :param redo: does the edit again
+    :type redo: callable
+
+    :raises: None
+
+    :return: None
+    :rtype: NoneType
+    """
+    ensure_plugin()
+    _pending.append((undo, redo))
+    cmds.uvRatioUndo()
+
+
+def pop():
+    """Takes the callables of the last :func:`commit`"""
+    return _pending.pop()
+
+
+def scale_uvs(shape, uv_ids, scale, pivot, uv_set=None, history=False):
+    """
+    Scales uvs of a shape around a pivot with the ``uvRatioScale``
+    command, one step on the undo queue.
+
+    :param shape: full path of the mesh shape
+    :type shape: str
+    :param uv_ids: ids of the uvs to scale
+    :type uv_ids: numpy.ndarray
+    :param scale: scale of u and v
+    :type scale: float
+    :param pivot: u and v scaled around
+    :type pivot: list
+    :param uv_set: uv set, the current one if None
+    :type uv_set: str
+    :param history: scale with a polyTweakUV node rather than writing
+                    the uvs to the shape
+    :type history: bool
+
+    :raises: ``RuntimeError`` if the command fails
+
+    :return: None
+    :rtype: NoneType
+    """
+    ensure_plugin()
+
+    kwargs = {"scale": scale, "pivotU": pivot[0], "pivotV": pivot[1],
+              "constructionHistory": history}
+    if uv_set:
+        kwargs["uvSetName"] = uv_set
+
+    _uv_ids.append(uv_ids)
+    try:
+        cmds.uvRatioScale(shape, **kwargs)
+    finally:
+        # left over if the command failed before taking them
+        del _uv_ids[:]
+
+
+def pop_uv_ids():
+    """
+    Takes the uv ids of the running :func:`scale_uvs`.
+
+    :return: uv ids, None when the command was run on its own
+    :rtype: numpy.ndarray or NoneType
+    """
+    if not _uv_ids:
+        return None
+    return _uv_ids.pop()
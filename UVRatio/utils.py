@@ -1,6 +1,33 @@
 #!/usr/bin/python
 # -*- coding: utf-8 -*-
-from UVRatio.packages.Qt import QtWidgets
+"""
+Entry points of the package, kept free of Qt and Maya imports so that
+``import UVRatio`` stays cheap where neither is around.
+"""
+import importlib
+
+__all__ = ["show"]
+
+
+class LazyModule(object):
+    """
+    Module imported the first time one of its attributes is used.
+
+    :param name: module to import, such as ``maya.cmds``
+    :type name: str
+    """
+
+    def __init__(self, name):
+        self.__name = name
+        self.__module = None
+
+    def __getattr__(self, attr):
+        if self.__module is None:
+            self.__module = importlib.import_module(self.__name)
+        return getattr(self.__module, attr)
+
+    def __repr__(self):
+        return "LazyModule({0!r})".format(self.__name)
 
 
 def show():
@@ -12,6 +39,7 @@ def show():
     :return: None
     :rtype: NoneType
     """
+    from UVRatio.packages.Qt import QtWidgets
     from UVRatio.ui.ui import UI
     from UVRatio.ui import utils
 
@@ -0,0 +1,92 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Times cold imports of UVRatio modules, each in a fresh interpreter, one
+JSON line per module::
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --modules UVRatio --limit-ms 5
+
+Each line has the median ``milliseconds`` over ``--runs`` interpreters
+and the heavy modules, Qt bindings and Maya, the import pulled in. With
+``--limit-ms`` it exits with 1 when the package import is slower, or
+pulls in any of them.
+"""
+from __future__ import division
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+this_dir = os.path.dirname(os.path.abspath(__file__))
+root = os.path.dirname(this_dir)
+
+DEFAULT_MODULES = ["UVRatio", "UVRatio.core", "UVRatio.obj",
+                   "UVRatio.report", "UVRatio.ui.models"]
+
+#: Modules ``import UVRatio`` must not load.
+HEAVY = ["UVRatio.packages.Qt", "PySide2", "PySide6", "PyQt5", "PyQt4",
+         "PySide", "maya", "maya.cmds", "maya.api.OpenMaya"]
+
+_SCRIPT = """
+import json, sys, time
+sys.path.insert(0, {root!r})
+start = time.time()
+import {module}
+elapsed = time.time() - start
+print(json.dumps([elapsed, [name for name in {heavy!r}
+                            if name in sys.modules]]))
+"""
+
+
+def time_import(module, runs=5, executable=None):
+    """
+    Imports a module in fresh interpreters.
+
+    :return: median seconds and the heavy modules it loaded
+    :rtype: tuple
+    """
+    script = _SCRIPT.format(root=root, module=module, heavy=HEAVY)
+
+    times = []
+    loaded = []
+    for _ in range(runs):
+        output = subprocess.check_output(
+            [executable or sys.executable, "-c", script])
+        elapsed, loaded = json.loads(output.decode().strip().splitlines()[-1])
+        times.append(elapsed)
+
+    times.sort()
+    return times[len(times) // 2], loaded
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Times cold imports of UVRatio modules.")
+    parser.add_argument("--modules", nargs="+", default=DEFAULT_MODULES)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--executable", default=None,
+                        help="interpreter to time, this one by default")
+    parser.add_argument("--limit-ms", type=float, default=None,
+                        help="fail when importing UVRatio takes longer")
+    args = parser.parse_args()
+
+    failed = False
+
+    for module in args.modules:
+        seconds, loaded = time_import(module, args.runs, args.executable)
+        sys.stdout.write(json.dumps({
+            "module": module, "milliseconds": seconds * 1000.0,
+            "heavy": loaded}, sort_keys=True) + "\n")
+
+        if module == "UVRatio" and args.limit_ms is not None:
+            failed = failed or loaded or seconds * 1000.0 > args.limit_ms
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Memory a measured ``Mesh`` keeps, per uv, on synthetic meshes of growing
+size. Runs on the stand-in of :mod:`UVRatio.standin`, numpy only::
+
+    python benchmarks/memory.py --faces 10000 100000 1000000
+    python benchmarks/memory.py --root ../UVRatio-old
+
+Each JSON line has the ``retained_bytes`` Python and numpy hold for the
+mesh once it is measured, the ``peak_bytes`` while measuring, and
+``bytes_per_uv`` over the uvs measured. ``--root`` measures another
+checkout, to compare before and after a change.
+"""
+from __future__ import division
+
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+this_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, this_dir)
+
+import meshes  # noqa: E402
+
+DEFAULT_FACES = [10000, 100000, 1000000]
+
+#: Faces over which the iterator engine is skipped unless asked for.
+PER_FACE_LIMIT = 100000
+
+
+def bench(engine, precision):
+    """
+    Measures the selected mesh under tracemalloc.
+
+    :return: retained and peak bytes, and the uvs measured
+    :rtype: dict
+    """
+    from UVRatio.ui import models
+
+    kwargs = {"engine": engine, "use_cache": False}
+    if precision is not None:
+        kwargs["precision"] = precision
+
+    gc.collect()
+    tracemalloc.start()
+
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        mesh = models.Mesh(**kwargs)
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    uvs = sum(len(indexes) for indexes in mesh.uv_indexes)
+
+    return {"engine": engine, "precision": precision or "double",
+            "uvs": uvs, "retained_bytes": retained - before,
+            "peak_bytes": peak - before,
+            "bytes_per_uv": (retained - before) / max(uvs, 1)}
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Memory a measured Mesh keeps per uv.")
+    parser.add_argument("--faces", type=int, nargs="+", default=DEFAULT_FACES)
+    parser.add_argument("--mesh", default="grid", choices=meshes.GENERATORS)
+    parser.add_argument("--layout", default="jittered",
+                        choices=meshes.LAYOUTS)
+    parser.add_argument("--per-face-limit", type=int, default=PER_FACE_LIMIT,
+                        help="faces over which the iterator engine is "
+                             "skipped")
+    parser.add_argument("--root", default=os.path.dirname(this_dir),
+                        help="checkout of UVRatio to measure")
+    args = parser.parse_args()
+
+    sys.path.insert(0, os.path.abspath(args.root))
+
+    from UVRatio import standin
+    standin.install()
+
+    from maya import cmds
+    from UVRatio.ui import models
+
+    # checkouts from before precisions measure in double only
+    precisions = getattr(models, "PRECISIONS", [None])
+
+    for faces in args.faces:
+
+        cmds.file(new=True, force=True)
+        mesh = meshes.generate(args.mesh, faces, args.layout)
+        cmds.select(standin.scene.create_mesh(*mesh))
+        count = len(mesh[1])
+
+        for engine in models.ENGINES:
+
+            if engine == "iterator" and count > args.per_face_limit:
+                continue
+
+            for precision in precisions:
+                result = bench(engine, precision)
+                result.update({"mesh": args.mesh, "layout": args.layout,
+                               "faces": count})
+                sys.stdout.write(json.dumps(result, sort_keys=True) + "\n")
+                sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
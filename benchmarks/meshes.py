@@ -0,0 +1,135 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Synthetic meshes of a given face count, as flat numpy arrays.
+
+Every generator returns ``points, counts, connects, uvs, uv_counts,
+uv_ids`` with one unwrapped uv shell, :func:`layout` then lays the uvs out
+differently.
+"""
+from __future__ import division
+
+import math
+
+import numpy
+
+GENERATORS = ("grid", "cylinder", "ngons")
+LAYOUTS = ("unwrapped", "faces", "jittered")
+
+
+def grid(faces):
+    """Flat square grid of about ``faces`` quads, uvs follow the points"""
+    side = max(1, int(round(math.sqrt(faces))))
+    return _quads(side, side, wrap=False)
+
+
+def cylinder(faces):
+    """
+    Open cylinder of about ``faces`` quads, with a uv seam along it.
+    """
+    around = max(3, int(round(math.sqrt(faces * 2))))
+    rows = max(1, int(round(faces / around)))
+    return _quads(around, rows, wrap=True)
+
+
+def ngons(faces, seed=0):
+    """
+    Separate polygons of 3 to 8 sides with jittered corners, uvs are a
+    planar projection of the points.
+    """
+    random = numpy.random.RandomState(seed)
+
+    counts = random.randint(3, 9, size=faces)
+    offsets = numpy.cumsum(counts) - counts
+    face = numpy.repeat(numpy.arange(faces), counts)
+    corner = numpy.arange(counts.sum()) - offsets[face]
+
+    side = int(math.ceil(math.sqrt(faces)))
+    centers = numpy.column_stack(
+        (numpy.arange(faces) % side, numpy.arange(faces) // side)) * 2.0
+
+    angle = 2.0 * math.pi * corner / counts[face]
+    radius = random.uniform(0.6, 0.9, size=len(face))
+    points = numpy.zeros((len(face), 3))
+    points[:, 0] = centers[face, 0] + radius * numpy.cos(angle)
+    points[:, 1] = centers[face, 1] + radius * numpy.sin(angle)
+    points[:, 2] = random.uniform(-0.1, 0.1, size=len(face))
+
+    connects = numpy.arange(len(face))
+    uvs = points[:, :2] / (2.0 * side)
+
+    return points, counts, connects, uvs, counts.copy(), connects.copy()
+
+
+def layout(mesh, name, seed=0):
+    """
+    Lays out the uvs of a generated mesh.
+
+    ``unwrapped`` keeps the single shell, ``faces`` makes every face its
+    own shell, ``jittered`` also scales and moves every face shell at
+    random, so faces have different texel densities.
+    """
+    points, counts, connects, uvs, uv_counts, uv_ids = mesh
+
+    if name == "unwrapped":
+        return mesh
+
+    uvs = uvs[uv_ids]
+    uv_ids = numpy.arange(len(uvs))
+
+    if name == "jittered":
+        random = numpy.random.RandomState(seed)
+        face = numpy.repeat(numpy.arange(len(uv_counts)), uv_counts)
+        scale = random.uniform(0.5, 2.0, size=len(uv_counts))[face]
+        offset = random.uniform(-0.5, 0.5, size=(len(uv_counts), 2))[face]
+        uvs = uvs * scale[:, None] + offset
+
+    return points, counts, connects, uvs, uv_counts, uv_ids
+
+
+def generate(generator, faces, name="unwrapped", seed=0):
+    """Mesh of ``faces`` faces from a generator, laid out"""
+    if generator == "ngons":
+        mesh = ngons(faces, seed)
+    else:
+        mesh = globals()[generator](faces)
+    return layout(mesh, name, seed)
+
+
+def _quads(columns, rows, wrap):
+    """Quads of a grid, or of a tube when ``wrap`` joins its sides"""
+    point_columns = columns if wrap else columns + 1
+    i, j = numpy.meshgrid(numpy.arange(point_columns),
+                          numpy.arange(rows + 1))
+    i, j = i.ravel(), j.ravel()
+
+    points = numpy.zeros((len(i), 3))
+    if wrap:
+        angle = 2.0 * math.pi * i / columns
+        radius = columns / (2.0 * math.pi)
+        points[:, 0] = radius * numpy.cos(angle)
+        points[:, 1] = j
+        points[:, 2] = radius * numpy.sin(angle)
+    else:
+        points[:, 0] = i
+        points[:, 2] = j
+
+    c, r = numpy.meshgrid(numpy.arange(columns), numpy.arange(rows))
+    c, r = c.ravel(), r.ravel()
+
+    def corners(width, wrap_columns):
+        right = (c + 1) % columns if wrap_columns else c + 1
+        return numpy.column_stack((
+            r * width + c, r * width + right,
+            (r + 1) * width + right, (r + 1) * width + c)).ravel()
+
+    connects = corners(point_columns, wrap)
+
+    # uvs have one more column than a tube's points, it's the seam
+    u, v = numpy.meshgrid(numpy.arange(columns + 1), numpy.arange(rows + 1))
+    uvs = numpy.column_stack((u.ravel(), v.ravel())) / float(
+        max(columns, rows))
+    uv_ids = corners(columns + 1, False)
+
+    counts = numpy.full(columns * rows, 4, dtype=numpy.int64)
+    return points, counts, connects, uvs, counts.copy(), uv_ids
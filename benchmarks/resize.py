@@ -0,0 +1,93 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Compares the write methods of ``Mesh.resize`` on polygon planes.
+
+Run with mayapy from the repository root, one JSON line per run. With
+``--standin`` it runs on the stand-in of :mod:`UVRatio.standin` instead,
+so it needs numpy only::
+
+    mayapy benchmarks/resize.py --faces 10000 100000 1000000
+    python benchmarks/resize.py --standin --faces 10000 100000
+"""
+from __future__ import division
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+
+def bench(faces, method, repeat, maya=True):
+    """
+    Times ``Mesh.resize`` on a plane of about ``faces`` faces.
+
+    :return: best time of the runs and the uvs written
+    :rtype: dict
+    """
+    from maya import cmds
+    from UVRatio.ui import models
+
+    cmds.file(new=True, force=True)
+
+    if maya:
+        side = int(math.ceil(math.sqrt(faces)))
+        faces = side * side
+        cmds.select(cmds.polyPlane(sx=side, sy=side, ch=False)[0])
+    else:
+        import meshes
+        from UVRatio import standin
+
+        mesh = meshes.generate("grid", faces)
+        faces = len(mesh[1])
+        cmds.select(standin.scene.create_mesh(*mesh))
+
+    mesh = models.Mesh()
+    times = []
+
+    for x in range(repeat):
+        ratio = mesh.ratio * (1.1 if x % 2 == 0 else 1 / 1.1)
+        start = time.time()
+        mesh.resize(ratio, method=method)
+        times.append(time.time() - start)
+
+    return {"faces": faces,
+            "method": method,
+            "uvs": sum(len(uv_index) for uv_index in mesh.uv_indexes),
+            "seconds": min(times)}
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Compares the write methods of Mesh.resize.")
+    parser.add_argument("--faces", type=int, nargs="+",
+                        default=[10000, 100000, 1000000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--standin", action="store_true",
+                        help="run on the stand-in instead of maya.standalone")
+    args = parser.parse_args()
+
+    if args.standin:
+        from UVRatio import standin
+        standin.install()
+    else:
+        import maya.standalone
+        maya.standalone.initialize(name="python")
+
+    from UVRatio.ui import models
+
+    for faces in args.faces:
+        for method in models.WRITE_METHODS:
+            sys.stdout.write(json.dumps(
+                bench(faces, method, args.repeat, not args.standin)) + "\n")
+            sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Times ``Mesh`` on synthetic meshes of growing size, one JSON line per run.
+
+Selection parsing, measurement and resizing are timed separately for
+every engine and write method. Without ``--maya`` it runs on the stand-in
+of :mod:`UVRatio.standin`, so it needs numpy only::
+
+    python benchmarks/scaling.py --faces 1000 10000 100000
+    mayapy benchmarks/scaling.py --maya --meshes grid --layouts faces
+
+Each line has the phase, ``seconds``, ``faces_per_second`` and, unless
+``--no-memory``, the ``peak_bytes`` Python allocated during the phase,
+measured in a second run under tracemalloc.
+"""
+from __future__ import division
+
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+this_dir = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(this_dir))
+sys.path.insert(0, this_dir)
+
+import meshes  # noqa: E402
+
+DEFAULT_FACES = [1000, 10000, 100000, 1000000, 10000000]
+
+#: Faces over which the per-face paths, the iterator engine and the
+#: polyEditUV write method, are skipped unless asked for.
+PER_FACE_LIMIT = 100000
+
+
+def bench(engine, methods, memory):
+    """
+    Times the phases of ``Mesh`` on the selected mesh.
+
+    :return: one result per phase
+    :rtype: list
+    """
+    results = []
+
+    for phase, method, run in _phases(engine, methods):
+
+        seconds = _time(run)
+        result = {"phase": phase, "engine": engine, "method": method,
+                  "seconds": seconds}
+
+        if memory:
+            tracemalloc.start()
+            try:
+                run()
+                result["peak_bytes"] = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+
+        results.append(result)
+
+    return results
+
+
+def _phases(engine, methods):
+    """(phase, write method, callable) of every timed phase"""
+    from UVRatio.ui import models
+
+    def parse():
+        # measuring is left to iter_measure, the constructor only parses
+        models.Mesh(engine=engine, measure=False)
+
+    def measure():
+        models.Mesh(engine=engine, use_cache=False)
+
+    phases = [("measure", None, measure), ("parse", None, parse)]
+
+    for method in methods:
+        mesh = models.Mesh(engine=engine, use_cache=False)
+
+        def resize(mesh=mesh, method=method):
+            # back and forth, so repeated runs don't drift
+            mesh.resize(mesh.ratio * 1.1, method=method)
+            mesh.resize(mesh.ratio / 1.1, method=method)
+
+        phases.append(("resize", method, resize))
+
+    return phases
+
+
+def _time(run):
+    start = time.time()
+    run()
+    return time.time() - start
+
+
+def create(mesh, maya):
+    """Adds a generated mesh to the scene, returns its transform"""
+    points, counts, connects, uvs, uv_counts, uv_ids = mesh
+
+    if not maya:
+        from UVRatio import standin
+        return standin.scene.create_mesh(
+            points, counts, connects, uvs, uv_counts, uv_ids)
+
+    from maya.api import OpenMaya
+
+    fn_mesh = OpenMaya.MFnMesh()
+    node = fn_mesh.create(
+        [OpenMaya.MPoint(*p) for p in points.tolist()],
+        counts.tolist(), connects.tolist(),
+        uvs[:, 0].tolist(), uvs[:, 1].tolist())
+    fn_mesh.assignUVs(uv_counts.tolist(), uv_ids.tolist())
+
+    return OpenMaya.MFnDagNode(node).partialPathName()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(
+        description="Times Mesh on synthetic meshes of growing size.")
+    parser.add_argument("--faces", type=int, nargs="+", default=DEFAULT_FACES)
+    parser.add_argument("--meshes", nargs="+", default=list(
+        meshes.GENERATORS), choices=meshes.GENERATORS)
+    parser.add_argument("--layouts", nargs="+", default=list(meshes.LAYOUTS),
+                        choices=meshes.LAYOUTS)
+    parser.add_argument("--engines", nargs="+", default=None)
+    parser.add_argument("--per-face-limit", type=int, default=PER_FACE_LIMIT,
+                        help="faces over which the iterator engine and "
+                             "polyEditUV are skipped")
+    parser.add_argument("--no-memory", action="store_true",
+                        help="skip the tracemalloc runs")
+    parser.add_argument("--maya", action="store_true",
+                        help="run in maya.standalone instead of the stand-in")
+    args = parser.parse_args()
+
+    if args.maya:
+        import maya.standalone
+        maya.standalone.initialize(name="python")
+    else:
+        from UVRatio import standin
+        standin.install()
+
+    from maya import cmds
+    from UVRatio.ui import models
+
+    engines = args.engines or [
+        engine for engine in models.ENGINES
+        if engine != "bulk" or models.numpy is not None]
+
+    for generator in args.meshes:
+        for layout in args.layouts:
+            for faces in args.faces:
+
+                cmds.file(new=True, force=True)
+                mesh = meshes.generate(generator, faces, layout)
+                cmds.select(create(mesh, args.maya))
+                count = len(mesh[1])
+
+                for engine in engines:
+
+                    if engine == "iterator" and count > args.per_face_limit:
+                        continue
+
+                    methods = [
+                        method for method in models.WRITE_METHODS
+                        if method != "polyEditUV" or
+                        count <= args.per_face_limit]
+                    if engine != models.DEFAULT_ENGINE:
+                        methods = []
+
+                    for result in bench(engine, methods,
+                                        not args.no_memory):
+                        result.update({
+                            "mesh": generator, "layout": layout,
+                            "faces": count,
+                            "faces_per_second": count / max(
+                                result["seconds"], 1e-9)})
+                        sys.stdout.write(json.dumps(
+                            result, sort_keys=True) + "\n")
+                        sys.stdout.flush()
+
+
+if __name__ == "__main__":
+    main()
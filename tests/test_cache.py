@@ -0,0 +1,96 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+"""
+Meshes sharing cached measurements, on the stand-in of
+:mod:`UVRatio.standin`, numpy only::
+
+    python -m unittest discover tests
+"""
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+import numpy  # noqa: E402
+
+from UVRatio import standin  # noqa: E402
+
+standin.install()
+
+from maya import cmds  # noqa: E402
+
+from UVRatio import cache  # noqa: E402
+from UVRatio.ui import models  # noqa: E402
+
+
+def create_grid(size=4, name="grid"):
+    """Square grid of quads, uvs laid out over 0-1"""
+    line = numpy.linspace(0.0, 1.0, size + 1)
+    u, v = [axis.ravel() for axis in numpy.meshgrid(line, line)]
+    points = numpy.column_stack((u * 10.0, numpy.zeros_like(u), v * 10.0))
+
+    corners = numpy.arange((size + 1) * size).reshape(size, size + 1)[:, :-1]
+    connects = numpy.stack((corners, corners + 1, corners + size + 2,
+                            corners + size + 1), axis=-1).ravel()
+    counts = numpy.full(size * size, 4)
+
+    return standin.scene.create_mesh(
+        points, counts, connects, numpy.column_stack((u, v)), counts,
+        connects, name=name)
+
+
+class SharedEntryTest(unittest.TestCase):
+
+    def setUp(self):
+        cmds.file(new=True, force=True)
+        cache.measurements.clear()
+        cmds.select(create_grid())
+
+    def assert_consistent(self, mesh, uv_area):
+        """Totals, faces and shells of a mesh all add up to uv_area"""
+        self.assertAlmostEqual(mesh.uv_area, uv_area)
+        self.assertAlmostEqual(mesh.measurements[0].uv_area, uv_area)
+        self.assertAlmostEqual(
+            float(mesh.measurements[0].uv_areas.sum()), uv_area)
+        self.assertAlmostEqual(float(mesh.shells[0].uv_areas.sum()),
+                               uv_area)
+
+    def test_hit_is_a_copy(self):
+        a = models.Mesh(engine="bulk")
+        b = models.Mesh(engine="bulk")
+
+        self.assertEqual(cache.measurements.hits, 1)
+        self.assertIsNot(a.measurements[0], b.measurements[0])
+
+    def test_resize_leaves_other_mesh(self):
+        a = models.Mesh(engine="bulk")
+        b = models.Mesh(engine="bulk")
+
+        b.resize(b.ratio * 2)
+
+        self.assert_consistent(a, 1.0)
+        self.assert_consistent(b, 4.0)
+
+    def test_update_leaves_other_mesh(self):
+        a = models.Mesh(engine="bulk")
+        b = models.Mesh(engine="bulk")
+
+        cmds.polyEditUV("grid.map[*]", pivotU=0.0, pivotV=0.0, scaleU=0.5,
+                        scaleV=0.5)
+        b.update()
+
+        self.assert_consistent(a, 1.0)
+        self.assert_consistent(b, 0.25)
+
+    def test_hit_after_resize(self):
+        a = models.Mesh(engine="bulk")
+        a.resize(a.ratio * 2)
+
+        self.assert_consistent(models.Mesh(engine="bulk"), 4.0)
+        self.assert_consistent(a, 4.0)
+
+
+if __name__ == "__main__":
+    unittest.main()